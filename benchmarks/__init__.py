@@ -0,0 +1,8 @@
+# benchmarks/__init__.py
+# 运行基准请使用 python -m benchmarks.run；这里只导出数据生成工具
+from .datagen import (generate_dataset, populate)
+
+__all__ = [
+    "generate_dataset",
+    "populate"
+]
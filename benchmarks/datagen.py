@@ -0,0 +1,63 @@
+"""
+合成校园二手市场数据：用户、中英文混合标题的商品以及购买意向记录。
+
+规模 (scale) 指商品数量；用户数为其 1/10，意向记录数为其 2 倍。
+相同的 scale 和 seed 总是生成相同的数据，便于在不同提交之间对比。
+"""
+import random
+import time
+from typing import Dict, List, Tuple
+from src.data_manager import DataManager
+from src.models import User, Item, InterestInteraction
+
+_ZH_NOUNS = ["键盘", "显示器", "自行车", "台灯", "教材", "耳机", "书桌", "电饭煲", "篮球", "吉他", "平板", "雨伞"]
+_ZH_ADJECTIVES = ["九成新", "二手", "全新", "闲置", "毕业甩卖", "几乎没用过", "便宜出"]
+_EN_BRANDS = ["Apple", "Lenovo", "Nike", "Sony", "Xiaomi", "Huawei", "Logitech", "Dell"]
+_EN_NOUNS = ["iPhone", "laptop", "shoes", "headphones", "monitor", "mouse", "tablet", "camera"]
+_DESCRIPTIONS = ["成色很好", "used for two years", "原价购入", "works perfectly", "宿舍自取", "price negotiable", "附送配件"]
+
+def _title(rng: random.Random) -> str:
+    style = rng.random()
+    if style < 0.4:
+        return f"{rng.choice(_ZH_ADJECTIVES)}{rng.choice(_ZH_NOUNS)}"
+    if style < 0.7:
+        return f"{rng.choice(_EN_BRANDS)} {rng.choice(_EN_NOUNS)} {rng.randint(1, 15)}"
+    return f"{rng.choice(_ZH_ADJECTIVES)} {rng.choice(_EN_BRANDS)} {rng.choice(_ZH_NOUNS)}"
+
+def generate_dataset(scale: int, seed: int = 42) -> Tuple[List[User], List[Item], List[InterestInteraction]]:
+    rng = random.Random(seed)
+    now = time.time()
+    n_users = max(10, scale // 10)
+    users = [
+        User(
+            id=i, email=f"user{i}@campus.edu", password_hash=f"hashed_pass{i}",
+            nickname=f"用户{i}", contact_info=f"wx:user{i}",
+            role="ADMIN" if i == 1 else "USER", created_at=now - rng.uniform(0, 365 * 86400),
+        )
+        for i in range(1, n_users + 1)
+    ]
+    items = [
+        Item(
+            id=i, seller_id=rng.randint(1, n_users), title=_title(rng),
+            description=" ".join(rng.sample(_DESCRIPTIONS, 2)), price=round(rng.uniform(1, 2000), 2),
+            status="SOLD" if rng.random() < 0.2 else "AVAILABLE",
+            created_at=now - rng.uniform(0, 180 * 86400),
+        )
+        for i in range(1, scale + 1)
+    ]
+    interactions = [
+        InterestInteraction(
+            id=i, item_id=rng.randint(1, scale), buyer_id=rng.randint(1, n_users),
+            interaction_time=now - rng.uniform(0, 30 * 86400),
+        )
+        for i in range(1, scale * 2 + 1)
+    ]
+    return users, items, interactions
+
+def populate(data_manager: DataManager, scale: int, seed: int = 42) -> Dict[str, int]:
+    """把合成数据写入数据管理器，返回各模型的记录数"""
+    users, items, interactions = generate_dataset(scale, seed)
+    data_manager.save_all('user', users)
+    data_manager.save_all('item', items)
+    data_manager.save_all('interaction', interactions)
+    return {'user': len(users), 'item': len(items), 'interaction': len(interactions)}
@@ -0,0 +1,326 @@
+"""
+性能基准：在真实的文件存储环境（与 tests/test_intergreted.py 相同的搭建方式）上，
+对 DataManager 与各个 Service 的每一个公开方法计时，并输出机器可读的 JSON 报告。
+
+用法:
+    python -m benchmarks.run --scales 1000 10000 --repeat 5 --output bench_report.json
+"""
+import argparse
+import inspect
+import itertools
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Tuple
+from src.data_manager import DataManager
+from src.models import Item, InterestInteraction
+from src.indexes import SortedIndex
+from src import item_columns
+from src.services.auth_service import AuthService
+from src.services.item_service import ItemService
+from src.services.admin_service import AdminService
+from src.services.session_store import SessionStore
+from benchmarks.datagen import populate
+
+DEFAULT_SCALES = [1000, 10000, 100000, 1000000]
+
+# (目标 "类.方法", 用例名, 被计时的函数, 每轮计时前调用、返回参数元组的准备函数)
+# 被计时的函数为 None 表示缺少可选依赖，报告中记为跳过
+Case = Tuple[str, str, Callable[..., Any] | None, Callable[[], tuple] | None]
+
+def _public_methods(cls: type) -> List[str]:
+    return [
+        f"{cls.__name__}.{name}" for name, member in inspect.getmembers(cls, inspect.isfunction)
+        if not name.startswith('_')
+    ]
+
+class BenchEnv:
+    """一套完整的基于临时目录的后端环境，外加已登录的管理员与普通用户会话"""
+
+    def __init__(self, data_folder: str, scale: int, journal: bool = False, seed: int = 42, compact_models: bool = False,
+                 binary_snapshots: bool = False):
+        self.dm = DataManager(data_folder=data_folder, journal=journal, compact_threshold=0,
+                              compact_models=compact_models, binary_snapshots=binary_snapshots)
+        self.counts = populate(self.dm, scale, seed)
+        self.auth = AuthService(self.dm, session_store=SessionStore(max_sessions=1_000_000))
+        self.item = ItemService(self.dm, self.auth)
+        self.admin = AdminService(self.dm, self.auth)
+        self.rng = random.Random(seed)
+        self.admin_session, _ = self.auth.login("user1@campus.edu", "pass1")
+        self.user_session, self.user = self.auth.login("user2@campus.edu", "pass2")
+        self._unique = itertools.count(1)
+        # 预热缓存与索引，冷启动单独作为用例计时
+        self.item.search_items("warmup")
+        if item_columns.np is not None:
+            self.item.recommend_items(1)
+        self.repeat_item_id = self.foreign_item_id()
+
+    def random_id(self, model_type: str) -> int:
+        return self.rng.randint(1, self.counts[model_type])
+
+    def unique(self) -> int:
+        return next(self._unique)
+
+    def foreign_item_id(self) -> int:
+        """一个不属于当前普通用户的商品 id"""
+        while True:
+            item = self.dm.get_by_id('item', self.random_id('item'))
+            if item is not None and item.seller_id != self.user.id:
+                return item.id
+
+    def new_user_id(self) -> int:
+        n = self.unique()
+        self.auth.register(f"bench{n}@campus.edu", "pw", f"bench{n}", "wx")
+        return self.dm.get_user_by_email(f"bench{n}@campus.edu").id
+
+    def new_item_id(self) -> int:
+        return self.item.publish_item(self.user_session, "待删除商品", "bench", 1.0, []).id
+
+    def new_seller_id(self, items: int = 5) -> int:
+        """一个发布了若干商品的新用户，用于级联删除"""
+        user_id = self.new_user_id()
+        session, _ = self.auth.login(self.dm.get_by_id('user', user_id).email, "pw")
+        for _ in range(items):
+            self.item.publish_item(session, "待删除商品", "bench", 1.0, [])
+        return user_id
+
+def build_cases(env: BenchEnv) -> List[Case]:
+    dm, auth, item, admin = env.dm, env.auth, env.item, env.admin
+
+    def touch_items():
+        items = dm.get_all('item')
+        items[env.random_id('item') - 1].price += 1
+        return ('item', items)
+
+    def insert_args():
+        return ('item', Item(id=10**9 + env.unique(), seller_id=env.user.id, title="bench", description="insert", price=1.0))
+
+    def update_args():
+        target = dm.get_by_id('item', env.random_id('item'))
+        target.price += 1
+        return ('item', target)
+
+    def keyed_transaction():
+        # 事务内只做单条写入，提交时写入记录的操作，不做全量对比
+        with dm.transaction():
+            for _ in range(10):
+                dm.update(*update_args())
+            dm.insert(*insert_args())
+
+    def batch_in_transaction():
+        # 一个事务内多次修改商品与互动记录，每个模型只落盘一次
+        with dm.transaction():
+            for _ in range(10):
+                dm.save_all(*touch_items())
+            dm.get_all('interaction')
+
+    def interaction_args():
+        return ('interaction', InterestInteraction(id=10**9 + env.unique(), item_id=env.random_id('item'),
+                                                   buyer_id=env.random_id('user')))
+
+    def co_interest_update(interaction):
+        # 只计矩阵本身的增量维护，不含落盘；随即撤销，不影响后续用例
+        matrix = dm.get_index('interaction', 'co_interest')
+        matrix.add(interaction)
+        matrix.discard(interaction.id)
+
+    def compact_args():
+        dm.save_all(*touch_items())
+        return ('item',)
+
+    return [
+        # --- DataManager ---
+        ("DataManager.get_all", "warm", lambda: dm.get_all('item'), None),
+        ("DataManager.get_all", "cold", lambda: dm.get_all('item'), lambda: dm.invalidate_cache('item') or ()),
+        ("DataManager.iter_all", "cold stream", lambda: sum(1 for _ in dm.iter_all('item')),
+         lambda: dm.invalidate_cache('item') or ()),
+        ("DataManager.save_all", "one changed item", dm.save_all, touch_items),
+        ("DataManager.get_new_id", "items", dm.get_new_id, lambda: (dm.get_all('item'),)),
+        ("DataManager.next_id", "item", lambda: dm.next_id('item'), None),
+        ("DataManager.get_by_id", "item", lambda i: dm.get_by_id('item', i), lambda: (env.random_id('item'),)),
+        ("DataManager.get_user_by_email", "existing", dm.get_user_by_email,
+         lambda: (f"user{env.random_id('user')}@campus.edu",)),
+        ("DataManager.insert", "item", dm.insert, insert_args),
+        ("DataManager.delete", "item", lambda i: dm.delete('item', i), lambda: (env.new_item_id(),)),
+        ("DataManager.delete_many", "10 items", lambda ids: dm.delete_many('item', ids),
+         lambda: ([env.new_item_id() for _ in range(10)],)),
+        ("DataManager.update", "one changed item", dm.update, update_args),
+        ("DataManager.transaction", "10 item saves", batch_in_transaction, None),
+        ("DataManager.transaction", "10 updates + insert", keyed_transaction, None),
+        ("DataManager.compact", "items", dm.compact, compact_args),
+        ("DataManager.mapped_store", "current", lambda: dm.mapped_store('item'), None),
+        ("DataManager.read_page", "warm page of 100", lambda: dm.read_page('item', 50, 100), None),
+        ("DataManager.read_page", "cold page of 100", lambda: dm.read_page('item', 50, 100),
+         lambda: dm.invalidate_cache('item') or ()),
+        ("DataManager.count", "item", lambda: dm.count('item'), None),
+        ("DataManager.register_index", "price index",
+         lambda name: dm.register_index('item', name, lambda: SortedIndex('price')),
+         lambda: (f"bench_price_{env.unique()}",)),
+        ("DataManager.get_index", "search", lambda: dm.get_index('item', 'search'), None),
+        ("DataManager.memory_usage", "item", lambda: dm.memory_usage('item'), None),
+        ("DataManager.revision", "user", lambda: dm.revision('user'), None),
+        ("DataManager.invalidate_cache", "item", lambda: dm.invalidate_cache('item'), None),
+        # --- AuthService ---
+        ("AuthService.register", "new email",
+         lambda n: auth.register(f"reg{n}@campus.edu", "pw", "reg", "wx"), lambda: (env.unique(),)),
+        ("AuthService.login", "existing user",
+         lambda i: auth.login(f"user{i}@campus.edu", f"pass{i}"), lambda: (env.random_id('user'),)),
+        ("AuthService.logout", "fresh session", auth.logout,
+         lambda: (auth.login("user3@campus.edu", "pass3")[0],)),
+        ("AuthService.get_user_from_session", "valid", lambda: auth.get_user_from_session(env.user_session), None),
+        # --- ItemService ---
+        ("ItemService.publish_item", "new item",
+         lambda: item.publish_item(env.user_session, "Bench 键盘", "bench", 9.9, []), None),
+        ("ItemService.get_all_items", "all", item.get_all_items, None),
+        ("ItemService.browse_items", "page of 100", lambda: item.browse_items(offset=50, limit=100), None),
+        ("ItemService.search_items", "zh keyword", lambda: item.search_items("键盘"), None),
+        ("ItemService.search_items", "en keyword", lambda: item.search_items("laptop"), None),
+        ("ItemService.search_items", "no match", lambda: item.search_items("不存在的商品xyz"), None),
+        ("ItemService.search_page", "zh keyword top 20", lambda: item.search_page("键盘", limit=20), None),
+        ("ItemService.query_items", "under 100 available by price",
+         lambda: item.query_items(max_price=100, status="AVAILABLE", sort_by='price', descending=False), None),
+        ("ItemService.query_items", "seller listings",
+         lambda s: item.query_items(seller_id=s, include_total=True), lambda: (env.random_id('user'),)),
+        ("ItemService.trending_items", "top 10 by score", lambda: item.trending_items(10), None),
+        ("ItemService.trending_items", "top 10 by count", lambda: item.trending_items(10, by='count'), None),
+        ("ItemService.get_interest_stats", "random item", item.get_interest_stats, lambda: (env.random_id('item'),)),
+        ("ItemService.get_seller_interest", "random seller", item.get_seller_interest,
+         lambda: (env.random_id('user'),)),
+        ("ItemService.recommend_items", "random item top 5",
+         item.recommend_items if item_columns.np is not None else None, lambda: (env.random_id('item'),)),
+        ("CoInterestMatrix.rebuild", "all interactions",
+         (lambda: dm.get_index('interaction', 'co_interest')) if item_columns.np is not None else None,
+         lambda: (dm.invalidate_cache('interaction'), dm.get_all('interaction')) and ()),
+        ("CoInterestMatrix.add", "add + discard one interaction",
+         co_interest_update if item_columns.np is not None else None, lambda: (interaction_args()[1],)),
+        ("ItemService.express_interest", "foreign item",
+         lambda i: item.express_interest(env.user_session, i), lambda: (env.foreign_item_id(),)),
+        ("ItemService.express_interest", "repeat click",
+         lambda i: item.express_interest(env.user_session, i), lambda: (env.repeat_item_id,)),
+        ("ItemService.compact_interactions", "synthetic data", item.compact_interactions, None),
+        # --- AdminService ---
+        ("AdminService.get_all_users", "all", lambda: admin.get_all_users(env.admin_session), None),
+        ("AdminService.get_all_items", "all", lambda: admin.get_all_items(env.admin_session), None),
+        ("AdminService.list_users", "first page of 50 by created_at with total",
+         lambda: admin.list_users(env.admin_session, sort_by='created_at', descending=True, include_total=True), None),
+        ("AdminService.list_users", "text filter",
+         lambda: admin.list_users(env.admin_session, text="user12", include_total=True), None),
+        ("AdminService.list_items", "second page of 50 by price",
+         lambda c: admin.list_items(env.admin_session, sort_by='price', cursor=c),
+         lambda: (admin.list_items(env.admin_session, sort_by='price').next_cursor,)),
+        ("AdminService.list_items", "text filter with total",
+         lambda: admin.list_items(env.admin_session, text="键盘", include_total=True), None),
+        ("AdminService.delete_user", "fresh user",
+         lambda i: admin.delete_user(env.admin_session, i), lambda: (env.new_user_id(),)),
+        ("AdminService.delete_item", "fresh item",
+         lambda i: admin.delete_item(env.admin_session, i), lambda: (env.new_item_id(),)),
+        ("AdminService.delete_users", "10 fresh users",
+         lambda ids: admin.delete_users(env.admin_session, ids), lambda: ([env.new_user_id() for _ in range(10)],)),
+        ("AdminService.delete_users", "seller with 5 items, cascade",
+         lambda ids: admin.delete_users(env.admin_session, ids, cascade=True), lambda: ([env.new_seller_id()],)),
+        ("AdminService.delete_items", "10 fresh items",
+         lambda ids: admin.delete_items(env.admin_session, ids), lambda: ([env.new_item_id() for _ in range(10)],)),
+        ("AdminService.delete_items", "10 fresh items, cascade",
+         lambda ids: admin.delete_items(env.admin_session, ids, cascade=True),
+         lambda: ([env.new_item_id() for _ in range(10)],)),
+        ("AdminService.get_item_statistics", "available under 500",
+         (lambda: admin.get_item_statistics(env.admin_session, max_price=500, status="AVAILABLE"))
+         if item_columns.np is not None else None, None),
+    ]
+
+def _measure(fn: Callable[..., Any], setup: Callable[[], tuple] | None, repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        args = setup() if setup else ()
+        start = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(scales: List[int], repeat: int = 5, journal: bool = False, seed: int = 42,
+                   compact_models: bool = False, binary_snapshots: bool = False) -> Dict[str, Any]:
+    targets = [DataManager, AuthService, ItemService, AdminService]
+    report: Dict[str, Any] = {
+        'meta': {
+            'timestamp': time.time(),
+            'commit': _git_commit(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'journal': journal,
+            'compact_models': compact_models,
+            'binary_snapshots': binary_snapshots,
+            'seed': seed,
+        },
+        'results': [],
+        'uncovered': [],
+    }
+    for scale in scales:
+        with tempfile.TemporaryDirectory() as folder:
+            setup_start = time.perf_counter()
+            env = BenchEnv(folder, scale, journal=journal, seed=seed, compact_models=compact_models,
+                           binary_snapshots=binary_snapshots)
+            report['results'].append({
+                'scale': scale, 'target': "setup", 'case': "populate + warm up",
+                'counts': env.counts, 'seconds': time.perf_counter() - setup_start,
+                'memory_bytes': {mt: env.dm.memory_usage(mt) for mt in env.counts},
+            })
+            cases = build_cases(env)
+            for target, case, fn, setup in cases:
+                if fn is None:
+                    report['results'].append({'scale': scale, 'target': target, 'case': case, 'skipped': True})
+                    continue
+                samples = _measure(fn, setup, repeat)
+                report['results'].append({
+                    'scale': scale, 'target': target, 'case': case,
+                    'min_ms': min(samples) * 1000,
+                    'median_ms': statistics.median(samples) * 1000,
+                    'mean_ms': statistics.fmean(samples) * 1000,
+                })
+        covered = {target for target, *_ in cases}
+        report['uncovered'] = sorted(set(itertools.chain.from_iterable(map(_public_methods, targets))) - covered)
+    return report
+
+def _print_table(report: Dict[str, Any]):
+    for row in report['results']:
+        if row.get('skipped'):
+            print(f"{row['scale']:>9} {row['target']:<36} {row['case']:<32} {'skipped':>15}")
+        elif 'median_ms' in row:
+            print(f"{row['scale']:>9} {row['target']:<36} {row['case']:<32} {row['median_ms']:>12.3f} ms")
+        else:
+            print(f"{row['scale']:>9} {row['target']:<36} {row['case']:<32} {row['seconds']:>12.3f} s")
+    if report['uncovered']:
+        print(f"Public methods without a benchmark: {', '.join(report['uncovered'])}")
+
+def main(argv: List[str] | None = None):
+    parser = argparse.ArgumentParser(description="Benchmark the trade platform backend on synthetic data.")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES[:2],
+                        help=f"item counts to benchmark, e.g. {' '.join(map(str, DEFAULT_SCALES))}")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--journal", action="store_true", help="use the append-only journal storage mode")
+    parser.add_argument("--compact-models", action="store_true", help="load data into the slotted compact model variants")
+    parser.add_argument("--binary-snapshots", action="store_true", help="also write binary snapshots and load from them")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="bench_report.json")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.scales, repeat=args.repeat, journal=args.journal, seed=args.seed,
+                            compact_models=args.compact_models, binary_snapshots=args.binary_snapshots)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=4, ensure_ascii=False)
+    _print_table(report)
+    print(f"Report written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -15,19 +15,14 @@ from src.controllers.login_controller import REOPEN_CODE
 
 def setup_initial_data(data_manager: DataManager, auth_service: AuthService):
     """如果用户数据为空，则创建一个管理员账户"""
-    users = data_manager.get_all('user')
-    if not users:
-        print("No users found. Creating initial admin user...")
-        admin_user = auth_service.register("admin@app.com", "admin123", "Admin", "Internal")
-        admin_user.role = "ADMIN"
-        # 需要重新获取并保存，因为register已经保存过一次
-        all_users = data_manager.get_all('user')
-        for i, u in enumerate(all_users):
-            if u.id == admin_user.id:
-                all_users[i] = admin_user
-                break
-        data_manager.save_all('user', all_users)
-        print("--- Initial setup complete. Admin user created. ---")
+    # 注册与提升为管理员在同一事务中完成，只写一次用户文件
+    with data_manager.transaction():
+        users = data_manager.get_all('user')
+        if not users:
+            print("No users found. Creating initial admin user...")
+            admin_user = auth_service.register("admin@app.com", "admin123", "Admin", "Internal")
+            admin_user.role = "ADMIN"
+            print("--- Initial setup complete. Admin user created. ---")
 
 def main():
     # --- 1. 初始化应用和所有服务 ---
@@ -40,6 +35,8 @@ def main():
 
     # 确保至少有一个管理员账户存在
     setup_initial_data(data_manager, auth_service)
+    # 合并去重之前积累的重复互动记录；没有重复时不会写文件
+    item_service.compact_interactions()
 
     # --- 2. 启动应用主循环 ---
     while True:
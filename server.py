@@ -0,0 +1,10 @@
+"""
+无界面的 HTTP/JSON 接口入口。
+
+用法:
+    python server.py --port 8000 --workers 4
+"""
+from src.http_server import main
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,35 @@
 from .data_manager import (
     DataManager
 )
+from .async_data_manager import (
+    AsyncDataManager
+)
+from .sqlite_data_manager import (
+    SqliteDataManager
+)
 from .models import (
+    CompactInteraction,
+    CompactItem,
+    CompactUser,
     Item,
+    ItemStatus,
     InterestInteraction,
-    User
+    User,
+    UserRole,
+    estimate_memory
 )
 
 __all__ = [
+    "AsyncDataManager",
     "DataManager",
+    "SqliteDataManager",
+    "CompactInteraction",
+    "CompactItem",
+    "CompactUser",
     "Item",
+    "ItemStatus",
     "InterestInteraction",
-    "User"
+    "User",
+    "UserRole",
+    "estimate_memory"
 ]
\ No newline at end of file
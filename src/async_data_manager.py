@@ -0,0 +1,72 @@
+"""
+DataManager 的 asyncio 封装。
+
+所有文件 I/O 都在线程池中执行，不阻塞事件循环；写操作按模型持有 asyncio.Lock，
+同一模型的写入在事件循环上排队，而不是占用多个线程去争抢 DataManager 内部的锁。
+"""
+
+import asyncio
+import functools
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import AsyncExitStack
+from typing import Any, Callable, Dict, Iterable, List, TypeVar
+from src.data_manager import DataManager
+from src.indexes import ModelIndex
+
+T = TypeVar('T')
+
+class AsyncDataManager:
+    def __init__(self, data_manager: DataManager, executor: Executor | None = None):
+        self.sync = data_manager
+        # 默认使用独立的小线程池：DataManager 内部本来就串行化写入，更多线程只会排队
+        self._executor = executor or ThreadPoolExecutor(max_workers=4, thread_name_prefix="data-manager")
+        self._owns_executor = executor is None
+        self._locks: Dict[str, asyncio.Lock] = {model_type: asyncio.Lock() for model_type in data_manager._models}
+
+    def close(self):
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """在线程池中执行一个同步调用"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    async def write(self, model_types: Iterable[str], fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """持有给定模型的写锁后在线程池中执行；按固定顺序加锁，避免多模型写入相互等待成环"""
+        async with AsyncExitStack() as stack:
+            for model_type in sorted(set(model_types)):
+                await stack.enter_async_context(self._locks[model_type])
+            return await self.run(fn, *args, **kwargs)
+
+    # --- Generic Methods ---
+    async def get_all(self, model_type: str) -> List[Any]:
+        return await self.run(self.sync.get_all, model_type)
+
+    async def save_all(self, model_type: str, objects: List[Any]):
+        await self.write([model_type], self.sync.save_all, model_type, objects)
+
+    async def next_id(self, model_type: str) -> int:
+        return await self.run(self.sync.next_id, model_type)
+
+    async def revision(self, model_type: str) -> int:
+        return await self.run(self.sync.revision, model_type)
+
+    async def get_index(self, model_type: str, name: str) -> ModelIndex:
+        return await self.run(self.sync.get_index, model_type, name)
+
+    # --- Point Access ---
+    async def get_by_id(self, model_type: str, obj_id: int) -> Any | None:
+        return await self.run(self.sync.get_by_id, model_type, obj_id)
+
+    async def get_user_by_email(self, email: str) -> Any | None:
+        return await self.run(self.sync.get_user_by_email, email)
+
+    async def insert(self, model_type: str, obj: Any):
+        await self.write([model_type], self.sync.insert, model_type, obj)
+
+    async def update(self, model_type: str, obj: Any):
+        await self.write([model_type], self.sync.update, model_type, obj)
+
+    async def delete(self, model_type: str, obj_id: int) -> bool:
+        return await self.write([model_type], self.sync.delete, model_type, obj_id)
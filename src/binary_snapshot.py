@@ -0,0 +1,198 @@
+"""
+模型数据的二进制快照格式，只依赖标准库 struct / array，用于缩短冷启动时的加载时间。
+
+文件布局（小端）：
+    头部        magic(4s) 格式版本(H) 字段数(H) 记录数(Q) 来源 JSON 的 mtime_ns(q) 与大小(q)，无来源时为 -1
+    字段表      每个字段：类型码(1 字节) 名称长度(H) 名称(UTF-8)
+    字符串表    字符串数(I) 各字符串的字符数(I × n) 全部字符串拼接后的 UTF-8 文本长度(Q) 与文本
+    列数据      每列：字节数(Q) 数据
+        int 列 int64，float 列 float64，str 列为字符串表下标 (uint32)，
+        字符串列表列为每条记录的元素个数 (uint32 × 记录数) 加上所有元素的字符串表下标
+
+相同的字符串只在字符串表中存一次，加载后的对象共享同一个字符串对象。
+DataManager 只在快照记录的来源指纹与现有 JSON 文件一致时加载快照，
+比单纯比较修改时间更可靠：文件系统时间戳精度有限，快速连续写入时可能相同。
+JSON 不存在时不加载快照（删除 JSON 即清空数据），只有快照时先用 binary_to_json 恢复 JSON。
+JSON 仍是交换格式：json_to_binary / binary_to_json 在两者之间转换。
+"""
+
+import json
+import os
+import struct
+import sys
+from array import array
+from dataclasses import fields
+from typing import Any, Dict, Iterable, List, Tuple, Type
+
+MAGIC = b"TPBS"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHHQqq")
+_FIELD = struct.Struct("<cH")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+
+def _type_code(py_type: Any) -> bytes:
+    if py_type is int: return b'q'
+    if py_type is float: return b'd'
+    if py_type is str: return b's'
+    return b'l' # 字符串列表，如 image_paths
+
+def _schema(model_class: type) -> List[Tuple[str, bytes]]:
+    return [(f.name, _type_code(f.type)) for f in fields(model_class)]
+
+def _to_bytes(values: array) -> bytes:
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values.tobytes()
+
+def _from_bytes(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values
+
+def encode(model_class: type, records: Iterable[Dict[str, Any]], source: Tuple[int, int] | None = None) -> bytes:
+    """
+    把字段字典编码为二进制快照；字段值与模型声明的类型不符时抛出 ValueError。
+    source 为生成快照时 JSON 文件的 (mtime_ns, size)，加载方据此判断快照是否与 JSON 一致。
+    """
+    schema = _schema(model_class)
+    records = list(records)
+    strings: Dict[str, int] = {}
+
+    def string_index(value: Any) -> int:
+        if not isinstance(value, str):
+            raise ValueError(f"Expected a string, got {value!r}")
+        return strings.setdefault(value, len(strings))
+
+    columns = []
+    try:
+        for name, code in schema:
+            values = [record[name] for record in records]
+            if code == b'q':
+                columns.append(_to_bytes(array('q', values)))
+            elif code == b'd':
+                columns.append(_to_bytes(array('d', values)))
+            elif code == b's':
+                columns.append(_to_bytes(array('I', map(string_index, values))))
+            else:
+                counts = array('I', map(len, values))
+                items = array('I', (string_index(v) for value in values for v in value))
+                columns.append(_to_bytes(counts) + _to_bytes(items))
+    except (KeyError, TypeError, OverflowError) as e:
+        raise ValueError(f"Cannot encode {model_class.__name__} records: {e}") from e
+
+    text = "".join(strings).encode('utf-8')
+    mtime_ns, size = source if source is not None else (-1, -1)
+    parts = [_HEADER.pack(MAGIC, FORMAT_VERSION, len(schema), len(records), mtime_ns, size)]
+    for name, code in schema:
+        encoded = name.encode('utf-8')
+        parts.append(_FIELD.pack(code, len(encoded)) + encoded)
+    parts.append(_U32.pack(len(strings)))
+    parts.append(_to_bytes(array('I', map(len, strings))))
+    parts.append(_U64.pack(len(text)) + text)
+    for column in columns:
+        parts.append(_U64.pack(len(column)) + column)
+    return b"".join(parts)
+
+def decode(model_class: Type[Any], data: bytes) -> List[Any]:
+    """解码二进制快照；格式版本或字段表与模型不一致时抛出 ValueError"""
+    try:
+        magic, version, field_count, count, _, _ = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Unsupported binary snapshot")
+        pos = _HEADER.size
+        schema = []
+        for _ in range(field_count):
+            code, name_len = _FIELD.unpack_from(data, pos)
+            pos += _FIELD.size
+            schema.append((data[pos:pos + name_len].decode('utf-8'), code))
+            pos += name_len
+        if schema != _schema(model_class):
+            raise ValueError(f"Binary snapshot schema does not match {model_class.__name__}")
+
+        (string_count,) = _U32.unpack_from(data, pos)
+        pos += _U32.size
+        lengths = _from_bytes('I', data[pos:pos + 4 * string_count])
+        pos += 4 * string_count
+        (text_len,) = _U64.unpack_from(data, pos)
+        pos += _U64.size
+        text = data[pos:pos + text_len].decode('utf-8')
+        pos += text_len
+        strings, start = [], 0
+        for length in lengths:
+            strings.append(text[start:start + length])
+            start += length
+
+        columns = []
+        for _, code in schema:
+            (size,) = _U64.unpack_from(data, pos)
+            pos += _U64.size
+            chunk = data[pos:pos + size]
+            pos += size
+            if code == b'q':
+                columns.append(_from_bytes('q', chunk).tolist())
+            elif code == b'd':
+                columns.append(_from_bytes('d', chunk).tolist())
+            elif code == b's':
+                columns.append([strings[i] for i in _from_bytes('I', chunk)])
+            else:
+                counts = _from_bytes('I', chunk[:4 * count])
+                items = iter(_from_bytes('I', chunk[4 * count:]))
+                columns.append([[strings[next(items)] for _ in range(n)] for n in counts])
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise ValueError(f"Corrupt binary snapshot: {e}") from e
+    return [model_class(*values) for values in zip(*columns)]
+
+def source_of(data: bytes) -> Tuple[int, int] | None:
+    """快照头部记录的来源 JSON 指纹"""
+    try:
+        magic, _, _, _, mtime_ns, size = _HEADER.unpack_from(data, 0)
+    except struct.error:
+        return None
+    return (mtime_ns, size) if magic == MAGIC and size >= 0 else None
+
+def _json_stamp(json_path: str) -> Tuple[int, int]:
+    st = os.stat(json_path)
+    return (st.st_mtime_ns, st.st_size)
+
+def json_to_binary(json_path: str, binary_path: str, model_class: type) -> int:
+    """把 JSON 数据文件转换为二进制快照，返回记录数"""
+    source = _json_stamp(json_path)
+    with open(json_path, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+    with open(binary_path, 'wb') as f:
+        f.write(encode(model_class, records, source))
+    return len(records)
+
+def binary_to_json(binary_path: str, json_path: str, model_class: type) -> int:
+    """把二进制快照转换回 JSON 数据文件，返回记录数"""
+    with open(binary_path, 'rb') as f:
+        objects = decode(model_class, f.read())
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump([{name: getattr(obj, name) for name, _ in _schema(model_class)} for obj in objects],
+                  f, indent=4, ensure_ascii=False)
+    # 快照与新写出的 JSON 内容一致，更新来源指纹使其继续有效
+    with open(binary_path, 'wb') as f:
+        f.write(encode(model_class, ({name: getattr(obj, name) for name, _ in _schema(model_class)} for obj in objects),
+                       _json_stamp(json_path)))
+    return len(objects)
+
+
+if __name__ == "__main__":
+    import argparse
+    from src.data_manager import DataManager
+
+    parser = argparse.ArgumentParser(description="Convert data files between JSON and the binary snapshot format.")
+    parser.add_argument("direction", choices=["to-binary", "to-json"])
+    parser.add_argument("--data-folder", default="data")
+    args = parser.parse_args()
+
+    manager = DataManager(data_folder=args.data_folder)
+    for model_type, (json_path, model_class) in manager._models.items():
+        binary_path = manager._binary_path(json_path)
+        if args.direction == "to-binary" and os.path.exists(json_path):
+            print(f"{model_type}: {json_to_binary(json_path, binary_path, model_class)} records -> {binary_path}")
+        elif args.direction == "to-json" and os.path.exists(binary_path):
+            print(f"{model_type}: {binary_to_json(binary_path, json_path, model_class)} records -> {json_path}")
@@ -1,8 +1,17 @@
 from PyQt5.QtWidgets import QDialog, QTableWidgetItem, QMessageBox
 from PyQt5.QtCore import Qt
 from src.ui_admin_dialog import Ui_Dialog as Ui_AdminDialog
+from src.models import User, Item
+from src.pagination import Page
 from src.services.admin_service import AdminService
 
+# 管理面板每次加载的行数，滚动到表格底部时再加载下一页
+ADMIN_PAGE_SIZE = 100
+
+# 可点击表头排序的列 -> 排序字段
+USER_SORT_COLUMNS = {0: 'id', 4: 'role'}
+ITEM_SORT_COLUMNS = {0: 'id', 2: 'price'}
+
 class AdminController(QDialog):
     def __init__(self, session_id: str, admin_service: AdminService):
         super().__init__()
@@ -12,40 +21,92 @@ class AdminController(QDialog):
         self.ui = Ui_AdminDialog()
         self.ui.setupUi(self)
 
+        # 当前排序 (字段, 是否降序) 与最近加载的一页，游标分页从这一页继续
+        self.user_sort = ('id', False)
+        self.item_sort = ('id', False)
+        self.user_page: Page[User] | None = None
+        self.item_page: Page[Item] | None = None
+
         self.setup_connections()
         self.load_data()
 
     def setup_connections(self):
         self.ui.deleteUserButton.clicked.connect(self.delete_selected_user)
         self.ui.deleteItemButton.clicked.connect(self.delete_selected_item)
+        self.ui.filterLineEdit.returnPressed.connect(self.load_data)
+        self.ui.userTableWidget.horizontalHeader().sectionClicked.connect(self.sort_users)
+        self.ui.itemTableWidget.horizontalHeader().sectionClicked.connect(self.sort_items)
+        self.ui.userTableWidget.verticalScrollBar().valueChanged.connect(self.on_user_scroll)
+        self.ui.itemTableWidget.verticalScrollBar().valueChanged.connect(self.on_item_scroll)
 
     def load_data(self):
-        """加载所有用户和商品数据到表格中"""
+        """按当前的过滤与排序条件重新加载两张表的第一页"""
         try:
-            # 加载用户
-            users = self.admin_service.get_all_users(self.session_id)
-            self.ui.userTableWidget.setRowCount(len(users))
+            self.ui.userTableWidget.setRowCount(0)
             self.ui.userTableWidget.setHorizontalHeaderLabels(["ID", "Nickname", "Email", "Contact", "Role"])
-            for row, user in enumerate(users):
-                self.ui.userTableWidget.setItem(row, 0, self._create_unediable_item(str(user.id)))
-                self.ui.userTableWidget.setItem(row, 1, self._create_unediable_item(user.nickname))
-                self.ui.userTableWidget.setItem(row, 2, self._create_unediable_item(user.email))
-                self.ui.userTableWidget.setItem(row, 3, self._create_unediable_item(user.contact_info))
-                self.ui.userTableWidget.setItem(row, 4, self._create_unediable_item(user.role))
-
-            # 加载商品
-            items = self.admin_service.get_all_items(self.session_id)
-            self.ui.itemTableWidget.setRowCount(len(items))
-            self.ui.itemTableWidget.setHorizontalHeaderLabels(["ID", "Title", "Price", "Seller ID"])
-            for row, item in enumerate(items):
-                self.ui.itemTableWidget.setItem(row, 0, self._create_unediable_item(str(item.id)))
-                self.ui.itemTableWidget.setItem(row, 1, self._create_unediable_item(item.title))
-                self.ui.itemTableWidget.setItem(row, 2, self._create_unediable_item(f"{item.price:.2f}"))
-                self.ui.itemTableWidget.setItem(row, 3, self._create_unediable_item(str(item.seller_id)))
+            self.load_more_users(include_total=True)
 
+            self.ui.itemTableWidget.setRowCount(0)
+            self.ui.itemTableWidget.setHorizontalHeaderLabels(["ID", "Title", "Price", "Seller ID"])
+            self.load_more_items(include_total=True)
         except PermissionError as e:
             self.ui.errorLabel.setText(str(e))
 
+    def load_more_users(self, include_total: bool = False):
+        sort_by, descending = self.user_sort
+        cursor = None if include_total else self.user_page.next_cursor
+        self.user_page = self.admin_service.list_users(
+            self.session_id, sort_by=sort_by, descending=descending, text=self.ui.filterLineEdit.text(),
+            cursor=cursor, limit=ADMIN_PAGE_SIZE, include_total=include_total,
+        )
+        self._append_rows(self.ui.userTableWidget, [
+            [str(user.id), user.nickname, user.email, user.contact_info, user.role] for user in self.user_page.items
+        ])
+        if include_total:
+            self.ui.tabWidget.setTabText(self.ui.tabWidget.indexOf(self.ui.tab), f"User ({self.user_page.total})")
+
+    def load_more_items(self, include_total: bool = False):
+        sort_by, descending = self.item_sort
+        cursor = None if include_total else self.item_page.next_cursor
+        self.item_page = self.admin_service.list_items(
+            self.session_id, sort_by=sort_by, descending=descending, text=self.ui.filterLineEdit.text(),
+            cursor=cursor, limit=ADMIN_PAGE_SIZE, include_total=include_total,
+        )
+        self._append_rows(self.ui.itemTableWidget, [
+            [str(item.id), item.title, f"{item.price:.2f}", str(item.seller_id)] for item in self.item_page.items
+        ])
+        if include_total:
+            self.ui.tabWidget.setTabText(self.ui.tabWidget.indexOf(self.ui.tab_2), f"Item ({self.item_page.total})")
+
+    def on_user_scroll(self, value: int):
+        """滚动到底部且还有下一页时追加加载"""
+        if value == self.ui.userTableWidget.verticalScrollBar().maximum() and self.user_page and self.user_page.has_more:
+            self.load_more_users()
+
+    def on_item_scroll(self, value: int):
+        if value == self.ui.itemTableWidget.verticalScrollBar().maximum() and self.item_page and self.item_page.has_more:
+            self.load_more_items()
+
+    def sort_users(self, column: int):
+        """点击可排序的表头按该列排序，再次点击切换升降序"""
+        if column in USER_SORT_COLUMNS:
+            field = USER_SORT_COLUMNS[column]
+            self.user_sort = (field, not self.user_sort[1] if self.user_sort[0] == field else False)
+            self.load_data()
+
+    def sort_items(self, column: int):
+        if column in ITEM_SORT_COLUMNS:
+            field = ITEM_SORT_COLUMNS[column]
+            self.item_sort = (field, not self.item_sort[1] if self.item_sort[0] == field else False)
+            self.load_data()
+
+    def _append_rows(self, table, rows):
+        start = table.rowCount()
+        table.setRowCount(start + len(rows))
+        for row, values in enumerate(rows, start):
+            for column, text in enumerate(values):
+                table.setItem(row, column, self._create_unediable_item(text))
+
     def delete_selected_user(self):
         selected_rows = self.ui.userTableWidget.selectionModel().selectedRows()
         if not selected_rows:
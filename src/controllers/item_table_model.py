@@ -0,0 +1,94 @@
+"""
+主窗口商品表格的数据模型。
+
+QTableView 只为可见行调用 data()，不为每个单元格创建控件对象；
+滚动到末尾时视图通过 canFetchMore / fetchMore 向服务层按页取下一批商品。
+"""
+from typing import Any, Callable, List
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+from src.models import Item
+from src.pagination import Page
+
+# 每次向服务层取的行数
+FETCH_SIZE = 100
+
+# (offset, limit) -> 一页商品，例如 ItemService.browse_items / search_page
+PageSource = Callable[[int, int], Page[Item]]
+
+class ItemTableModel(QAbstractTableModel):
+    HEADERS = ["ID", "Title", "Price", "Status"]
+
+    def __init__(self, parent=None, fetch_size: int = FETCH_SIZE):
+        super().__init__(parent)
+        self.fetch_size = fetch_size
+        self._source: PageSource | None = None
+        self._items: List[Item] = []
+        self._total: int | None = None
+        self._has_more = False
+
+    def set_source(self, source: PageSource) -> Page[Item]:
+        """切换数据来源并加载第一页，返回这一页（包含总数）"""
+        self.beginResetModel()
+        self._source = source
+        page = source(0, self.fetch_size)
+        self._items = list(page.items)
+        self._total = page.total
+        self._has_more = page.has_more
+        self.endResetModel()
+        return page
+
+    def item_at(self, row: int) -> Item:
+        return self._items[row]
+
+    @property
+    def total(self) -> int | None:
+        return self._total
+
+    # --- QAbstractTableModel ---
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._items)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        item = self._items[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            column = index.column()
+            if column == 0: return str(item.id)
+            if column == 1: return item.title
+            if column == 2: return f"{item.price:.2f}"
+            return str(item.status)
+        if role == Qt.ItemDataRole.TextAlignmentRole and index.column() in (0, 2):
+            return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        # 只读：不含 ItemIsEditable，无需逐个单元格清除编辑标志
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and self._source is not None and self._has_more
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        page = self._source(len(self._items), self.fetch_size)
+        self._has_more = page.has_more and bool(page.items)
+        if page.total is not None:
+            self._total = page.total
+        if not page.items:
+            return
+        start = len(self._items)
+        self.beginInsertRows(QModelIndex(), start, start + len(page.items) - 1)
+        self._items.extend(page.items)
+        self.endInsertRows()
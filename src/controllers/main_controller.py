@@ -1,13 +1,22 @@
-from PyQt5.QtWidgets import QMainWindow, QTableWidgetItem, QMessageBox
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QMainWindow, QMessageBox
+from PyQt5.QtCore import QModelIndex
 from src.ui_main_window import Ui_MainWindow
 from src.services.auth_service import AuthService
 from src.services.item_service import ItemService
 from src.services.admin_service import AdminService
 from src.models import User
+from src.pagination import Page
+from src.controllers.item_table_model import ItemTableModel
 from src.controllers.publish_item_controller import PublishItemController
 from src.controllers.admin_controller import AdminController
 
+# 商品列表与搜索结果每次向服务层取的条数，滚动到底部时再取下一批
+SEARCH_PAGE_SIZE = 100
+# 热门商品榜单的条数
+TRENDING_SIZE = 20
+# 商品详情中 "也看了" 推荐的条数
+RECOMMENDATION_SIZE = 5
+
 class MainWindowController(QMainWindow):
     def __init__(self, session_id: str, user: User, auth_service: AuthService, item_service: ItemService, admin_service: AdminService):
         super().__init__()
@@ -19,6 +28,9 @@ class MainWindowController(QMainWindow):
 
         self.ui = Ui_MainWindow()
         self.ui.setupUi(self)
+        # 表格内容由模型按需提供，视图只绘制可见行
+        self.item_model = ItemTableModel(self, fetch_size=SEARCH_PAGE_SIZE)
+        self.ui.itemTableView.setModel(self.item_model)
 
         self.configure_ui_for_user()
         self.setup_connections()
@@ -34,47 +46,44 @@ class MainWindowController(QMainWindow):
     def setup_connections(self):
         """连接所有信号和槽"""
         self.ui.searchButton.clicked.connect(self.handle_search)
+        self.ui.trendingButton.clicked.connect(self.show_trending)
         self.ui.publishItemButton.clicked.connect(self.open_publish_dialog)
         self.ui.logoutButton.clicked.connect(self.handle_logout)
         self.ui.adminPanelButton.clicked.connect(self.open_admin_panel)
-        self.ui.itemTableWidget.itemDoubleClicked.connect(self.show_item_details)
+        self.ui.itemTableView.doubleClicked.connect(self.show_item_details)
 
     def handle_search(self):
         keyword = self.ui.searchLineEdit.text()
-        items = self.item_service.search_items(keyword)
-        self.populate_item_table(items)
-
-    def load_all_items(self):
-        """加载并显示所有商品"""
-        all_items = self.item_service.get_all_items()
-        self.populate_item_table(all_items)
+        page = self.item_model.set_source(lambda offset, limit: self.item_service.search_page(keyword, offset, limit))
+        self.ui.statusbar.showMessage(f"{page.total} matching items")
 
-    def populate_item_table(self, items):
-        """用商品数据填充表格"""
-        self.ui.itemTableWidget.setRowCount(len(items))
-        self.ui.itemTableWidget.setHorizontalHeaderLabels(["ID", "Title", "Price", "Status"])
-        
-        for row, item in enumerate(items):
-            self.ui.itemTableWidget.setItem(row, 0, QTableWidgetItem(str(item.id)))
-            self.ui.itemTableWidget.setItem(row, 1, QTableWidgetItem(item.title))
-            self.ui.itemTableWidget.setItem(row, 2, QTableWidgetItem(f"{item.price:.2f}"))
-            self.ui.itemTableWidget.setItem(row, 3, QTableWidgetItem(item.status))
-        
-        # 让ID列不可编辑
-        for row in range(len(items)):
-            item_id_cell = self.ui.itemTableWidget.item(row, 0)
-            if item_id_cell:
-                item_id_cell.setFlags(item_id_cell.flags() & ~Qt.ItemFlag.ItemIsEditable)
+    def show_trending(self):
+        """按衰减热度显示热门商品，直接读取增量维护的计数而不扫描互动记录"""
+        items = self.item_service.trending_items(limit=TRENDING_SIZE)
+        self.item_model.set_source(
+            lambda offset, limit: Page(items=items[offset:offset + limit], total=len(items), offset=offset, limit=limit)
+        )
+        self.ui.statusbar.showMessage(f"Showing {len(items)} trending items")
 
+    def load_all_items(self):
+        """按 id 浏览全部商品：模型先取第一页，滚动时再向服务层取后续页，只解码取到的商品"""
+        page = self.item_model.set_source(self.item_service.browse_items)
+        self.ui.statusbar.showMessage(f"{page.total} items")
 
-    def show_item_details(self, table_item):
+    def show_item_details(self, index: QModelIndex):
         """双击商品时显示详情和联系方式"""
-        row = table_item.row()
-        item_id = int(self.ui.itemTableWidget.item(row, 0).text())
+        item_id = self.item_model.item_at(index.row()).id
         
         try:
             contact_info = self.item_service.express_interest(self.session_id, item_id)
-            QMessageBox.information(self, "Seller Contact Information", f"Your interest has been recorded. Seller contact information:\n{contact_info}")
+            message = f"Your interest has been recorded. Seller contact information:\n{contact_info}"
+            try:
+                related = self.item_service.recommend_items(item_id, limit=RECOMMENDATION_SIZE)
+            except ImportError: # 未安装 numpy 时不显示推荐
+                related = []
+            if related:
+                message += "\n\nBuyers interested in this also looked at:\n" + "\n".join(i.title for i in related)
+            QMessageBox.information(self, "Seller Contact Information", message)
         except (ValueError, PermissionError) as e:
             QMessageBox.warning(self, "Operation Failed", str(e))
 
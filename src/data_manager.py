@@ -1,16 +1,211 @@
 """
 数据管理器，负责所有与 JSON 文件的读写操作。
+
+写入可以放在 transaction() 中批量进行：事务内的读写都作用于同一份内存视图，
+提交时每个被修改的模型只落盘一次，出现异常则全部回滚。
+
+支持两种存储模式：
+- 默认模式：每次 save_all 整体重写 JSON 文件；
+- 日志模式 (journal=True)：JSON 文件作为快照，每次新增/修改/删除只向
+  同名的 .log 文件追加一行 JSON，启动时回放“快照 + 日志”，由 compact() 合并。
 """
 
+import io
 import json
 import os
-from typing import List, Dict, Any, TypeVar, Type
+import re
+import sys
+import threading
+from contextlib import contextmanager
+from dataclasses import fields
+from functools import lru_cache
+from itertools import islice
+from typing import IO, List, Dict, Any, TypeVar, Type, Tuple, Optional, Callable, Iterable, Iterator, Set
 from . import models
+from .indexes import ModelIndex, EmailIndex, SortedIndex, normalize_email
+from .mapped_store import MappedStore
+from . import binary_snapshot
+
+try:
+    import fcntl
+except ImportError: # Windows
+    fcntl = None
+    import msvcrt
+
+@contextmanager
+def _file_lock(lock_path: str):
+    """跨进程的排他文件锁"""
+    with open(lock_path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+# 流式解码时每次从文件读取的字符数
+CHUNK_SIZE = 1 << 16
+
+_SKIP_IN_ARRAY = re.compile(r'[\s,]*')
+_SKIP_IN_LINES = re.compile(r'\s*')
+
+def iter_json_records(f: IO[str], chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """
+    从文本流中逐条解码记录，内存占用与单条记录大小相关，而不是与文件大小相关。
+    支持顶层 JSON 数组和 JSON Lines（每行一个 JSON 值）两种格式，按第一个非空白字符自动识别。
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = "", 0, False
+    skip = None # 尚未识别格式
+    while True:
+        while True:
+            pos = (skip or _SKIP_IN_LINES).match(buffer, pos).end()
+            if pos < len(buffer) or eof:
+                break
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+        if pos >= len(buffer):
+            return
+        if skip is None:
+            skip = _SKIP_IN_ARRAY if buffer[pos] == '[' else _SKIP_IN_LINES
+            pos += buffer[pos] == '['
+            continue
+        if skip is _SKIP_IN_ARRAY and buffer[pos] == ']':
+            return
+        try:
+            record, end = decoder.raw_decode(buffer, pos)
+            # 恰好解码到缓冲区末尾时，数字等值可能被截断，读入更多内容后重新解码
+            complete = end < len(buffer) or eof
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            complete = False
+        if not complete:
+            # 记录跨越了当前缓冲区末尾
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        pos = end
+        yield record
 
 T = TypeVar('T')
+# 一次变更：('insert' | 'update', 对象) 或 ('delete', 对象 id)
+Op = Tuple[str, Any]
+
+@lru_cache(maxsize=None)
+def _field_names(model_class: type) -> Tuple[str, ...]:
+    return tuple(f.name for f in fields(model_class))
+
+def _record(obj: Any) -> Dict[str, Any]:
+    """对象的字段字典；带 __slots__ 的模型没有 __dict__，统一按 dataclass 字段读取"""
+    return {name: getattr(obj, name) for name in _field_names(type(obj))}
+
+def _fingerprint(obj: Any) -> Tuple[Any, ...]:
+    """对象当前字段值的不可变快照，用于比较对象是否被修改过"""
+    return tuple(
+        tuple(v) if isinstance(v, list) else v
+        for v in (getattr(obj, name) for name in _field_names(type(obj)))
+    )
+
+class _CacheEntry:
+    """
+    某个模型的常驻缓存：存储指纹、已解码的对象列表、主键索引、
+    每个对象的字段快照（用于发现原地修改）以及注册的派生索引。
+    """
+    __slots__ = ('stamp', 'objects', 'by_id', 'records', 'indexes', 'factories', 'log_size')
+
+    def __init__(self, stamp: Any, objects: List[Any], log_size: int, index_factories: Dict[str, Callable[[], ModelIndex]]):
+        self.stamp = stamp
+        self.objects = objects
+        self.by_id: Dict[int, Any] = {obj.id: obj for obj in objects}
+        self.records: Dict[int, Tuple[Any, ...]] = {obj.id: _fingerprint(obj) for obj in objects}
+        # 派生索引在第一次使用时才构建，冷启动只付出解码的开销；构建后随变更增量维护
+        self.indexes: Dict[str, ModelIndex] = {}
+        self.factories = index_factories
+        self.log_size = log_size # 日志模式下尚未合并进快照的日志行数
+
+    def index(self, name: str) -> ModelIndex:
+        index = self.indexes.get(name)
+        if index is None:
+            index = self.factories[name]()
+            index.rebuild(self.objects)
+            self.indexes[name] = index
+        return index
+
+    def apply(self, objects: List[Any], ops: List[Op], full: bool = False):
+        """把已经落盘的变更应用到缓存和所有索引上；full=True 时按新列表刷新主键索引"""
+        self.objects = objects
+        for op, target in ops:
+            if op == 'delete':
+                self.by_id.pop(target, None)
+                self.records.pop(target, None)
+                for index in self.indexes.values():
+                    index.discard(target)
+                continue
+            if op == 'update':
+                for index in self.indexes.values():
+                    index.discard(target.id)
+            self.by_id[target.id] = target
+            self.records[target.id] = _fingerprint(target)
+            for index in self.indexes.values():
+                index.add(target)
+        if full:
+            # 调用方可能传入了值相同的新实例，主键索引要指向列表中的实例
+            self.by_id = {obj.id: obj for obj in objects}
+
+class _Transaction:
+    """
+    一次事务的工作视图：每个模型在首次访问时从缓存复制一份对象列表，并记录哪些模型被修改过。
+    只经 insert / update / delete 修改的模型按顺序记录这些操作，提交时直接写入，不做全量对比；
+    经 save_all 整体替换过的模型提交时与缓存逐条对比。
+    """
+
+    def __init__(self, manager: "DataManager"):
+        self.manager = manager
+        self.views: Dict[str, List[Any]] = {}
+        self.dirty: Set[str] = set()
+        self.ops: Dict[str, List[Op]] = {}
+        # model_type -> {id: 对象，已删除为 None}，只对按操作记录的模型维护
+        self.changed: Dict[str, Dict[int, Any]] = {}
+
+    def view(self, model_type: str) -> List[Any]:
+        if model_type not in self.views:
+            self.views[model_type] = list(self.manager._load_cached(model_type).objects)
+        return self.views[model_type]
+
+    def replace(self, model_type: str, objects: List[Any]):
+        self.views[model_type] = list(objects)
+        self.dirty.add(model_type)
+        self.ops.pop(model_type, None)
+        self.changed.pop(model_type, None)
+
+    def record(self, model_type: str, objects: List[Any], ops: List[Op]):
+        """以单条操作修改工作视图；之前已整体替换过的模型仍在提交时对比"""
+        keyed = model_type not in self.dirty or model_type in self.ops
+        self.views[model_type] = objects
+        self.dirty.add(model_type)
+        if not keyed:
+            return
+        self.ops.setdefault(model_type, []).extend(ops)
+        changed = self.changed.setdefault(model_type, {})
+        for op, target in ops:
+            if op == 'delete':
+                changed[target] = None
+            else:
+                changed[target.id] = target
 
 class DataManager:
-    def __init__(self, data_folder: str = "data"):
+    def __init__(self, data_folder: str = "data", journal: bool = False, compact_threshold: int = 1000,
+                 compact_models: bool = False, binary_snapshots: bool = False):
         self.data_folder = data_folder
         if not os.path.exists(self.data_folder):
             os.makedirs(self.data_folder)
@@ -19,41 +214,597 @@ class DataManager:
         self.items_file = os.path.join(data_folder, "items.json")
         self.interactions_file = os.path.join(data_folder, "interactions.json")
 
+        # model_type -> (文件路径, 模型类)
+        self._models: Dict[str, Tuple[str, Type[Any]]] = {
+            'user': (self.users_file, models.User),
+            'item': (self.items_file, models.Item),
+            'interaction': (self.interactions_file, models.InterestInteraction),
+        }
+        # 加载时使用带 __slots__、状态/角色驻留的紧凑模型；服务层新建的对象仍是普通模型
+        self.compact_models = compact_models
+        if compact_models:
+            self._models = {mt: (path, models.COMPACT_VARIANTS[cls]) for mt, (path, cls) in self._models.items()}
+        # 写穿透缓存：读取时按文件 mtime/size 校验，save_all 时同步更新
+        self._cache: Dict[str, _CacheEntry] = {}
+        # model_type -> {索引名: 索引工厂}
+        self._index_factories: Dict[str, Dict[str, Callable[[], ModelIndex]]] = {mt: {} for mt in self._models}
+        # 每个模型的数据版本号：重新加载或写入变更时递增
+        self._revisions: Dict[str, int] = {mt: 0 for mt in self._models}
+        self.register_index('user', 'email', EmailIndex)
+
+        self.journal = journal
+        # 日志行数达到该阈值时自动合并；<= 0 表示只在手动调用 compact() 时合并
+        self.compact_threshold = compact_threshold
+
+        # 持久化的 id 序列：model_type -> 最近一次分配的 id
+        self.sequences_file = os.path.join(data_folder, "sequences.json")
+        self._sequence_lock = threading.Lock()
+
+        # model_type -> 已打开的内存映射存储
+        self._stores: Dict[str, MappedStore] = {}
+
+        # 每次整体写入 JSON 后同时写出二进制快照 (<模型文件名>.bin)，冷启动时优先加载它
+        self.binary_snapshots = binary_snapshots
+
+        # 保护缓存与写入；事务在整个执行期间持有该锁，使其他线程的写入不会穿插进来
+        self._lock = threading.RLock()
+        self._tx_local = threading.local()
+
     def _read_data(self, file_path: str) -> List[Dict[str, Any]]:
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
                 if not content: return []
-                return json.loads(content)
+                try:
+                    return json.loads(content)
+                except json.JSONDecodeError:
+                    # 也接受 JSON Lines 格式的数据文件
+                    return list(iter_json_records(io.StringIO(content)))
         except (FileNotFoundError, json.JSONDecodeError):
             return []
 
+    def _iter_data(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """逐条读取数据文件中的记录，不把整个文件读入内存"""
+        try:
+            f = open(file_path, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            return
+        with f:
+            yield from iter_json_records(f)
+
     def _write_data(self, file_path: str, data: List[Dict[str, Any]]):
-        with open(file_path, 'w', encoding='utf-8') as f:
+        # 先写临时文件再原子替换，写到一半崩溃也不会留下损坏的数据文件
+        tmp_path = file_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, file_path)
+
+    def _binary_path(self, file_path: str) -> str:
+        return os.path.splitext(file_path)[0] + ".bin"
 
     def _load_objects(self, file_path: str, model_class: Type[T]) -> List[T]:
-        data = self._read_data(file_path)
-        return [model_class(**d) for d in data]
+        # 二进制快照由当前 JSON 生成时优先使用；格式或字段不匹配时退回 JSON。
+        # JSON 不存在时不使用快照：删除数据文件即清空该模型，残留的快照不能把数据带回来
+        try:
+            with open(self._binary_path(file_path), 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = None
+        json_stamp = self._file_stamp(file_path)
+        if data is not None and json_stamp is not None and binary_snapshot.source_of(data) == json_stamp:
+            try:
+                return binary_snapshot.decode(model_class, data)
+            except ValueError:
+                pass
+        records = self._read_data(file_path)
+        return [model_class(**d) for d in records]
 
     def _save_objects(self, file_path: str, objects: List[Any]):
-        data = [obj.__dict__ for obj in objects]
+        data = [_record(obj) for obj in objects]
         self._write_data(file_path, data)
+        if self.binary_snapshots:
+            try:
+                encoded = binary_snapshot.encode(self._class_for(file_path), data, self._file_stamp(file_path))
+            except ValueError:
+                # 字段值与声明类型不符，无法用二进制表示；旧快照的来源指纹已不匹配，不会被加载
+                return
+            tmp_path = self._binary_path(file_path) + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(encoded)
+            os.replace(tmp_path, self._binary_path(file_path))
+
+    def _class_for(self, file_path: str) -> type:
+        return next(cls for path, cls in self._models.values() if path == file_path)
 
     def get_new_id(self, objects: List[Any]) -> int:
         if not objects:
             return 1
         return max((obj.id for obj in objects), default=0) + 1
 
+    # --- Sequences ---
+    def next_id(self, model_type: str) -> int:
+        """
+        从持久化序列中分配一个新 id，与表的大小无关。
+        同一进程的多个线程、以及共用同一数据目录的多个进程之间都是原子的；
+        已分配的 id 即使对应记录被删除也不会再被使用。
+        """
+        self._model_info(model_type)
+        with self._sequence_lock, _file_lock(self.sequences_file + ".lock"):
+            sequences = self._read_sequences()
+            last = sequences.get(model_type)
+            if last is None:
+                # 首次使用时从现有数据中接续，只扫描这一次
+                last = max(self._load_cached(model_type).by_id, default=0)
+            new_id = last + 1
+            # 兼容绕过序列直接写入数据的旧代码：跳过已被占用的 id
+            by_id = self._load_cached(model_type).by_id
+            while new_id in by_id:
+                new_id += 1
+            sequences[model_type] = new_id
+            self._write_sequences(sequences)
+            return new_id
+
+    def _read_sequences(self) -> Dict[str, int]:
+        try:
+            with open(self.sequences_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write_sequences(self, sequences: Dict[str, int]):
+        tmp_path = self.sequences_file + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(sequences, f)
+        os.replace(tmp_path, self.sequences_file)
+
+    # --- Journal ---
+    def _log_file(self, file_path: str) -> str:
+        return os.path.splitext(file_path)[0] + ".log"
+
+    def _read_log(self, file_path: str) -> Tuple[Dict[int, Dict[str, Any] | None], int]:
+        """按顺序回放日志，返回 ({id: 最终记录，已删除为 None}, 日志行数)"""
+        changes: Dict[int, Dict[str, Any] | None] = {}
+        log_size = 0
+        try:
+            with open(self._log_file(file_path), 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue # 写入过程中崩溃留下的残缺行，跳过
+                    log_size += 1
+                    # insert/update 都按“覆盖写”回放，使得合并中途崩溃后重放依然幂等
+                    if entry['op'] == 'delete':
+                        changes[entry['id']] = None
+                    else:
+                        changes[entry['record']['id']] = entry['record']
+        except FileNotFoundError:
+            pass
+        return changes, log_size
+
+    def _replay_journal(self, file_path: str, model_class: Type[T]) -> Tuple[List[T], int]:
+        """读取快照并按顺序回放日志，返回 (对象列表, 日志行数)"""
+        objects: Dict[int, T] = {obj.id: obj for obj in self._load_objects(file_path, model_class)}
+        changes, log_size = self._read_log(file_path)
+        for obj_id, record in changes.items():
+            if record is None:
+                objects.pop(obj_id, None)
+            else:
+                objects[obj_id] = model_class(**record)
+        return list(objects.values()), log_size
+
+    def _diff(self, entry: _CacheEntry, objects: List[Any]) -> List[Op]:
+        """对比缓存与新列表，找出新增、修改和删除的对象"""
+        ops: List[Op] = []
+        seen = set()
+        for obj in objects:
+            seen.add(obj.id)
+            old = entry.records.get(obj.id)
+            if old is None:
+                ops.append(('insert', obj))
+            elif old != _fingerprint(obj):
+                ops.append(('update', obj))
+        for obj_id in entry.records:
+            if obj_id not in seen:
+                ops.append(('delete', obj_id))
+        return ops
+
+    def _append_journal(self, file_path: str, ops: List[Op]):
+        if not ops:
+            return
+        lines = "".join(
+            json.dumps({'op': op, 'id': target} if op == 'delete' else {'op': op, 'record': _record(target)}, ensure_ascii=False) + "\n"
+            for op, target in ops
+        )
+        with open(self._log_file(file_path), 'a', encoding='utf-8') as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def compact(self, model_type: str | None = None):
+        """把日志合并进快照并清空日志。model_type 为空时合并所有模型"""
+        if not self.journal:
+            return
+        with self._lock:
+            self._compact([model_type] if model_type else list(self._models))
+
+    def _compact(self, model_types: List[str]):
+        for mt in model_types:
+            file_path, _ = self._model_info(mt)
+            entry = self._load_cached(mt)
+            if entry.log_size == 0:
+                continue
+            # 先原子替换快照再删除日志；两步之间崩溃时重放日志是幂等的
+            self._save_objects(file_path, entry.objects)
+            os.remove(self._log_file(file_path))
+            entry.stamp = self._storage_stamp(mt)
+            entry.log_size = 0
+
+    # --- Cache ---
+    def _model_info(self, model_type: str) -> Tuple[str, Type[Any]]:
+        info = self._models.get(model_type)
+        if info is None:
+            raise ValueError(f"Unknown model type: {model_type}")
+        return info
+
+    def _file_stamp(self, file_path: str) -> Optional[Tuple[int, int]]:
+        """文件指纹 (mtime_ns, size)，文件不存在时为 None"""
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    # --- Storage hooks (子类可以替换为其他存储后端) ---
+    def _storage_stamp(self, model_type: str) -> Any:
+        """存储的版本指纹，变化时缓存失效"""
+        file_path, _ = self._model_info(model_type)
+        if self.journal:
+            return (self._file_stamp(file_path), self._file_stamp(self._log_file(file_path)))
+        return self._file_stamp(file_path)
+
+    def _persistent_stamp(self, model_type: str) -> Any:
+        """跨进程重启依然有效的版本指纹，用于判断磁盘上的映射存储是否过期"""
+        return self._storage_stamp(model_type)
+
+    def _load_from_storage(self, model_type: str) -> Tuple[List[Any], int]:
+        """从存储加载全部对象，返回 (对象列表, 未合并的日志行数)"""
+        file_path, model_class = self._model_info(model_type)
+        if self.journal:
+            return self._replay_journal(file_path, model_class)
+        return self._load_objects(file_path, model_class), 0
+
+    def _iter_from_storage(self, model_type: str) -> Iterator[Any]:
+        """逐条从存储解码对象；日志模式下日志改动在内存中，快照仍是流式读取"""
+        file_path, model_class = self._model_info(model_type)
+        changes = self._read_log(file_path)[0] if self.journal else {}
+        for record in self._iter_data(file_path):
+            if record['id'] in changes:
+                record = changes.pop(record['id'])
+                if record is None:
+                    continue
+            yield model_class(**record)
+        for record in changes.values():
+            if record is not None:
+                yield model_class(**record)
+
+    def _write_to_storage(self, model_type: str, entry: _CacheEntry, objects: List[Any], ops: List[Op]) -> int:
+        """把变更写入存储，返回写入后未合并的日志行数"""
+        file_path, _ = self._model_info(model_type)
+        if self.journal:
+            # 只追加发生变化的记录，写入量与改动量成正比，而不是与数据量成正比
+            self._append_journal(file_path, ops)
+            return entry.log_size + len(ops)
+        self._save_objects(file_path, objects)
+        return 0
+
+    def _load_cached(self, model_type: str) -> _CacheEntry:
+        """返回最新的缓存项；文件被外部修改过（指纹变化）时重新解析"""
+        with self._lock:
+            stamp = self._storage_stamp(model_type)
+            entry = self._cache.get(model_type)
+            if entry is None or entry.stamp != stamp:
+                objects, log_size = self._load_from_storage(model_type)
+                entry = _CacheEntry(stamp, objects, log_size, self._index_factories[model_type])
+                self._cache[model_type] = entry
+                self._revisions[model_type] += 1
+            return entry
+
+    def invalidate_cache(self, model_type: str | None = None):
+        """丢弃缓存，下次读取时强制从磁盘重新加载"""
+        if model_type is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(model_type, None)
+
+    # --- Transactions ---
+    def _active_tx(self) -> _Transaction | None:
+        return getattr(self._tx_local, 'tx', None)
+
+    @contextmanager
+    def transaction(self) -> Iterator[_Transaction]:
+        """
+        工作单元：块内的 get_all / save_all / get_by_id / insert / update / delete 都作用于同一份内存视图，
+        正常退出时每个被修改过的模型只写一次（原子替换文件），抛出异常时丢弃所有修改，
+        包括对缓存对象的原地修改。嵌套调用会并入最外层事务。
+        只经 insert / update / delete 修改的模型只写入记录的操作，块内原地修改的其他对象需显式 update。
+        注意派生索引 (get_index) 在事务内仍反映已提交的数据。
+        """
+        if self._active_tx() is not None:
+            yield self._active_tx()
+            return
+        with self._lock:
+            tx = _Transaction(self)
+            self._tx_local.tx = tx
+            try:
+                yield tx
+            except BaseException:
+                self._tx_local.tx = None
+                self._rollback(tx.views)
+                raise
+            self._tx_local.tx = None
+            pending = [mt for mt in self._models if mt in tx.dirty]
+            try:
+                while pending:
+                    model_type = pending[0]
+                    objects = tx.views[model_type]
+                    entry = self._load_cached(model_type)
+                    if model_type in tx.ops:
+                        self._commit(model_type, entry, objects, tx.ops[model_type])
+                    else:
+                        self._commit(model_type, entry, objects, self._diff(entry, objects), full=True)
+                    pending.pop(0)
+            except BaseException:
+                self._rollback(pending)
+                raise
+
+    def _rollback(self, model_types: Iterable[str]):
+        """撤销对缓存对象的原地修改：按缓存中的字段快照恢复"""
+        for model_type in model_types:
+            entry = self._cache.get(model_type)
+            if entry is None:
+                continue
+            for obj in entry.objects:
+                record = entry.records.get(obj.id)
+                if record is None or _fingerprint(obj) == record:
+                    continue
+                for name, value in zip(_field_names(type(obj)), record):
+                    setattr(obj, name, list(value) if isinstance(value, tuple) else value)
+
     # --- Generic Methods ---
     def get_all(self, model_type: str) -> List[Any]:
-        if model_type == 'user': return self._load_objects(self.users_file, models.User)
-        if model_type == 'item': return self._load_objects(self.items_file, models.Item)
-        if model_type == 'interaction': return self._load_objects(self.interactions_file, models.InterestInteraction)
-        raise ValueError(f"Unknown model type: {model_type}")
+        """
+        返回某个模型的全部对象。
+        返回的是缓存列表的副本，但对象本身与缓存共享：修改对象后应调用 save_all 持久化。
+        """
+        tx = self._active_tx()
+        if tx is not None:
+            return list(tx.view(model_type))
+        return list(self._load_cached(model_type).objects)
+
+    def iter_all(self, model_type: str) -> Iterator[Any]:
+        """
+        逐个产出某个模型的全部对象。缓存已是最新时直接遍历缓存；
+        否则流式解码数据文件（顶层数组或 JSON Lines），内存占用与数据量无关，且不填充缓存，
+        适合导出、迁移等一次性的全量扫描。
+        """
+        tx = self._active_tx()
+        if tx is not None:
+            yield from list(tx.view(model_type))
+            return
+        entry = self._cache.get(model_type)
+        if entry is not None and entry.stamp == self._storage_stamp(model_type):
+            # 提交时缓存换用新列表，遍历中的旧列表不受影响
+            yield from entry.objects
+            return
+        yield from self._iter_from_storage(model_type)
 
     def save_all(self, model_type: str, objects: List[Any]):
-        if model_type == 'user': self._save_objects(self.users_file, objects)
-        elif model_type == 'item': self._save_objects(self.items_file, objects)
-        elif model_type == 'interaction': self._save_objects(self.interactions_file, objects)
-        else: raise ValueError(f"Unknown model type: {model_type}")
\ No newline at end of file
+        tx = self._active_tx()
+        if tx is not None:
+            self._model_info(model_type)
+            tx.replace(model_type, objects)
+            return
+        with self._lock:
+            entry = self._load_cached(model_type)
+            objects = list(objects)
+            self._commit(model_type, entry, objects, self._diff(entry, objects), full=True)
+
+    def _commit(self, model_type: str, entry: _CacheEntry, objects: List[Any], ops: List[Op], full: bool = False):
+        """落盘后再更新缓存和索引；写入失败时缓存保持原样"""
+        if ops:
+            entry.log_size = self._write_to_storage(model_type, entry, objects, ops)
+            entry.stamp = self._storage_stamp(model_type)
+        entry.apply(objects, ops, full)
+        if ops:
+            self._revisions[model_type] += 1
+
+        if self.journal and 0 < self.compact_threshold <= entry.log_size:
+            self._compact([model_type])
+
+    def revision(self, model_type: str) -> int:
+        """模型的数据版本号，数据发生任何变化（包括外部修改文件）后都会改变"""
+        self._load_cached(model_type)
+        return self._revisions[model_type]
+
+    def memory_usage(self, model_type: str) -> int:
+        """
+        估算某个模型已加载数据占用的字节数：对象及字段值（见 models.estimate_memory），
+        加上缓存自身的对象列表、主键字典和字段快照；不含派生索引。
+        """
+        entry = self._load_cached(model_type)
+        usage = models.estimate_memory(entry.objects)
+        usage += sys.getsizeof(entry.objects) + sys.getsizeof(entry.by_id) + sys.getsizeof(entry.records)
+        usage += sum(sys.getsizeof(record) for record in entry.records.values())
+        return usage
+
+    # --- Memory-mapped Stores ---
+    def mapped_store(self, model_type: str) -> MappedStore:
+        """
+        返回某个模型的只读内存映射存储（数据目录下的 <模型文件名>.mmap），记录在访问时才解码。
+        磁盘上的存储与数据文件指纹一致时直接映射，不解析数据文件；否则从当前数据重建。
+        重建前会关闭之前返回的存储（Windows 上仍被映射的文件不能替换），调用方不应长期持有它。
+        """
+        file_path, model_class = self._model_info(model_type)
+        with self._lock:
+            store = self._current_store(model_type)
+            if store is None:
+                stamp = json.loads(json.dumps(self._persistent_stamp(model_type)))
+                store_path = os.path.splitext(file_path)[0] + ".mmap"
+                MappedStore.write(store_path, (_record(obj) for obj in self.iter_all(model_type)), stamp)
+                store = self._stores[model_type] = MappedStore(store_path, model_class)
+            return store
+
+    def _current_store(self, model_type: str) -> MappedStore | None:
+        """已打开或磁盘上与数据指纹一致的映射存储；都已过期时关闭它们并返回 None"""
+        file_path, model_class = self._model_info(model_type)
+        stamp = json.loads(json.dumps(self._persistent_stamp(model_type)))
+        store = self._stores.get(model_type)
+        if store is not None and store.stamp == stamp:
+            return store
+        if store is not None:
+            store.close()
+            del self._stores[model_type]
+        try:
+            store = MappedStore(os.path.splitext(file_path)[0] + ".mmap", model_class)
+        except (FileNotFoundError, ValueError):
+            return None
+        if store.stamp != stamp:
+            store.close()
+            return None
+        self._stores[model_type] = store
+        return store
+
+    def read_page(self, model_type: str, offset: int, limit: int) -> Tuple[List[Any], int]:
+        """
+        按 id 顺序读取一页对象，返回 (对象列表, 总数)。
+        缓存已是最新时（例如本进程写入过）直接沿主键有序索引取；否则映射存储仍是最新时只解码这一页。
+        两者都过期时加载一次缓存并重建一次存储（供下次冷启动直接映射），
+        之后本进程的写入增量更新缓存，浏览不会再重写存储。
+        """
+        tx = self._active_tx()
+        if tx is not None and model_type in tx.dirty:
+            objects = sorted(tx.view(model_type), key=lambda obj: obj.id)
+            return objects[offset:offset + limit], len(objects)
+        self.register_index(model_type, 'id', lambda: SortedIndex('id'))
+        with self._lock:
+            entry = self._cache.get(model_type)
+            if entry is None or entry.stamp != self._storage_stamp(model_type):
+                # 切片在锁内完成，其他线程重建存储时不会关闭正在读取的映射
+                store = self._current_store(model_type)
+                if store is not None:
+                    return store[offset:offset + limit], len(store)
+                entry = self._load_cached(model_type)
+                self.mapped_store(model_type)
+            ids = islice(entry.index('id').iter_range(), offset, offset + limit)
+            return [entry.by_id[obj_id] for obj_id in ids], len(entry.objects)
+
+    # --- Indexes ---
+    def register_index(self, model_type: str, name: str, factory: Callable[[], ModelIndex]):
+        """为模型注册派生索引；同名索引只注册一次"""
+        self._model_info(model_type)
+        if name in self._index_factories[model_type]:
+            return
+        self._index_factories[model_type][name] = factory
+
+    def count(self, model_type: str) -> int:
+        """记录数，直接取自缓存（事务中为工作视图），不复制对象列表"""
+        tx = self._active_tx()
+        if tx is not None and model_type in tx.dirty:
+            return len(tx.view(model_type))
+        with self._lock:
+            return len(self._load_cached(model_type).objects)
+
+    def get_index(self, model_type: str, name: str) -> ModelIndex:
+        with self._lock:
+            return self._load_cached(model_type).index(name)
+
+    # --- Point Access ---
+    def get_by_id(self, model_type: str, obj_id: int) -> Any | None:
+        tx = self._active_tx()
+        if tx is not None and model_type in tx.dirty:
+            changed = tx.changed.get(model_type)
+            if changed is None:
+                return next((o for o in tx.view(model_type) if o.id == obj_id), None)
+            if obj_id in changed:
+                return changed[obj_id]
+        return self._load_cached(model_type).by_id.get(obj_id)
+
+    def get_user_by_email(self, email: str) -> models.User | None:
+        """按规范化邮箱（去空白、不区分大小写）查找用户"""
+        tx = self._active_tx()
+        if tx is not None and 'user' in tx.dirty:
+            key = normalize_email(email)
+            return next((u for u in tx.view('user') if normalize_email(u.email) == key), None)
+        entry = self._load_cached('user')
+        with self._lock:
+            user_id = entry.index('email').lookup(email)
+        return entry.by_id.get(user_id) if user_id is not None else None
+
+    def insert(self, model_type: str, obj: Any):
+        """插入一个新对象；id 已存在时抛出 ValueError"""
+        if self.get_by_id(model_type, obj.id) is not None:
+            raise ValueError(f"Duplicate {model_type} id: {obj.id}")
+        tx = self._active_tx()
+        if tx is not None:
+            tx.record(model_type, tx.view(model_type) + [obj], [('insert', obj)])
+            return
+        with self._lock:
+            entry = self._load_cached(model_type)
+            self._commit(model_type, entry, entry.objects + [obj], [('insert', obj)])
+
+    def update(self, model_type: str, obj: Any):
+        """
+        按 id 写回一个已存在的对象，通常是原地修改过的缓存对象；只写这一条，不对比其他记录。
+        id 不存在时抛出 ValueError。
+        """
+        current = self.get_by_id(model_type, obj.id)
+        if current is None:
+            raise ValueError(f"Unknown {model_type} id: {obj.id}")
+        tx = self._active_tx()
+        if tx is not None:
+            view = tx.view(model_type)
+            if current is not obj:
+                view = [obj if o is current else o for o in view]
+            tx.record(model_type, view, [('update', obj)])
+            return
+        with self._lock:
+            entry = self._load_cached(model_type)
+            objects = entry.objects
+            if current is not obj:
+                objects = [obj if o is current else o for o in objects]
+            self._commit(model_type, entry, objects, [('update', obj)])
+
+    def delete(self, model_type: str, obj_id: int) -> bool:
+        """按 id 删除一个对象，返回是否真的删除了"""
+        if self.get_by_id(model_type, obj_id) is None:
+            return False
+        tx = self._active_tx()
+        if tx is not None:
+            tx.record(model_type, [o for o in tx.view(model_type) if o.id != obj_id], [('delete', obj_id)])
+            return True
+        with self._lock:
+            entry = self._load_cached(model_type)
+            remaining = [o for o in entry.objects if o.id != obj_id]
+            self._commit(model_type, entry, remaining, [('delete', obj_id)])
+        return True
+
+    def delete_many(self, model_type: str, obj_ids: Iterable[int]) -> int:
+        """按 id 批量删除，只遍历一次、只写一次；返回实际删除的数量"""
+        obj_ids = set(obj_ids)
+        tx = self._active_tx()
+        if tx is not None:
+            view = tx.view(model_type)
+            remaining = [o for o in view if o.id not in obj_ids]
+            if len(remaining) < len(view):
+                tx.record(model_type, remaining, [('delete', o.id) for o in view if o.id in obj_ids])
+            return len(view) - len(remaining)
+        with self._lock:
+            entry = self._load_cached(model_type)
+            remaining = [o for o in entry.objects if o.id not in obj_ids]
+            deleted = [o.id for o in entry.objects if o.id in obj_ids]
+            if deleted:
+                self._commit(model_type, entry, remaining, [('delete', obj_id) for obj_id in deleted])
+        return len(deleted)
@@ -0,0 +1,388 @@
+"""
+只依赖标准库的 asyncio HTTP/JSON 接口，复用 DataManager 与各个 Service。
+
+接口（请求与响应体均为 JSON，需要登录的接口带 "Authorization: Bearer <session_id>"）：
+    POST   /register                 {email, password, nickname, contact_info}
+    POST   /login                    {email, password} -> {session_id, user}
+    POST   /logout
+    GET    /items?offset=&limit=     按 id 分页浏览
+    GET    /items/search?q=&offset=&limit=
+    POST   /items                    {title, description, price, image_paths}
+    POST   /items/<id>/interest      -> {contact_info}
+    GET    /admin/users | /admin/items   ?sort=&desc=&q=&cursor=&limit=&total=  游标分页，响应带 next_cursor
+    GET    /admin/stats
+    DELETE /admin/users/<id> | /admin/items/<id>
+
+HTTP/1.1 连接默认保持 (keep-alive)。--workers N 时由父进程创建监听套接字，
+N 个子进程各自运行事件循环共同 accept；此时数据使用 SQLite 存储、会话使用 SQLite 共享后端，
+保证各进程看到同一份数据和会话。
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import socket
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import Any, Awaitable, Callable, Dict, List, Pattern, Tuple
+from urllib.parse import parse_qs, urlsplit
+from src.async_data_manager import AsyncDataManager
+from src.data_manager import DataManager, _record
+from src.models import User
+from src.pagination import Page
+from src.services.async_services import AsyncAdminService, AsyncAuthService, AsyncItemService
+from src.services.session_backends import SqliteSessionBackend
+from src.services.session_store import SessionStore
+from src.sqlite_data_manager import SqliteDataManager
+
+logger = logging.getLogger(__name__)
+
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+KEEP_ALIVE_TIMEOUT = 15.0
+
+class HttpError(Exception):
+    def __init__(self, status: HTTPStatus, message: str | None = None):
+        super().__init__(message or status.phrase)
+        self.status = status
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    query: Dict[str, List[str]]
+    headers: Dict[str, str]
+    body: bytes
+    params: Tuple[str, ...] = ()
+
+    def json(self) -> Dict[str, Any]:
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Request body is not valid JSON.")
+        if not isinstance(data, dict):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Request body must be a JSON object.")
+        return data
+
+    def field(self, data: Dict[str, Any], name: str) -> Any:
+        if name not in data:
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"Missing field: {name}")
+        return data[name]
+
+    def str_field(self, data: Dict[str, Any], name: str, default: str | None = None) -> str:
+        """必填（default 为 None 时）的字符串字段；类型不符时返回 400，而不是把非字符串写入数据"""
+        value = self.field(data, name) if default is None else data.get(name, default)
+        if not isinstance(value, str):
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"Field {name} must be a string.")
+        return value
+
+    def str_list_field(self, data: Dict[str, Any], name: str) -> List[str]:
+        value = data.get(name, [])
+        if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"Field {name} must be a list of strings.")
+        return value
+
+    def str_arg(self, name: str, default: str = "") -> str:
+        return self.query.get(name, [default])[0]
+
+    def int_arg(self, name: str, default: int) -> int:
+        try:
+            return int(self.query.get(name, [default])[0])
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"Query parameter {name} must be an integer.")
+
+    @property
+    def session_id(self) -> str:
+        scheme, _, token = self.headers.get('authorization', "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            raise HttpError(HTTPStatus.UNAUTHORIZED, "Missing bearer session token.")
+        return token
+
+    @property
+    def keep_alive(self) -> bool:
+        connection = self.headers.get('connection', "").lower()
+        return connection != "close"
+
+Handler = Callable[[Request], Awaitable[Tuple[HTTPStatus, Any]]]
+
+def _user_view(user: User) -> Dict[str, Any]:
+    """对外返回的用户信息，不包含密码哈希"""
+    data = _record(user)
+    data.pop('password_hash', None)
+    return data
+
+def _page_view(page: Page, view: Callable[[Any], Dict[str, Any]] = _record) -> Dict[str, Any]:
+    return {
+        'items': [view(obj) for obj in page.items],
+        'total': page.total,
+        'offset': page.offset,
+        'limit': page.limit,
+        'has_more': page.has_more,
+        'next_cursor': page.next_cursor,
+    }
+
+class ApiServer:
+    def __init__(self, auth_service: AsyncAuthService, item_service: AsyncItemService, admin_service: AsyncAdminService,
+                 keep_alive_timeout: float = KEEP_ALIVE_TIMEOUT):
+        self.auth_service = auth_service
+        self.item_service = item_service
+        self.admin_service = admin_service
+        self.keep_alive_timeout = keep_alive_timeout
+        self.routes: List[Tuple[str, Pattern[str], Handler]] = [
+            ("POST", re.compile(r"/register"), self.register),
+            ("POST", re.compile(r"/login"), self.login),
+            ("POST", re.compile(r"/logout"), self.logout),
+            ("GET", re.compile(r"/items"), self.browse_items),
+            ("GET", re.compile(r"/items/search"), self.search_items),
+            ("POST", re.compile(r"/items"), self.publish_item),
+            ("POST", re.compile(r"/items/(\d+)/interest"), self.express_interest),
+            ("GET", re.compile(r"/admin/users"), self.list_users),
+            ("GET", re.compile(r"/admin/items"), self.list_items),
+            ("GET", re.compile(r"/admin/stats"), self.item_statistics),
+            ("DELETE", re.compile(r"/admin/users/(\d+)"), self.delete_user),
+            ("DELETE", re.compile(r"/admin/items/(\d+)"), self.delete_item),
+        ]
+
+    # --- Handlers ---
+    async def register(self, request: Request):
+        data = request.json()
+        user = await self.auth_service.register(
+            request.str_field(data, 'email'), request.str_field(data, 'password'),
+            request.str_field(data, 'nickname'), request.str_field(data, 'contact_info'),
+        )
+        return HTTPStatus.CREATED, _user_view(user)
+
+    async def login(self, request: Request):
+        data = request.json()
+        session_id, user = await self.auth_service.login(request.str_field(data, 'email'), request.str_field(data, 'password'))
+        return HTTPStatus.OK, {'session_id': session_id, 'user': _user_view(user)}
+
+    async def logout(self, request: Request):
+        await self.auth_service.logout(request.session_id)
+        return HTTPStatus.OK, {}
+
+    async def browse_items(self, request: Request):
+        page = await self.item_service.browse_items(request.int_arg('offset', 0), request.int_arg('limit', 20))
+        return HTTPStatus.OK, _page_view(page)
+
+    async def search_items(self, request: Request):
+        keyword = request.str_arg('q')
+        page = await self.item_service.search_page(keyword, request.int_arg('offset', 0), request.int_arg('limit', 20))
+        return HTTPStatus.OK, _page_view(page)
+
+    async def publish_item(self, request: Request):
+        data = request.json()
+        price = request.field(data, 'price')
+        if isinstance(price, bool) or not isinstance(price, (int, float)):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Field price must be a number.")
+        item = await self.item_service.publish_item(
+            request.session_id, request.str_field(data, 'title'), request.str_field(data, 'description', ""),
+            float(price), request.str_list_field(data, 'image_paths'),
+        )
+        return HTTPStatus.CREATED, _record(item)
+
+    async def express_interest(self, request: Request):
+        contact_info = await self.item_service.express_interest(request.session_id, int(request.params[0]))
+        return HTTPStatus.OK, {'contact_info': contact_info}
+
+    def _listing_options(self, request: Request) -> Dict[str, Any]:
+        """管理员列表的查询参数：sort、desc、q、cursor、limit、total"""
+        return dict(
+            sort_by=request.str_arg('sort', 'id'), descending=request.str_arg('desc') in ("1", "true"),
+            text=request.str_arg('q'), cursor=request.str_arg('cursor') or None,
+            limit=request.int_arg('limit', 50), include_total=request.str_arg('total') in ("1", "true"),
+        )
+
+    async def list_users(self, request: Request):
+        page = await self.admin_service.list_users(request.session_id, **self._listing_options(request))
+        return HTTPStatus.OK, _page_view(page, _user_view)
+
+    async def list_items(self, request: Request):
+        page = await self.admin_service.list_items(request.session_id, **self._listing_options(request))
+        return HTTPStatus.OK, _page_view(page)
+
+    async def item_statistics(self, request: Request):
+        try:
+            stats = await self.admin_service.get_item_statistics(request.session_id)
+        except ImportError as e:
+            raise HttpError(HTTPStatus.NOT_IMPLEMENTED, str(e))
+        return HTTPStatus.OK, stats
+
+    async def delete_user(self, request: Request):
+        deleted = await self.admin_service.delete_user(request.session_id, int(request.params[0]))
+        return (HTTPStatus.OK, {}) if deleted else (HTTPStatus.NOT_FOUND, {'error': "User not found."})
+
+    async def delete_item(self, request: Request):
+        deleted = await self.admin_service.delete_item(request.session_id, int(request.params[0]))
+        return (HTTPStatus.OK, {}) if deleted else (HTTPStatus.NOT_FOUND, {'error': "Item not found."})
+
+    # --- Dispatch ---
+    async def dispatch(self, request: Request) -> Tuple[HTTPStatus, Any]:
+        allowed = []
+        for method, pattern, handler in self.routes:
+            match = pattern.fullmatch(request.path)
+            if match is None:
+                continue
+            if method != request.method:
+                allowed.append(method)
+                continue
+            request.params = match.groups()
+            try:
+                return await handler(request)
+            except HttpError as e:
+                return e.status, {'error': str(e)}
+            except PermissionError as e:
+                return HTTPStatus.FORBIDDEN, {'error': str(e)}
+            except ValueError as e:
+                return HTTPStatus.BAD_REQUEST, {'error': str(e)}
+            except Exception:
+                logger.exception("Unhandled error in %s %s", request.method, request.path)
+                return HTTPStatus.INTERNAL_SERVER_ERROR, {'error': "Internal server error."}
+        if allowed:
+            return HTTPStatus.METHOD_NOT_ALLOWED, {'error': f"Allowed methods: {', '.join(allowed)}"}
+        return HTTPStatus.NOT_FOUND, {'error': "Not found."}
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Request | None:
+        """读取一个请求；连接在请求之间被关闭时返回 None"""
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as e:
+            if e.partial.strip():
+                raise HttpError(HTTPStatus.BAD_REQUEST, "Incomplete request.")
+            return None
+        except asyncio.LimitOverrunError:
+            raise HttpError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+
+        lines = head.decode('latin-1').split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ")
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Malformed request line.")
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        if version == "HTTP/1.0" and headers.get('connection', "").lower() != "keep-alive":
+            headers['connection'] = "close"
+
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length.")
+        if length > MAX_BODY_BYTES:
+            raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        body = await reader.readexactly(length) if length else b""
+        url = urlsplit(target)
+        return Request(method.upper(), url.path.rstrip("/") or "/", parse_qs(url.query), headers, body)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), self.keep_alive_timeout)
+                except HttpError as e:
+                    await self._respond(writer, e.status, {'error': str(e)}, keep_alive=False)
+                    return
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    return
+                if request is None:
+                    return
+                status, payload = await self.dispatch(request)
+                await self._respond(writer, status, payload, request.keep_alive)
+                if not request.keep_alive:
+                    return
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: HTTPStatus, payload: Any, keep_alive: bool):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8000, sock: socket.socket | None = None):
+        if sock is not None:
+            server = await asyncio.start_server(self.handle_connection, sock=sock, limit=MAX_HEADER_BYTES)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_HEADER_BYTES)
+        async with server:
+            await server.serve_forever()
+
+def build_server(data_folder: str = "data", shared: bool = False) -> ApiServer:
+    """
+    组装数据层与服务层。shared=True（多进程）时使用 SQLite 数据存储与 SQLite 会话后端，
+    使所有工作进程共享数据与会话。
+    """
+    if shared:
+        data_manager = SqliteDataManager(data_folder=data_folder)
+        sessions = SessionStore(backend=SqliteSessionBackend(os.path.join(data_folder, "sessions.db")))
+    else:
+        data_manager = DataManager(data_folder=data_folder)
+        sessions = SessionStore()
+    async_dm = AsyncDataManager(data_manager)
+    auth_service = AsyncAuthService(async_dm, sessions)
+    return ApiServer(auth_service, AsyncItemService(async_dm, auth_service), AsyncAdminService(async_dm, auth_service))
+
+def _run_worker(sock: socket.socket, data_folder: str, shared: bool):
+    try:
+        asyncio.run(build_server(data_folder, shared).serve(sock=sock))
+    except KeyboardInterrupt:
+        pass
+
+def run(host: str = "127.0.0.1", port: int = 8000, workers: int = 1, data_folder: str = "data",
+        storage: str | None = None):
+    """
+    启动服务。workers > 1 时父进程绑定端口后派生子进程共同处理连接；
+    storage 为 'json' 或 'sqlite'，默认单进程用 JSON、多进程用 SQLite。
+    """
+    storage = storage or ("sqlite" if workers > 1 else "json")
+    if workers > 1 and storage != "sqlite":
+        raise ValueError("Multiple workers require the sqlite storage backend.")
+    shared = storage == "sqlite"
+    if workers <= 1:
+        _run_worker(socket.create_server((host, port)), data_folder, shared)
+        return
+
+    import multiprocessing
+    sock = socket.create_server((host, port))
+    sock.set_inheritable(True)
+    context = multiprocessing.get_context("fork" if hasattr(os, "fork") else "spawn")
+    processes = [context.Process(target=_run_worker, args=(sock, data_folder, shared), daemon=True) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+
+def main(argv: List[str] | None = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve the trade platform as a JSON HTTP API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="number of worker processes sharing the listening socket")
+    parser.add_argument("--data-folder", default="data")
+    parser.add_argument("--storage", choices=["json", "sqlite"], help="defaults to json for one worker, sqlite for several")
+    args = parser.parse_args(argv)
+    run(args.host, args.port, args.workers, args.data_folder, args.storage)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,403 @@
+"""
+由 DataManager 维护的派生索引。
+
+索引注册到某个模型后，会在数据加载后第一次使用时整体构建，
+之后在每次 save_all / insert / delete 时只针对变化的对象增量更新。
+"""
+
+import bisect
+import heapq
+import math
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Set, Tuple
+
+class ModelIndex:
+    """派生索引基类。子类需要记住每个 id 对应的索引键，以便在对象被原地修改后仍能正确删除"""
+
+    def clear(self):
+        raise NotImplementedError
+
+    def add(self, obj: Any):
+        raise NotImplementedError
+
+    def discard(self, obj_id: int):
+        raise NotImplementedError
+
+    def rebuild(self, objects: Iterable[Any]):
+        self.clear()
+        for obj in objects:
+            self.add(obj)
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+class EmailIndex(ModelIndex):
+    """规范化邮箱 -> 用户 id 的唯一索引"""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._keys: Dict[int, str] = {}
+
+    def clear(self):
+        self._ids.clear()
+        self._keys.clear()
+
+    def add(self, obj: Any):
+        key = normalize_email(obj.email)
+        self._ids[key] = obj.id
+        self._keys[obj.id] = key
+
+    def discard(self, obj_id: int):
+        key = self._keys.pop(obj_id, None)
+        if key is not None and self._ids.get(key) == obj_id:
+            del self._ids[key]
+
+    def lookup(self, email: str) -> int | None:
+        return self._ids.get(normalize_email(email))
+
+class SortedIndex(ModelIndex):
+    """按某个字段排序的 (键, id) 列表，支持 O(log n) 定位区间后按序遍历"""
+
+    def __init__(self, attr: str):
+        self.attr = attr
+        self._entries: List[Tuple[Any, int]] = []
+        self._keys: Dict[int, Any] = {}
+
+    def clear(self):
+        self._entries.clear()
+        self._keys.clear()
+
+    def rebuild(self, objects: Iterable[Any]):
+        self._keys = {obj.id: getattr(obj, self.attr) for obj in objects}
+        self._entries = sorted((key, obj_id) for obj_id, key in self._keys.items())
+
+    def add(self, obj: Any):
+        key = getattr(obj, self.attr)
+        self._keys[obj.id] = key
+        bisect.insort(self._entries, (key, obj.id))
+
+    def discard(self, obj_id: int):
+        if obj_id not in self._keys:
+            return
+        entry = (self._keys.pop(obj_id), obj_id)
+        pos = bisect.bisect_left(self._entries, entry)
+        if pos < len(self._entries) and self._entries[pos] == entry:
+            del self._entries[pos]
+
+    def key_of(self, obj_id: int) -> Any:
+        return self._keys.get(obj_id)
+
+    def _bounds(self, low: Any = None, high: Any = None) -> Tuple[int, int]:
+        start = 0 if low is None else bisect.bisect_left(self._entries, (low, -math.inf))
+        stop = len(self._entries) if high is None else bisect.bisect_right(self._entries, (high, math.inf))
+        return start, max(start, stop)
+
+    def count(self, low: Any = None, high: Any = None) -> int:
+        start, stop = self._bounds(low, high)
+        return stop - start
+
+    def iter_range(self, low: Any = None, high: Any = None, descending: bool = False) -> Iterator[int]:
+        """按键顺序遍历 [low, high] 区间内的 id；边界为 None 表示不限"""
+        start, stop = self._bounds(low, high)
+        positions = range(stop - 1, start - 1, -1) if descending else range(start, stop)
+        for pos in positions:
+            yield self._entries[pos][1]
+
+    def iter_after(self, key: Any, obj_id: int, descending: bool = False) -> Iterator[int]:
+        """按顺序遍历严格位于 (key, obj_id) 之后的 id，用于游标分页"""
+        if descending:
+            positions = range(bisect.bisect_left(self._entries, (key, obj_id)) - 1, -1, -1)
+        else:
+            positions = range(bisect.bisect_right(self._entries, (key, obj_id)), len(self._entries))
+        for pos in positions:
+            yield self._entries[pos][1]
+
+class BitmapIndex(ModelIndex):
+    """低基数字段（如商品状态）的位图索引：每个取值一张以 id 为位号的位图"""
+
+    def __init__(self, attr: str):
+        self.attr = attr
+        self._bitmaps: Dict[Any, bytearray] = {}
+        self._keys: Dict[int, Any] = {}
+
+    def clear(self):
+        self._bitmaps.clear()
+        self._keys.clear()
+
+    def add(self, obj: Any):
+        value = getattr(obj, self.attr)
+        self._keys[obj.id] = value
+        bitmap = self._bitmaps.setdefault(value, bytearray())
+        byte = obj.id >> 3
+        if byte >= len(bitmap):
+            bitmap.extend(bytes(byte - len(bitmap) + 1))
+        bitmap[byte] |= 1 << (obj.id & 7)
+
+    def discard(self, obj_id: int):
+        value = self._keys.pop(obj_id, None)
+        if value is None:
+            return
+        self._bitmaps[value][obj_id >> 3] &= ~(1 << (obj_id & 7)) & 0xFF
+
+    def contains(self, value: Any, obj_id: int) -> bool:
+        bitmap = self._bitmaps.get(value)
+        byte = obj_id >> 3
+        return bitmap is not None and byte < len(bitmap) and bool(bitmap[byte] >> (obj_id & 7) & 1)
+
+    def count(self, value: Any) -> int:
+        bitmap = self._bitmaps.get(value)
+        return int.from_bytes(bitmap, 'little').bit_count() if bitmap else 0
+
+class GroupIndex(ModelIndex):
+    """字段值 -> id 集合，例如 卖家 id -> 商品 id；给出多个字段时键为字段值元组，如 (买家 id, 商品 id)"""
+
+    def __init__(self, *attrs: str):
+        self.attrs = attrs
+        self._groups: Dict[Any, Set[int]] = {}
+        self._keys: Dict[int, Any] = {}
+
+    def clear(self):
+        self._groups.clear()
+        self._keys.clear()
+
+    def add(self, obj: Any):
+        value = getattr(obj, self.attrs[0]) if len(self.attrs) == 1 else tuple(getattr(obj, a) for a in self.attrs)
+        self._keys[obj.id] = value
+        self._groups.setdefault(value, set()).add(obj.id)
+
+    def discard(self, obj_id: int):
+        if obj_id not in self._keys:
+            return
+        value = self._keys.pop(obj_id)
+        group = self._groups[value]
+        group.discard(obj_id)
+        if not group:
+            del self._groups[value]
+
+    def ids(self, value: Any) -> Set[int]:
+        return self._groups.get(value, set())
+
+    def duplicates(self) -> Iterator[Tuple[Any, Set[int]]]:
+        """包含不止一个 id 的分组"""
+        return ((value, ids) for value, ids in self._groups.items() if len(ids) > 1)
+
+# 搜索索引使用的最长字符 n-gram。中文标题没有空格，按字符切分才能命中
+MAX_GRAM = 3
+
+def _ngrams(text: str) -> Iterable[str]:
+    """文本中所有长度为 1..MAX_GRAM 的字符片段（跳过纯空白片段）"""
+    for n in range(1, MAX_GRAM + 1):
+        for i in range(len(text) - n + 1):
+            gram = text[i:i + n]
+            if not gram.isspace():
+                yield gram
+
+def _query_grams(query: str) -> Set[str]:
+    """
+    用于筛选候选的 n-gram：短查询本身就是一个 gram，长查询取所有 MAX_GRAM-gram。
+    与 _ngrams 一致跳过纯空白片段（它们没有被索引）；最后的子串校验保证结果仍然准确。
+    查询已去掉首尾空白，因此至少保留一个 gram。
+    """
+    if len(query) <= MAX_GRAM:
+        return {query}
+    grams = (query[i:i + MAX_GRAM] for i in range(len(query) - MAX_GRAM + 1))
+    return {gram for gram in grams if not gram.isspace()}
+
+class SearchIndex(ModelIndex):
+    """
+    商品标题与描述的倒排索引（字符 n-gram -> {商品 id: 词频}）。
+    查询先用 n-gram 倒排表求交集得到候选，再做一次子串校验，
+    因此结果与逐个商品做 `keyword in text` 完全一致，但只与候选数量相关。
+    """
+
+    # BM25 参数
+    K1 = 1.2
+    B = 0.75
+    # 新发布商品的加权：得分乘以 (1 + RECENCY_WEIGHT * 0.5 ** (发布时长 / RECENCY_HALF_LIFE))
+    RECENCY_WEIGHT = 0.5
+    RECENCY_HALF_LIFE = 7 * 24 * 3600.0
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._docs: Dict[int, Tuple[str, str]] = {} # id -> (小写标题, 小写描述)
+        self._doc_len: Dict[int, int] = {} # id -> n-gram 总数
+        self._created_at: Dict[int, float] = {}
+        self._total_len = 0
+
+    def clear(self):
+        self._postings.clear()
+        self._docs.clear()
+        self._doc_len.clear()
+        self._created_at.clear()
+        self._total_len = 0
+
+    def add(self, obj: Any):
+        title, description = obj.title.lower(), obj.description.lower()
+        self._docs[obj.id] = (title, description)
+        counts = Counter(_ngrams(title))
+        counts.update(_ngrams(description))
+        for gram, tf in counts.items():
+            self._postings.setdefault(gram, {})[obj.id] = tf
+        self._doc_len[obj.id] = sum(counts.values())
+        self._created_at[obj.id] = obj.created_at
+        self._total_len += self._doc_len[obj.id]
+
+    def discard(self, obj_id: int):
+        texts = self._docs.pop(obj_id, None)
+        if texts is None:
+            return
+        for gram in set(_ngrams(texts[0])) | set(_ngrams(texts[1])):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.pop(obj_id, None)
+                if not posting:
+                    del self._postings[gram]
+        self._total_len -= self._doc_len.pop(obj_id)
+        del self._created_at[obj_id]
+
+    def _matches(self, query: str) -> Set[int]:
+        postings = [self._postings.get(gram) for gram in _query_grams(query)]
+        if not all(postings):
+            return set()
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting.keys())
+        return {
+            obj_id for obj_id in candidates
+            if query in self._docs[obj_id][0] or query in self._docs[obj_id][1]
+        }
+
+    def search(self, keyword: str) -> List[int]:
+        """返回标题或描述中包含 keyword（不区分大小写）的商品 id，按 id 升序"""
+        query = keyword.lower().strip()
+        if not query:
+            return sorted(self._docs)
+        return sorted(self._matches(query))
+
+    def rank(self, keyword: str, k: int, now: float | None = None) -> Tuple[List[int], int]:
+        """
+        按 BM25 相关度（乘以新品加权）返回得分最高的 k 个商品 id 以及命中总数。
+        用大小为 k 的堆选出前 k 个，不对全部命中结果排序。关键词为空时按发布时间倒序。
+        """
+        query = keyword.lower().strip()
+        if not query:
+            top = heapq.nlargest(k, self._docs, key=lambda obj_id: (self._created_at[obj_id], obj_id))
+            return top, len(self._docs)
+
+        matches = self._matches(query)
+        if not matches:
+            return [], 0
+        now = time.time() if now is None else now
+        n = len(self._docs)
+        avg_len = self._total_len / n if n else 1.0
+        terms = []
+        for gram in _query_grams(query):
+            posting = self._postings.get(gram)
+            if posting is None:
+                continue
+            df = len(posting)
+            terms.append((posting, math.log(1 + (n - df + 0.5) / (df + 0.5))))
+
+        def score(obj_id: int) -> Tuple[float, int]:
+            norm = self.K1 * (1 - self.B + self.B * self._doc_len[obj_id] / avg_len)
+            relevance = 0.0
+            for posting, idf in terms:
+                tf = posting[obj_id]
+                relevance += idf * tf * (self.K1 + 1) / (tf + norm)
+            age = max(0.0, now - self._created_at[obj_id])
+            boost = 1 + self.RECENCY_WEIGHT * 0.5 ** (age / self.RECENCY_HALF_LIFE)
+            return relevance * boost, obj_id
+
+        return heapq.nlargest(k, matches, key=score), len(matches)
+
+class InterestIndex(ModelIndex):
+    """
+    购买意向（互动记录）的增量统计：每个商品与每个卖家的意向数，以及按时间衰减的热度。
+    意向数按记录的 count 累加，即表达意向的次数而不是去重后的记录数；合并后的记录
+    以最近一次时间计热度。热度 = Σ count · 2^((t - now) / half_life)。为避免每次查询都重新衰减，内部保存的是
+    Σ 2^((t - ref) / half_life)，所有商品共享同一个基准时间 ref，排名与 now 无关；
+    新记录使指数过大时整体换到新的基准 (rebase)，防止浮点溢出。
+    """
+
+    HALF_LIFE = 24 * 3600.0
+    # 指数超过该值时换基准，2^64 仍远小于浮点上限
+    REBASE_EXPONENT = 64.0
+
+    def __init__(self, seller_of: Callable[[int], int | None], half_life: float = HALF_LIFE):
+        self.seller_of = seller_of
+        self.half_life = half_life
+        self.clear()
+
+    def clear(self):
+        self._item_counts: Counter = Counter()
+        self._seller_counts: Counter = Counter()
+        self._weights: Dict[int, float] = {} # 商品 id -> 相对 ref 的热度
+        self._entries: Dict[int, Tuple[int, int | None, float, int]] = {} # 记录 id -> (商品 id, 卖家 id, 时间, 次数)
+        self._ref: float | None = None
+
+    def rebuild(self, objects: Iterable[Any]):
+        objects = list(objects)
+        self.clear()
+        # 以最新的记录为基准，整体构建时不需要换基准
+        self._ref = max((obj.interaction_time for obj in objects), default=None)
+        for obj in objects:
+            self.add(obj)
+
+    def _weight(self, timestamp: float) -> float:
+        return 2.0 ** ((timestamp - self._ref) / self.half_life)
+
+    def _rebase(self, ref: float):
+        factor = 2.0 ** ((self._ref - ref) / self.half_life)
+        for item_id in self._weights:
+            self._weights[item_id] *= factor
+        self._ref = ref
+
+    def add(self, obj: Any):
+        timestamp = obj.interaction_time
+        if self._ref is None:
+            self._ref = timestamp
+        elif (timestamp - self._ref) / self.half_life > self.REBASE_EXPONENT:
+            self._rebase(timestamp)
+        seller_id = self.seller_of(obj.item_id)
+        self._entries[obj.id] = (obj.item_id, seller_id, timestamp, obj.count)
+        self._item_counts[obj.item_id] += obj.count
+        if seller_id is not None:
+            self._seller_counts[seller_id] += obj.count
+        self._weights[obj.item_id] = self._weights.get(obj.item_id, 0.0) + obj.count * self._weight(timestamp)
+
+    def discard(self, obj_id: int):
+        entry = self._entries.pop(obj_id, None)
+        if entry is None:
+            return
+        item_id, seller_id, timestamp, count = entry
+        self._item_counts[item_id] -= count
+        if self._item_counts[item_id] <= 0:
+            del self._item_counts[item_id]
+            del self._weights[item_id]
+        else:
+            self._weights[item_id] = max(0.0, self._weights[item_id] - count * self._weight(timestamp))
+        if seller_id is not None:
+            self._seller_counts[seller_id] -= count
+            if self._seller_counts[seller_id] <= 0:
+                del self._seller_counts[seller_id]
+
+    def count(self, item_id: int) -> int:
+        return self._item_counts.get(item_id, 0)
+
+    def seller_count(self, seller_id: int) -> int:
+        return self._seller_counts.get(seller_id, 0)
+
+    def score(self, item_id: int, now: float | None = None) -> float:
+        """商品在 now 时刻的衰减热度（每次意向刚发生时贡献 1，每过一个半衰期减半）"""
+        weight = self._weights.get(item_id)
+        if weight is None:
+            return 0.0
+        now = time.time() if now is None else now
+        return weight * 2.0 ** ((self._ref - now) / self.half_life)
+
+    def trending(self, k: int, by: str = 'score') -> List[int]:
+        """热度（或意向总数，by='count'）最高的 k 个商品 id，用堆选出而不排序全部商品"""
+        values = self._weights if by == 'score' else self._item_counts
+        return [item_id for item_id, _ in heapq.nlargest(k, values.items(), key=lambda kv: (kv[1], kv[0]))]
@@ -0,0 +1,151 @@
+"""
+商品目录的列式视图：每个字段一列 NumPy 数组，过滤用布尔掩码、统计用向量化运算完成。
+
+ItemColumns 作为派生索引注册到 DataManager 的 'item' 模型上，
+发布/修改/删除商品时随其他索引一起增量更新。NumPy 是可选依赖，只在创建列式视图时才需要。
+"""
+
+from typing import Any, Dict, Iterable, List, Sequence
+from src.indexes import ModelIndex
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SECONDS_PER_DAY = 24 * 3600
+
+class ItemColumns(ModelIndex):
+    """
+    id / seller_id / price / created_at / 状态码 五列数组。
+    删除只把行标记为失效，失效行超过一半时再整体压缩；追加按容量倍增，均摊 O(1)。
+    """
+
+    def __init__(self):
+        if np is None:
+            raise ImportError("ItemColumns requires numpy: pip install numpy")
+        self.status_codes: Dict[str, int] = {"AVAILABLE": 0, "SOLD": 1}
+        self.clear()
+
+    def clear(self):
+        self._allocate(0)
+        self._size = 0
+        self._rows: Dict[int, int] = {} # 商品 id -> 行号
+
+    def _allocate(self, capacity: int):
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.seller_ids = np.zeros(capacity, dtype=np.int64)
+        self.prices = np.zeros(capacity, dtype=np.float64)
+        self.created_at = np.zeros(capacity, dtype=np.float64)
+        self.statuses = np.zeros(capacity, dtype=np.int16)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+    def _columns(self) -> List[Any]:
+        return [self.ids, self.seller_ids, self.prices, self.created_at, self.statuses, self.alive]
+
+    def _status_code(self, status: str) -> int:
+        return self.status_codes.setdefault(status, len(self.status_codes))
+
+    def rebuild(self, objects: Iterable[Any]):
+        objects = list(objects)
+        n = len(objects)
+        self.ids = np.fromiter((obj.id for obj in objects), dtype=np.int64, count=n)
+        self.seller_ids = np.fromiter((obj.seller_id for obj in objects), dtype=np.int64, count=n)
+        self.prices = np.fromiter((obj.price for obj in objects), dtype=np.float64, count=n)
+        self.created_at = np.fromiter((obj.created_at for obj in objects), dtype=np.float64, count=n)
+        self.statuses = np.fromiter((self._status_code(obj.status) for obj in objects), dtype=np.int16, count=n)
+        self.alive = np.ones(n, dtype=bool)
+        self._size = n
+        self._rows = {obj.id: row for row, obj in enumerate(objects)}
+
+    def add(self, obj: Any):
+        if obj.id in self._rows:
+            self.discard(obj.id)
+        if self._size == len(self.ids):
+            old = self._columns()
+            self._allocate(max(16, 2 * self._size))
+            for new, column in zip(self._columns(), old):
+                new[:self._size] = column[:self._size]
+        row = self._size
+        self._size += 1
+        self._rows[obj.id] = row
+        self.ids[row] = obj.id
+        self.seller_ids[row] = obj.seller_id
+        self.prices[row] = obj.price
+        self.created_at[row] = obj.created_at
+        self.statuses[row] = self._status_code(obj.status)
+        self.alive[row] = True
+
+    def discard(self, obj_id: int):
+        row = self._rows.pop(obj_id, None)
+        if row is None:
+            return
+        self.alive[row] = False
+        if len(self._rows) * 2 < self._size:
+            self._compact()
+
+    def _compact(self):
+        keep = np.flatnonzero(self.alive[:self._size])
+        columns = [column[keep] for column in self._columns()]
+        self._allocate(len(keep))
+        for new, column in zip(self._columns(), columns):
+            new[:] = column
+        self._size = len(keep)
+        self._rows = {int(obj_id): row for row, obj_id in enumerate(self.ids)}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    # --- Filters ---
+    def mask(self, min_price: float | None = None, max_price: float | None = None,
+             seller_id: int | None = None, status: str | None = None,
+             created_after: float | None = None, created_before: float | None = None) -> "np.ndarray":
+        """符合所有给定条件的有效行的布尔掩码；条件为 None 表示不限"""
+        n = self._size
+        mask = self.alive[:n].copy()
+        if min_price is not None:
+            mask &= self.prices[:n] >= min_price
+        if max_price is not None:
+            mask &= self.prices[:n] <= max_price
+        if seller_id is not None:
+            mask &= self.seller_ids[:n] == seller_id
+        if status is not None:
+            code = self.status_codes.get(status)
+            if code is None:
+                return np.zeros(n, dtype=bool)
+            mask &= self.statuses[:n] == code
+        if created_after is not None:
+            mask &= self.created_at[:n] >= created_after
+        if created_before is not None:
+            mask &= self.created_at[:n] < created_before
+        return mask
+
+    def filter_ids(self, **filters: Any) -> List[int]:
+        """符合条件的商品 id，按 id 升序"""
+        return np.sort(self.ids[:self._size][self.mask(**filters)]).tolist()
+
+    # --- Aggregates ---
+    def price_percentiles(self, percentiles: Sequence[float] = (25, 50, 75), **filters: Any) -> Dict[float, float]:
+        prices = self.prices[:self._size][self.mask(**filters)]
+        if not len(prices):
+            return {}
+        return dict(zip(percentiles, np.percentile(prices, percentiles).tolist()))
+
+    def seller_counts(self, **filters: Any) -> Dict[int, int]:
+        sellers, counts = np.unique(self.seller_ids[:self._size][self.mask(**filters)], return_counts=True)
+        return dict(zip(sellers.tolist(), counts.tolist()))
+
+    def daily_volume(self, utc_offset: float = 0.0, **filters: Any) -> Dict[int, int]:
+        """每天发布的商品数：键为当天 0 点的时间戳（按 utc_offset 秒所在时区划分）"""
+        created = self.created_at[:self._size][self.mask(**filters)] + utc_offset
+        days, counts = np.unique((created // SECONDS_PER_DAY).astype(np.int64), return_counts=True)
+        return {int(day * SECONDS_PER_DAY - utc_offset): int(count) for day, count in zip(days, counts)}
+
+    def summary(self, **filters: Any) -> Dict[str, Any]:
+        """过滤后的商品数、均价与价格分位数"""
+        prices = self.prices[:self._size][self.mask(**filters)]
+        return {
+            'count': int(len(prices)),
+            'mean_price': float(prices.mean()) if len(prices) else None,
+            'price_percentiles': self.price_percentiles(**filters),
+        }
@@ -0,0 +1,117 @@
+"""
+内存映射的只读对象存储。
+
+文件布局（小端）：
+    头部        magic(4s) version(H) 保留(H) 记录数(Q) 来源指纹长度(I)
+    来源指纹    UTF-8 JSON，补齐到 8 字节边界
+    id 表       记录数 × int64，按 id 升序
+    偏移表      (记录数 + 1) × uint64，相对数据区起点
+    数据区      每条记录一段 UTF-8 JSON
+
+打开时只映射文件、不解析记录；按下标或 id 访问时才解码对应的那一条。
+多个进程映射同一个文件时共享操作系统的页缓存。
+id 表与偏移表直接以 memoryview 读取，因此只支持小端机器读取（写出始终为小端）。
+"""
+
+import bisect
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, Type
+
+MAGIC = b"TPMS"
+VERSION = 1
+_HEADER = struct.Struct("<4sHHQI")
+
+def _padding(size: int) -> int:
+    return -size % 8
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values.tobytes()
+
+class MappedStore:
+    def __init__(self, path: str, model_class: Type[Any]):
+        self.path = path
+        self.model_class = model_class
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, _, count, stamp_len = _HEADER.unpack_from(self._mmap, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Unsupported mapped store file: {path}")
+            pos = _HEADER.size
+            self.stamp = json.loads(self._mmap[pos:pos + stamp_len].decode('utf-8'))
+            pos += stamp_len + _padding(_HEADER.size + stamp_len)
+            view = memoryview(self._mmap)
+            self._ids = view[pos:pos + 8 * count].cast('q')
+            pos += 8 * count
+            self._offsets = view[pos:pos + 8 * (count + 1)].cast('Q')
+            self._data_start = pos + 8 * (count + 1)
+            view.release()
+        except Exception:
+            self._mmap.close()
+            raise
+        self._count = count
+
+    @staticmethod
+    def write(path: str, records: Iterable[Dict[str, Any]], stamp: Any):
+        """把字段字典按 id 排序写出存储文件；先写临时文件再原子替换，正在映射旧文件的读者不受影响"""
+        records = sorted((record['id'], json.dumps(record, ensure_ascii=False).encode('utf-8')) for record in records)
+        stamp_bytes = json.dumps(stamp).encode('utf-8')
+        offsets = [0]
+        for _, data in records:
+            offsets.append(offsets[-1] + len(data))
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, 0, len(records), len(stamp_bytes)))
+            f.write(stamp_bytes + bytes(_padding(_HEADER.size + len(stamp_bytes))))
+            f.write(_little_endian(array('q', (obj_id for obj_id, _ in records))))
+            f.write(_little_endian(array('Q', offsets)))
+            for _, data in records:
+                f.write(data)
+        os.replace(tmp_path, path)
+
+    def close(self):
+        self._ids.release()
+        self._offsets.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "MappedStore":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _decode(self, pos: int) -> Any:
+        start = self._data_start + self._offsets[pos]
+        end = self._data_start + self._offsets[pos + 1]
+        return self.model_class(**json.loads(self._mmap[start:end]))
+
+    def __getitem__(self, key: int | slice) -> Any:
+        """按 id 顺序的第 key 条记录；切片只解码切片范围内的记录"""
+        if isinstance(key, slice):
+            return [self._decode(pos) for pos in range(*key.indices(self._count))]
+        if key < 0:
+            key += self._count
+        if not 0 <= key < self._count:
+            raise IndexError(key)
+        return self._decode(key)
+
+    def get(self, obj_id: int) -> Any | None:
+        """按 id 二分查找并解码一条记录"""
+        pos = bisect.bisect_left(self._ids, obj_id)
+        if pos < self._count and self._ids[pos] == obj_id:
+            return self._decode(pos)
+        return None
+
+    def ids(self) -> List[int]:
+        return self._ids.tolist()
@@ -1,10 +1,36 @@
 """
 定义所有核心业务对象的数据模型。
+
+Compact* 变体与对应模型字段完全相同，但使用 __slots__ 且把状态/角色映射为共享的枚举常量，
+用于大规模数据集以减少内存占用（见 DataManager(compact_models=True)）。
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
+from enum import Enum
+import sys
 import time
-from typing import List
+from typing import Any, Iterable, List
+
+# str 混入的枚举可以直接与字符串比较、写入 JSON；__str__ / __format__ 返回取值本身，
+# 与普通字符串字段的显示一致（不依赖 Python 3.11 的 StrEnum）
+class UserRole(str, Enum):
+    USER = "USER"
+    ADMIN = "ADMIN"
+
+    __str__ = str.__str__
+    __format__ = str.__format__
+
+class ItemStatus(str, Enum):
+    AVAILABLE = "AVAILABLE"
+    SOLD = "SOLD"
+
+    __str__ = str.__str__
+    __format__ = str.__format__
+
+def _intern(enum_class: type, value: str) -> str:
+    """已知取值映射为枚举常量（全局唯一），未知取值退回到 sys.intern"""
+    member = enum_class._value2member_map_.get(value)
+    return member if member is not None else sys.intern(value)
 
 @dataclass
 class User:
@@ -36,4 +62,75 @@ class InterestInteraction:
     id: int
     item_id: int
     buyer_id: int
-    interaction_time: float = field(default_factory=time.time)
\ No newline at end of file
+    interaction_time: float = field(default_factory=time.time)
+    count: int = 1 # 同一买家对同一商品表达意向的次数，interaction_time 为最近一次
+
+@dataclass(slots=True)
+class CompactUser:
+    id: int
+    email: str
+    password_hash: str
+    nickname: str
+    contact_info: str
+    role: str = UserRole.USER
+    created_at: float = field(default_factory=time.time)
+
+    def __post_init__(self):
+        self.role = _intern(UserRole, self.role)
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role == UserRole.ADMIN
+
+@dataclass(slots=True)
+class CompactItem:
+    id: int
+    seller_id: int
+    title: str
+    description: str
+    price: float
+    status: str = ItemStatus.AVAILABLE
+    image_paths: List[str] = field(default_factory=list)
+    created_at: float = field(default_factory=time.time)
+
+    def __post_init__(self):
+        self.status = _intern(ItemStatus, self.status)
+        # 图片列表存为元组：绝大多数商品没有图片，所有空元组共享同一个对象
+        self.image_paths = tuple(self.image_paths)
+
+@dataclass(slots=True)
+class CompactInteraction:
+    id: int
+    item_id: int
+    buyer_id: int
+    interaction_time: float = field(default_factory=time.time)
+    count: int = 1
+
+# 普通模型 -> 紧凑变体
+COMPACT_VARIANTS = {User: CompactUser, Item: CompactItem, InterestInteraction: CompactInteraction}
+
+def estimate_memory(objects: Iterable[Any]) -> int:
+    """
+    估算一组模型对象占用的字节数：对象本身、实例 __dict__ 以及所有字段值。
+    同一个值对象（例如驻留的字符串、枚举常量）只计算一次，因此能反映驻留带来的节省。
+    """
+    seen = set()
+    total = 0
+
+    def add(value: Any):
+        nonlocal total
+        if id(value) in seen:
+            return
+        seen.add(id(value))
+        total += sys.getsizeof(value)
+        if isinstance(value, (list, tuple)):
+            for element in value:
+                add(element)
+
+    for obj in objects:
+        total += sys.getsizeof(obj)
+        if hasattr(obj, '__dict__'):
+            total += sys.getsizeof(obj.__dict__)
+        for f in fields(obj):
+            add(getattr(obj, f.name))
+    return total
@@ -0,0 +1,39 @@
+"""
+分页查询结果的通用容器，以及游标分页使用的不透明游标。
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from typing import Any, Generic, List, Tuple, TypeVar
+
+T = TypeVar('T')
+
+@dataclass
+class Page(Generic[T]):
+    items: List[T] = field(default_factory=list)
+    total: int | None = None # 符合条件的总数；调用方不需要时为 None
+    offset: int = 0
+    limit: int = 20
+    next_cursor: str | None = None # 游标分页时取下一页的游标；没有下一页时为 None
+    cursor_paged: bool = False # 游标分页的结果不使用 offset，是否还有下一页只看 next_cursor
+
+    @property
+    def has_more(self) -> bool:
+        if self.cursor_paged:
+            return self.next_cursor is not None
+        return self.total is not None and self.offset + len(self.items) < self.total
+
+def encode_cursor(key: Any, obj_id: int) -> str:
+    """把一页最后一条记录的 (排序键, id) 编码为游标；下一页从严格位于其后的记录开始"""
+    return base64.urlsafe_b64encode(json.dumps([key, obj_id]).encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor: str) -> Tuple[Any, int]:
+    try:
+        key, obj_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, TypeError, binascii.Error) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    if not isinstance(obj_id, int):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return key, obj_id
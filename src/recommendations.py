@@ -0,0 +1,92 @@
+"""
+基于共同意向的商品推荐："对这件商品感兴趣的买家也看了"。
+
+购买意向记录构成一个稀疏的 买家 × 商品 0/1 矩阵 A（同一买家对同一商品的多条记录只算一次），
+商品 i 与 j 的余弦相似度为 co(i, j) / sqrt(deg(i) · deg(j))，其中 co(i, j) 为同时对两者
+感兴趣的买家数，deg 为商品的买家数。矩阵按行（买家）与列（商品）两个方向的邻接表保存，
+新增/删除一条记录只更新两个邻接表和一个度数，不做整体重算；查询时只展开目标商品的买家
+所涉及的商品，再用 NumPy 计数、计算相似度并选出前 k 个。NumPy 是可选依赖。
+"""
+
+from itertools import chain
+from typing import Any, Dict, List, Set, Tuple
+from src.indexes import ModelIndex
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class CoInterestMatrix(ModelIndex):
+    """注册在 'interaction' 模型上的稀疏 买家 × 商品 矩阵"""
+
+    def __init__(self):
+        if np is None:
+            raise ImportError("CoInterestMatrix requires numpy: pip install numpy")
+        self.clear()
+
+    def clear(self):
+        self._columns: Dict[int, int] = {} # 商品 id -> 列号
+        self._item_ids: List[int] = [] # 列号 -> 商品 id
+        self._degrees = np.zeros(16, dtype=np.int64) # 每列的买家数
+        self._buyer_items: Dict[int, Dict[int, int]] = {} # 买家 -> {列号: 记录数}
+        self._item_buyers: Dict[int, Set[int]] = {} # 列号 -> 买家集合
+        self._entries: Dict[int, Tuple[int, int]] = {} # 记录 id -> (买家, 列号)
+
+    def _column(self, item_id: int) -> int:
+        col = self._columns.get(item_id)
+        if col is None:
+            col = self._columns[item_id] = len(self._item_ids)
+            self._item_ids.append(item_id)
+            if col == len(self._degrees):
+                self._degrees = np.concatenate([self._degrees, np.zeros(col, dtype=np.int64)])
+        return col
+
+    def add(self, obj: Any):
+        if obj.id in self._entries:
+            self.discard(obj.id)
+        col = self._column(obj.item_id)
+        self._entries[obj.id] = (obj.buyer_id, col)
+        items = self._buyer_items.setdefault(obj.buyer_id, {})
+        if col not in items:
+            items[col] = 0
+            self._item_buyers.setdefault(col, set()).add(obj.buyer_id)
+            self._degrees[col] += 1
+        items[col] += 1
+
+    def discard(self, obj_id: int):
+        entry = self._entries.pop(obj_id, None)
+        if entry is None:
+            return
+        buyer_id, col = entry
+        items = self._buyer_items[buyer_id]
+        items[col] -= 1
+        if items[col] == 0:
+            del items[col]
+            if not items:
+                del self._buyer_items[buyer_id]
+            self._item_buyers[col].discard(buyer_id)
+            self._degrees[col] -= 1
+
+    def similar(self, item_id: int, k: int = 10) -> List[Tuple[int, float]]:
+        """与商品余弦相似度最高的 k 个其他商品 (商品 id, 相似度)，按相似度降序、相同时按 id 升序"""
+        col = self._columns.get(item_id)
+        if col is None or not self._degrees[col] or k <= 0:
+            return []
+        buyers = self._item_buyers[col]
+        neighbours = np.fromiter(chain.from_iterable(self._buyer_items[b] for b in buyers), dtype=np.int64)
+        cols, co = np.unique(neighbours, return_counts=True)
+        keep = cols != col
+        cols, co = cols[keep], co[keep]
+        scores = co / np.sqrt(float(self._degrees[col]) * self._degrees[cols])
+        if len(cols) > k:
+            # 先用 argpartition 找到第 k 大的相似度，只对不低于它的候选排序；并列的候选都保留，按 id 取舍
+            threshold = -np.partition(-scores, k - 1)[k - 1]
+            top = scores >= threshold
+            cols, scores = cols[top], scores[top]
+        ids = np.array([self._item_ids[c] for c in cols], dtype=np.int64)
+        order = np.lexsort((ids, -scores))[:k]
+        return [(int(ids[i]), float(scores[i])) for i in order]
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,10 +1,19 @@
 # services/__init__.py
 from .admin_service import (AdminService)
+from .async_services import (AsyncAdminService, AsyncAuthService, AsyncItemService)
 from .auth_service import (AuthService)
 from .item_service import (ItemService)
+from .session_store import (SessionStore)
+from .session_backends import (SessionBackend, SqliteSessionBackend)
 
 __all__ = [
     "AdminService",
+    "AsyncAdminService",
+    "AsyncAuthService",
+    "AsyncItemService",
     "AuthService",
-    "ItemService"
+    "ItemService",
+    "SessionBackend",
+    "SessionStore",
+    "SqliteSessionBackend"
 ]
\ No newline at end of file
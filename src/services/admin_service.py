@@ -1,15 +1,33 @@
 """
 包含所有管理员专属的操作。
 """
-from typing import List
+import bisect
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Set
 from src.data_manager import DataManager
+from src.indexes import GroupIndex, SearchIndex, SortedIndex
+from src.item_columns import ItemColumns
 from src.models import User, Item
+from src.pagination import Page, encode_cursor, decode_cursor
 from src.services.auth_service import AuthService
 
+# 管理员列表可用的排序字段
+USER_SORT_FIELDS = ('id', 'created_at', 'role')
+ITEM_SORT_FIELDS = ('id', 'created_at', 'price')
+
 class AdminService:
     def __init__(self, data_manager: DataManager, auth_service: AuthService):
         self.data_manager = data_manager
         self.auth_service = auth_service
+        # 级联删除使用的外键索引：卖家 -> 商品、买家 -> 互动记录、商品 -> 互动记录
+        self.data_manager.register_index('item', 'seller', lambda: GroupIndex('seller_id'))
+        self.data_manager.register_index('interaction', 'buyer', lambda: GroupIndex('buyer_id'))
+        self.data_manager.register_index('interaction', 'item', lambda: GroupIndex('item_id'))
+        # 列表分页使用的有序索引；与 ItemService 同名的索引定义相同，只注册一次
+        for model_type, sort_fields in (('user', USER_SORT_FIELDS), ('item', ITEM_SORT_FIELDS)):
+            for name in sort_fields:
+                self.data_manager.register_index(model_type, name, lambda name=name: SortedIndex(name))
+        self.data_manager.register_index('item', 'search', SearchIndex)
     
     def _verify_admin(self, session_id: str):
         """辅助方法，用于验证当前用户是否为管理员"""
@@ -26,28 +44,148 @@ class AdminService:
         self._verify_admin(session_id)
         return self.data_manager.get_all('item')
 
+    def list_users(self, session_id: str, sort_by: str = 'id', descending: bool = False, text: str = "",
+                   cursor: str | None = None, limit: int = 50, include_total: bool = False) -> Page[User]:
+        """
+        按 id / 注册时间 / 角色排序的用户列表，游标分页。
+        text 按昵称、邮箱、联系方式做不区分大小写的子串过滤，沿有序索引边走边过滤，凑够一页即停止。
+        include_total 在不过滤时直接取缓存中的记录数；带过滤条件时需要统计全部匹配项。
+        """
+        self._verify_admin(session_id)
+        if sort_by not in USER_SORT_FIELDS:
+            raise ValueError(f"Unsupported sort field: {sort_by}")
+        needle = text.strip().lower()
+
+        def contains_needle(user: User) -> bool:
+            return any(needle in value.lower() for value in (user.nickname, user.email, user.contact_info))
+        return self._list_page('user', sort_by, descending, cursor, limit, include_total,
+                               matches=contains_needle if needle else None)
+
+    def list_items(self, session_id: str, sort_by: str = 'id', descending: bool = False, text: str = "",
+                   cursor: str | None = None, limit: int = 50, include_total: bool = False) -> Page[Item]:
+        """
+        按 id / 发布时间 / 价格排序的商品列表，游标分页。
+        text 通过搜索索引过滤标题与描述，候选集合只按排序键排序，不遍历全部商品。
+        """
+        self._verify_admin(session_id)
+        if sort_by not in ITEM_SORT_FIELDS:
+            raise ValueError(f"Unsupported sort field: {sort_by}")
+        candidates = None
+        if text.strip():
+            candidates = set(self.data_manager.get_index('item', 'search').search(text.strip()))
+        return self._list_page('item', sort_by, descending, cursor, limit, include_total, candidates=candidates)
+
+    def _list_page(self, model_type: str, sort_by: str, descending: bool, cursor: str | None, limit: int,
+                   include_total: bool, candidates: Set[int] | None = None,
+                   matches: Callable[[Any], bool] | None = None) -> Page:
+        if limit <= 0:
+            raise ValueError("Limit must be positive.")
+        after = decode_cursor(cursor) if cursor else None
+        index = self.data_manager.get_index(model_type, sort_by)
+
+        # 游标中的排序键与该字段类型不符时，定位（bisect / iter_after）或遍历中的比较会抛出 TypeError
+        try:
+            ordered: Iterator[int]
+            if candidates is not None:
+                entries = sorted((index.key_of(obj_id), obj_id) for obj_id in candidates)
+                if descending:
+                    start = len(entries) if after is None else bisect.bisect_left(entries, tuple(after))
+                    ordered = (obj_id for _, obj_id in reversed(entries[:start]))
+                else:
+                    start = 0 if after is None else bisect.bisect_right(entries, tuple(after))
+                    ordered = (obj_id for _, obj_id in entries[start:])
+            elif after is not None:
+                ordered = index.iter_after(*after, descending=descending)
+            else:
+                ordered = index.iter_range(descending=descending)
+
+            objects = (obj for obj in (self.data_manager.get_by_id(model_type, i) for i in ordered) if obj is not None)
+            if matches is not None:
+                objects = filter(matches, objects)
+            # 多取一条，用于判断是否还有下一页
+            rows = list(islice(objects, limit + 1))
+        except TypeError as e:
+            raise ValueError(f"Invalid cursor: {cursor!r}") from e
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(index.key_of(rows[-1].id), rows[-1].id)
+
+        total = None
+        if include_total:
+            if candidates is not None:
+                total = len(candidates)
+            elif matches is not None:
+                total = sum(1 for obj in self.data_manager.iter_all(model_type) if matches(obj))
+            else:
+                total = self.data_manager.count(model_type)
+        return Page(items=rows, total=total, limit=limit, next_cursor=next_cursor, cursor_paged=True)
+
     def delete_user(self, session_id: str, user_id_to_delete: int) -> bool:
         admin_user = self._verify_admin(session_id)
         if admin_user.id == user_id_to_delete:
             raise ValueError("Admin cannot delete themselves.")
 
-        users = self.data_manager.get_all('user')
-        original_count = len(users)
-        users = [u for u in users if u.id != user_id_to_delete]
-        
-        if len(users) < original_count:
-            self.data_manager.save_all('user', users)
-            return True
-        return False # User not found
+        # 按主键删除，邮箱索引随之同步；用户不存在时返回 False
+        return self.data_manager.delete('user', user_id_to_delete)
 
     def delete_item(self, session_id: str, item_id_to_delete: int) -> bool:
         self._verify_admin(session_id)
         
-        items = self.data_manager.get_all('item')
-        original_count = len(items)
-        items = [i for i in items if i.id != item_id_to_delete]
-
-        if len(items) < original_count:
-            self.data_manager.save_all('item', items)
-            return True
-        return False # Item not found
\ No newline at end of file
+        # 按主键删除，搜索等派生索引随之增量更新；商品不存在时返回 False
+        return self.data_manager.delete('item', item_id_to_delete)
+
+    def delete_users(self, session_id: str, user_ids: Iterable[int], cascade: bool = False) -> Dict[str, int]:
+        """
+        批量删除用户，每个模型只写一次；返回各模型删除的记录数。
+        cascade=True 时一并删除这些用户发布的商品、他们的互动记录以及别人对这些商品的互动记录，
+        依赖的记录通过外键索引定位，不扫描整张表。
+        """
+        admin_user = self._verify_admin(session_id)
+        user_ids = set(user_ids)
+        if admin_user.id in user_ids:
+            raise ValueError("Admin cannot delete themselves.")
+
+        with self.data_manager.transaction():
+            deleted = {'user': self.data_manager.delete_many('user', user_ids)}
+            if cascade:
+                sellers = self.data_manager.get_index('item', 'seller')
+                item_ids = set().union(*(sellers.ids(u) for u in user_ids))
+                buyers = self.data_manager.get_index('interaction', 'buyer')
+                interaction_ids = set().union(*(buyers.ids(u) for u in user_ids))
+                deleted.update(self._delete_items_cascade(item_ids, interaction_ids))
+        return deleted
+
+    def delete_items(self, session_id: str, item_ids: Iterable[int], cascade: bool = False) -> Dict[str, int]:
+        """批量删除商品，每个模型只写一次；cascade=True 时一并删除对这些商品的互动记录"""
+        self._verify_admin(session_id)
+        item_ids = set(item_ids)
+        with self.data_manager.transaction():
+            if cascade:
+                return self._delete_items_cascade(item_ids, set())
+            return {'item': self.data_manager.delete_many('item', item_ids)}
+
+    def _delete_items_cascade(self, item_ids: set, interaction_ids: set) -> Dict[str, int]:
+        by_item = self.data_manager.get_index('interaction', 'item')
+        interaction_ids = interaction_ids.union(*(by_item.ids(i) for i in item_ids))
+        return {
+            'item': self.data_manager.delete_many('item', item_ids),
+            'interaction': self.data_manager.delete_many('interaction', interaction_ids),
+        }
+
+    def get_item_statistics(self, session_id: str, min_price: float | None = None, max_price: float | None = None,
+                            seller_id: int | None = None, status: str | None = None,
+                            created_after: float | None = None) -> Dict[str, Any]:
+        """
+        商品统计：数量、均价、价格分位数、每个卖家的商品数与每日发布量。
+        基于按需注册的列式视图 (需要 numpy)，之后随商品变更增量维护。
+        """
+        self._verify_admin(session_id)
+        self.data_manager.register_index('item', 'columns', ItemColumns)
+        columns = self.data_manager.get_index('item', 'columns')
+        filters = dict(min_price=min_price, max_price=max_price, seller_id=seller_id,
+                       status=status, created_after=created_after)
+        stats = columns.summary(**filters)
+        stats['seller_counts'] = columns.seller_counts(**filters)
+        stats['daily_volume'] = columns.daily_volume(**filters)
+        return stats
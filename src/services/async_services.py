@@ -0,0 +1,106 @@
+"""
+AuthService / ItemService / AdminService 的 asyncio 版本。
+
+业务逻辑仍由同步服务实现，这里只把每次调用放到 AsyncDataManager 的线程池中执行，
+会修改数据的操作先取得对应模型的写锁。一个事件循环即可同时服务大量会话。
+"""
+from typing import Any, Dict, Iterable, List, Tuple
+from src.async_data_manager import AsyncDataManager
+from src.models import User, Item
+from src.pagination import Page
+from src.services.auth_service import AuthService
+from src.services.item_service import ItemService
+from src.services.admin_service import AdminService
+from src.services.session_store import SessionStore
+
+class AsyncAuthService:
+    def __init__(self, data_manager: AsyncDataManager, session_store: SessionStore | None = None):
+        self.data_manager = data_manager
+        self.sync = AuthService(data_manager.sync, session_store)
+
+    async def register(self, email: str, password: str, nickname: str, contact_info: str) -> User:
+        return await self.data_manager.write(['user'], self.sync.register, email, password, nickname, contact_info)
+
+    async def login(self, email: str, password: str) -> Tuple[str, User]:
+        return await self.data_manager.run(self.sync.login, email, password)
+
+    async def logout(self, session_id: str):
+        await self.data_manager.run(self.sync.logout, session_id)
+
+    async def get_user_from_session(self, session_id: str) -> User | None:
+        return await self.data_manager.run(self.sync.get_user_from_session, session_id)
+
+class AsyncItemService:
+    def __init__(self, data_manager: AsyncDataManager, auth_service: AsyncAuthService):
+        self.data_manager = data_manager
+        self.sync = ItemService(data_manager.sync, auth_service.sync)
+
+    async def publish_item(self, session_id: str, title: str, description: str, price: float, image_paths: List[str]) -> Item:
+        return await self.data_manager.write(['item'], self.sync.publish_item, session_id, title, description, price, image_paths)
+
+    async def get_all_items(self) -> List[Item]:
+        return await self.data_manager.run(self.sync.get_all_items)
+
+    async def browse_items(self, offset: int = 0, limit: int = 20) -> Page[Item]:
+        return await self.data_manager.run(self.sync.browse_items, offset, limit)
+
+    async def search_items(self, keyword: str) -> List[Item]:
+        return await self.data_manager.run(self.sync.search_items, keyword)
+
+    async def search_page(self, keyword: str, offset: int = 0, limit: int = 20) -> Page[Item]:
+        return await self.data_manager.run(self.sync.search_page, keyword, offset, limit)
+
+    async def query_items(self, **filters: Any) -> Page[Item]:
+        return await self.data_manager.run(self.sync.query_items, **filters)
+
+    async def express_interest(self, session_id: str, item_id: int) -> str:
+        return await self.data_manager.write(['interaction'], self.sync.express_interest, session_id, item_id)
+
+    async def get_interest_stats(self, item_id: int) -> Dict[str, float]:
+        return await self.data_manager.run(self.sync.get_interest_stats, item_id)
+
+    async def get_seller_interest(self, seller_id: int) -> int:
+        return await self.data_manager.run(self.sync.get_seller_interest, seller_id)
+
+    async def trending_items(self, limit: int = 10, by: str = 'score') -> List[Item]:
+        return await self.data_manager.run(self.sync.trending_items, limit, by)
+
+    async def recommend_items(self, item_id: int, limit: int = 5) -> List[Item]:
+        return await self.data_manager.run(self.sync.recommend_items, item_id, limit)
+
+    async def compact_interactions(self) -> int:
+        return await self.data_manager.write(['interaction'], self.sync.compact_interactions)
+
+class AsyncAdminService:
+    def __init__(self, data_manager: AsyncDataManager, auth_service: AsyncAuthService):
+        self.data_manager = data_manager
+        self.sync = AdminService(data_manager.sync, auth_service.sync)
+
+    async def get_all_users(self, session_id: str) -> List[User]:
+        return await self.data_manager.run(self.sync.get_all_users, session_id)
+
+    async def get_all_items(self, session_id: str) -> List[Item]:
+        return await self.data_manager.run(self.sync.get_all_items, session_id)
+
+    async def list_users(self, session_id: str, **options: Any) -> Page[User]:
+        return await self.data_manager.run(self.sync.list_users, session_id, **options)
+
+    async def list_items(self, session_id: str, **options: Any) -> Page[Item]:
+        return await self.data_manager.run(self.sync.list_items, session_id, **options)
+
+    async def delete_user(self, session_id: str, user_id_to_delete: int) -> bool:
+        return await self.data_manager.write(['user'], self.sync.delete_user, session_id, user_id_to_delete)
+
+    async def delete_item(self, session_id: str, item_id_to_delete: int) -> bool:
+        return await self.data_manager.write(['item'], self.sync.delete_item, session_id, item_id_to_delete)
+
+    async def delete_users(self, session_id: str, user_ids: Iterable[int], cascade: bool = False) -> Dict[str, int]:
+        return await self.data_manager.write(['user', 'item', 'interaction'], self.sync.delete_users,
+                                             session_id, list(user_ids), cascade)
+
+    async def delete_items(self, session_id: str, item_ids: Iterable[int], cascade: bool = False) -> Dict[str, int]:
+        return await self.data_manager.write(['item', 'interaction'], self.sync.delete_items,
+                                             session_id, list(item_ids), cascade)
+
+    async def get_item_statistics(self, session_id: str, **filters: Any) -> Dict[str, Any]:
+        return await self.data_manager.run(self.sync.get_item_statistics, session_id, **filters)
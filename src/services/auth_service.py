@@ -1,21 +1,23 @@
 """
 负责用户认证、注册和会话管理。
 """
-import uuid
-from typing import Dict, Tuple
+from typing import Tuple
 from src.data_manager import DataManager
+from src.indexes import normalize_email
 from src.models import User
+from src.services.session_store import SessionStore
 
-# 简单的内存会话存储。在真实应用中，这可能会用 Redis 等替代。
-_SESSIONS: Dict[str, int] = {} # session_id -> user_id
+# 默认的进程内会话存储，所有未显式指定存储的 AuthService 共享。在真实应用中，这可能会用 Redis 等替代。
+_SESSIONS = SessionStore()
 
 class AuthService:
-    def __init__(self, data_manager: DataManager):
+    def __init__(self, data_manager: DataManager, session_store: SessionStore | None = None):
         self.data_manager = data_manager
+        self.sessions = session_store if session_store is not None else _SESSIONS
 
     def register(self, email: str, password: str, nickname: str, contact_info: str) -> User:
-        users = self.data_manager.get_all('user')
-        if any(u.email == email for u in users):
+        # 邮箱唯一性通过 DataManager 的规范化邮箱索引检查，不再逐个比较
+        if self.data_manager.get_user_by_email(email) is not None:
             raise ValueError(f"Email '{email}' is already registered.")
 
         # 在真实项目中，这里必须进行哈希处理！
@@ -23,40 +25,45 @@ class AuthService:
         # password_hash = generate_password_hash(password)
         password_hash = f"hashed_{password}" # 简单模拟
 
-        new_id = self.data_manager.get_new_id(users)
+        new_id = self.data_manager.next_id('user')
         new_user = User(
             id=new_id,
-            email=email,
+            email=normalize_email(email),
             password_hash=password_hash,
             nickname=nickname,
             contact_info=contact_info
         )
-        users.append(new_user)
-        self.data_manager.save_all('user', users)
+        self.data_manager.insert('user', new_user)
         return new_user
 
     def login(self, email: str, password: str) -> Tuple[str, User]:
-        users = self.data_manager.get_all('user')
-        user = next((u for u in users if u.email == email), None)
+        user = self.data_manager.get_user_by_email(email)
 
         # 在真实项目中，这里要比对哈希值
         # from werkzeug.security import check_password_hash
         # if user and check_password_hash(user.password_hash, password):
         if user and user.password_hash == f"hashed_{password}":
-            session_id = str(uuid.uuid4())
-            _SESSIONS[session_id] = user.id
+            session_id = self.sessions.create(user.id, user, self.data_manager.revision('user'))
             return session_id, user
         
         raise ValueError("Invalid email or password.")
 
     def logout(self, session_id: str):
-        if session_id in _SESSIONS:
-            del _SESSIONS[session_id]
+        self.sessions.remove(session_id)
     
     def get_user_from_session(self, session_id: str) -> User | None:
-        user_id = _SESSIONS.get(session_id)
-        if not user_id:
+        session = self.sessions.get(session_id)
+        if not session:
             return None
-        
-        users = self.data_manager.get_all('user')
-        return next((u for u in users if u.id == user_id), None)
+
+        # 用户数据没有变化时直接使用会话中缓存的 User
+        revision = self.data_manager.revision('user')
+        user = session.cached_user(revision)
+        if user is None:
+            user = self.data_manager.get_by_id('user', session.user_id)
+            if user is None:
+                # 用户已被删除，会话随之作废
+                self.sessions.remove(session_id)
+                return None
+            session.cache_user(user, revision)
+        return user
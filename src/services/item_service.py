@@ -1,23 +1,38 @@
 """
 负责商品相关的业务逻辑，如发布、搜索和用户交互。
 """
-from typing import List
+import time
+from itertools import islice
+from typing import Dict, List
 from src.data_manager import DataManager
 from src.models import Item, InterestInteraction
+from src.indexes import SearchIndex, SortedIndex, BitmapIndex, GroupIndex, InterestIndex
+from src.pagination import Page
+from src.recommendations import CoInterestMatrix
 from src.services.auth_service import AuthService
 
 class ItemService:
     def __init__(self, data_manager: DataManager, auth_service: AuthService):
         self.data_manager = data_manager
         self.auth_service = auth_service
+        # 标题/描述倒排索引由 DataManager 在发布、删除商品时增量维护
+        self.data_manager.register_index('item', 'search', SearchIndex)
+        # 分面查询使用的二级索引：价格/发布时间有序索引、状态位图、卖家 -> 商品
+        self.data_manager.register_index('item', 'price', lambda: SortedIndex('price'))
+        self.data_manager.register_index('item', 'created_at', lambda: SortedIndex('created_at'))
+        self.data_manager.register_index('item', 'status', lambda: BitmapIndex('status'))
+        self.data_manager.register_index('item', 'seller', lambda: GroupIndex('seller_id'))
+        # 每个商品/卖家的意向计数与衰减热度，随互动记录的写入增量更新
+        self.data_manager.register_index('interaction', 'interest', lambda: InterestIndex(self._seller_of))
+        # (买家, 商品) -> 互动记录 id：重复表达意向时更新已有记录而不是追加
+        self.data_manager.register_index('interaction', 'pair', lambda: GroupIndex('buyer_id', 'item_id'))
 
     def publish_item(self, session_id: str, title: str, description: str, price: float, image_paths: List[str]) -> Item:
         seller = self.auth_service.get_user_from_session(session_id)
         if not seller:
             raise PermissionError("Invalid session. Please log in.")
 
-        items = self.data_manager.get_all('item')
-        new_id = self.data_manager.get_new_id(items)
+        new_id = self.data_manager.next_id('item')
         new_item = Item(
             id=new_id,
             seller_id=seller.id,
@@ -26,47 +41,194 @@ class ItemService:
             price=price,
             image_paths=image_paths
         )
-        items.append(new_item)
-        self.data_manager.save_all('item', items)
+        self.data_manager.insert('item', new_item)
         return new_item
 
     def get_all_items(self) -> List[Item]:
         return self.data_manager.get_all('item')
 
+    def browse_items(self, offset: int = 0, limit: int = 20) -> Page[Item]:
+        """
+        按 id 顺序分页浏览全部商品。冷启动时读取内存映射的商品存储，只解码当前页的记录，
+        无需解析整个商品文件；商品已加载到缓存后直接从缓存取。
+        """
+        if offset < 0 or limit <= 0:
+            raise ValueError("Offset must be non-negative and limit must be positive.")
+
+        items, total = self.data_manager.read_page('item', offset, limit)
+        return Page(items=items, total=total, offset=offset, limit=limit)
+
     def search_items(self, keyword: str) -> List[Item]:
         keyword = keyword.lower().strip()
-        all_items = self.get_all_items()
         if not keyword:
-            return all_items
-        
-        return [
-            item for item in all_items
-            if keyword in item.title.lower() or keyword in item.description.lower()
-        ]
+            return self.get_all_items()
+
+        index = self.data_manager.get_index('item', 'search')
+        items = (self.data_manager.get_by_id('item', item_id) for item_id in index.search(keyword))
+        return [item for item in items if item is not None]
+
+    def search_page(self, keyword: str, offset: int = 0, limit: int = 20) -> Page[Item]:
+        """按相关度排序的分页搜索，只取出 offset + limit 条而不是全部命中结果"""
+        if offset < 0 or limit <= 0:
+            raise ValueError("Offset must be non-negative and limit must be positive.")
+
+        index = self.data_manager.get_index('item', 'search')
+        item_ids, total = index.rank(keyword, offset + limit)
+        items = (self.data_manager.get_by_id('item', item_id) for item_id in item_ids[offset:])
+        return Page(items=[item for item in items if item is not None], total=total, offset=offset, limit=limit)
+
+    def query_items(self, min_price: float | None = None, max_price: float | None = None,
+                    status: str | None = None, seller_id: int | None = None,
+                    sort_by: str = 'created_at', descending: bool = True,
+                    offset: int = 0, limit: int = 20, include_total: bool = False) -> Page[Item]:
+        """
+        按价格区间、状态、卖家筛选商品，并按价格或发布时间排序分页。
+        通过二级索引定位候选，而不是扫描全部商品：
+        - 指定卖家时从卖家的商品集合出发；
+        - 否则沿价格或发布时间有序索引按序遍历，凑够一页即停止。
+        include_total=True 时额外统计符合条件的总数，可能需要遍历整个候选区间。
+        """
+        if sort_by not in ('price', 'created_at'):
+            raise ValueError(f"Unsupported sort field: {sort_by}")
+        if offset < 0 or limit <= 0:
+            raise ValueError("Offset must be non-negative and limit must be positive.")
+
+        price_index = self.data_manager.get_index('item', 'price')
+        sort_index = self.data_manager.get_index('item', sort_by)
+        status_index = self.data_manager.get_index('item', 'status')
+
+        def in_price_range(item_id: int) -> bool:
+            price = price_index.key_of(item_id)
+            return (min_price is None or price >= min_price) and (max_price is None or price <= max_price)
+
+        def accepted(item_id: int) -> bool:
+            return status is None or status_index.contains(status, item_id)
+
+        has_price_filter = min_price is not None or max_price is not None
+        if seller_id is not None:
+            candidates = [
+                item_id for item_id in self.data_manager.get_index('item', 'seller').ids(seller_id)
+                if in_price_range(item_id) and accepted(item_id)
+            ]
+            candidates.sort(key=lambda item_id: (sort_index.key_of(item_id), item_id), reverse=descending)
+            ordered, total = iter(candidates), len(candidates)
+        elif sort_by == 'price' or not has_price_filter:
+            # 排序字段的有序索引本身就给出了结果顺序，可以边遍历边分页
+            bounds = (min_price, max_price) if sort_by == 'price' else (None, None)
+            ordered = (
+                item_id for item_id in sort_index.iter_range(*bounds, descending=descending)
+                if accepted(item_id)
+            )
+            total = None
+            if include_total:
+                if status is None:
+                    total = sort_index.count(*bounds)
+                elif not has_price_filter:
+                    total = status_index.count(status)
+        else:
+            # 按发布时间排序但限定价格区间：先从价格索引取出区间，再对区间内结果排序
+            candidates = [item_id for item_id in price_index.iter_range(min_price, max_price) if accepted(item_id)]
+            candidates.sort(key=lambda item_id: (sort_index.key_of(item_id), item_id), reverse=descending)
+            ordered, total = iter(candidates), len(candidates)
+
+        head = list(islice(ordered, offset + limit))
+        page_ids = head[offset:]
+        if include_total and total is None:
+            total = len(head) + sum(1 for _ in ordered)
+        items = (self.data_manager.get_by_id('item', item_id) for item_id in page_ids)
+        return Page(items=[item for item in items if item is not None],
+                    total=total if include_total else None, offset=offset, limit=limit)
+
+    def _seller_of(self, item_id: int) -> int | None:
+        item = self.data_manager.get_by_id('item', item_id)
+        return item.seller_id if item else None
+
+    def get_interest_stats(self, item_id: int) -> Dict[str, float]:
+        """商品收到的意向总数（重复表达按次数计）与当前的衰减热度"""
+        interest = self.data_manager.get_index('interaction', 'interest')
+        return {'count': interest.count(item_id), 'score': interest.score(item_id)}
+
+    def get_seller_interest(self, seller_id: int) -> int:
+        """卖家所有商品收到的意向总数"""
+        return self.data_manager.get_index('interaction', 'interest').seller_count(seller_id)
+
+    def trending_items(self, limit: int = 10, by: str = 'score') -> List[Item]:
+        """热度最高（by='count' 时为意向总数最多）的商品；已删除的商品跳过"""
+        if by not in ('score', 'count'):
+            raise ValueError(f"Unknown trending order: {by}")
+        interest = self.data_manager.get_index('interaction', 'interest')
+        k = limit
+        while True:
+            item_ids = interest.trending(k, by)
+            items = [item for item in (self.data_manager.get_by_id('item', i) for i in item_ids) if item]
+            # 候选不足说明已取完全部商品；否则被删除的商品占了名额，扩大候选范围重取
+            if len(items) >= limit or len(item_ids) < k:
+                return items[:limit]
+            k *= 2
+
+    def recommend_items(self, item_id: int, limit: int = 5) -> List[Item]:
+        """
+        对该商品感兴趣的买家也感兴趣的其他商品，按共同意向的余弦相似度排序。
+        买家 × 商品矩阵按需注册 (需要 numpy)，之后随互动记录增量维护；已删除的商品跳过。
+        """
+        self.data_manager.register_index('interaction', 'co_interest', CoInterestMatrix)
+        matrix = self.data_manager.get_index('interaction', 'co_interest')
+        k = limit
+        while True:
+            similar = matrix.similar(item_id, k)
+            items = [item for item in (self.data_manager.get_by_id('item', i) for i, _ in similar) if item]
+            if len(items) >= limit or len(similar) < k:
+                return items[:limit]
+            k *= 2
+
+    def compact_interactions(self) -> int:
+        """
+        合并同一 (买家, 商品) 的重复互动记录：保留 id 最小的一条，累加次数并取最近的时间。
+        用于整理去重之前积累的数据，一次写入；返回删除的记录数。
+        """
+        with self.data_manager.transaction():
+            duplicates = list(self.data_manager.get_index('interaction', 'pair').duplicates())
+            if not duplicates:
+                return 0
+            interactions = self.data_manager.get_all('interaction')
+            by_id = {i.id: i for i in interactions}
+            removed = set()
+            for _, ids in duplicates:
+                keep, *rest = sorted(ids)
+                merged = [by_id[i] for i in rest]
+                by_id[keep].count += sum(i.count for i in merged)
+                by_id[keep].interaction_time = max([by_id[keep].interaction_time] + [i.interaction_time for i in merged])
+                removed.update(rest)
+            self.data_manager.save_all('interaction', [i for i in interactions if i.id not in removed])
+        return len(removed)
 
     def express_interest(self, session_id: str, item_id: int) -> str:
         buyer = self.auth_service.get_user_from_session(session_id)
         if not buyer:
             raise PermissionError("Invalid session. Please log in.")
 
-        items = self.data_manager.get_all('item')
-        item = next((i for i in items if i.id == item_id), None)
-        if not item:
-            raise ValueError("Item not found.")
+        # 读取商品、卖家与写入互动记录在同一事务中完成，任一步失败都不会留下互动记录
+        with self.data_manager.transaction():
+            item = self.data_manager.get_by_id('item', item_id)
+            if not item:
+                raise ValueError("Item not found.")
 
-        if item.seller_id == buyer.id:
-            raise ValueError("You cannot express interest in your own item.")
+            if item.seller_id == buyer.id:
+                raise ValueError("You cannot express interest in your own item.")
 
-        interactions = self.data_manager.get_all('interaction')
-        new_id = self.data_manager.get_new_id(interactions)
-        interaction = InterestInteraction(id=new_id, item_id=item_id, buyer_id=buyer.id)
-        interactions.append(interaction)
-        self.data_manager.save_all('interaction', interactions)
+            seller = self.data_manager.get_by_id('user', item.seller_id)
+            if not seller:
+                # This case should ideally not happen if data is consistent
+                raise ValueError("Seller not found for this item.")
+
+            existing = self.data_manager.get_index('interaction', 'pair').ids((buyer.id, item_id))
+            if existing:
+                interaction = self.data_manager.get_by_id('interaction', min(existing))
+                interaction.count += 1
+                interaction.interaction_time = time.time()
+                self.data_manager.update('interaction', interaction)
+            else:
+                new_id = self.data_manager.next_id('interaction')
+                self.data_manager.insert('interaction', InterestInteraction(id=new_id, item_id=item_id, buyer_id=buyer.id))
 
-        users = self.data_manager.get_all('user')
-        seller = next((u for u in users if u.id == item.seller_id), None)
-        if not seller:
-            # This case should ideally not happen if data is consistent
-            raise ValueError("Seller not found for this item.")
-            
         return seller.contact_info
@@ -0,0 +1,102 @@
+"""
+可在多个进程之间共享的会话后端。
+
+SessionStore 默认只在进程内存中保存会话；传入一个共享后端后，
+同一台机器上的多个后端进程就可以校验彼此签发的 session_id。
+"""
+import os
+import sqlite3
+import threading
+from typing import Tuple
+
+# (user_id, created_at, last_seen)
+SessionRow = Tuple[int, float, float]
+
+class SessionBackend:
+    """会话后端接口"""
+
+    def load(self, session_id: str) -> SessionRow | None:
+        raise NotImplementedError
+
+    def save(self, session_id: str, row: SessionRow):
+        raise NotImplementedError
+
+    def touch(self, session_id: str, last_seen: float):
+        raise NotImplementedError
+
+    def delete(self, session_id: str):
+        raise NotImplementedError
+
+    def delete_expired(self, idle_before: float, created_before: float) -> int:
+        """删除 last_seen < idle_before 或 created_at < created_before 的会话，返回删除数量"""
+        raise NotImplementedError
+
+    def trim(self, max_sessions: int) -> int:
+        """只保留最近访问的 max_sessions 个会话，返回删除数量"""
+        raise NotImplementedError
+
+class SqliteSessionBackend(SessionBackend):
+    """基于 sqlite3 文件的会话后端，多个进程指向同一个文件即可共享会话"""
+
+    def __init__(self, db_file: str = os.path.join("data", "sessions.db"), timeout: float = 5.0):
+        self.db_file = db_file
+        self.timeout = timeout
+        folder = os.path.dirname(db_file)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        # sqlite 连接不能跨线程共享，每个线程各自持有一个
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "session_id TEXT PRIMARY KEY, user_id INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, last_seen REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_last_seen ON sessions (last_seen)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_file, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def load(self, session_id: str) -> SessionRow | None:
+        row = self._connect().execute(
+            "SELECT user_id, created_at, last_seen FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return tuple(row) if row else None
+
+    def save(self, session_id: str, row: SessionRow):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, user_id, created_at, last_seen) VALUES (?, ?, ?, ?)",
+                (session_id, *row),
+            )
+
+    def touch(self, session_id: str, last_seen: float):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE sessions SET last_seen = MAX(last_seen, ?) WHERE session_id = ?", (last_seen, session_id)
+            )
+
+    def delete(self, session_id: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def delete_expired(self, idle_before: float, created_before: float) -> int:
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "DELETE FROM sessions WHERE last_seen < ? OR created_at < ?", (idle_before, created_before)
+            )
+        return cursor.rowcount
+
+    def trim(self, max_sessions: int) -> int:
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "DELETE FROM sessions WHERE session_id IN "
+                "(SELECT session_id FROM sessions ORDER BY last_seen DESC LIMIT -1 OFFSET ?)",
+                (max_sessions,),
+            )
+        return cursor.rowcount
@@ -0,0 +1,157 @@
+"""
+带过期策略的会话存储。
+
+- 空闲超时 (idle_ttl)：超过该时长没有访问的会话失效；
+- 绝对超时 (absolute_ttl)：无论是否活跃，登录超过该时长后失效；
+- 容量上限 (max_sessions)：超过上限时淘汰最久未访问的会话 (LRU)；
+- 过期清理：访问时惰性检查，另外每隔 sweep_interval 秒顺带整体清理一次。
+
+每个会话还缓存了对应的 User 对象以及缓存时的用户数据版本号，
+版本号变化（用户被修改或删除）时缓存失效，需要重新读取。
+
+传入共享后端 (backend) 后，后端是会话的唯一事实来源，进程内的字典退化为
+读穿透缓存：本地副本在 cache_ttl 秒内直接使用，过期后再回后端核对；
+访问时间每隔 touch_interval 秒才回写一次，避免每次校验都写共享存储。
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable
+from src.services.session_backends import SessionBackend
+
+class Session:
+    __slots__ = ('session_id', 'user_id', 'created_at', 'last_seen', 'user', 'user_revision',
+                 'verified_at', 'persisted_seen')
+
+    def __init__(self, session_id: str, user_id: int, created_at: float, last_seen: float | None = None):
+        self.session_id = session_id
+        self.user_id = user_id
+        self.created_at = created_at
+        self.last_seen = created_at if last_seen is None else last_seen
+        self.user: Any = None
+        self.user_revision: Any = None
+        self.verified_at = self.last_seen # 最近一次与共享后端核对的时间
+        self.persisted_seen = self.last_seen # 最近一次写回后端的访问时间
+
+    def cached_user(self, revision: Any) -> Any:
+        """缓存的用户对象；用户数据版本已变化时返回 None"""
+        if self.user is not None and self.user_revision == revision:
+            return self.user
+        return None
+
+    def cache_user(self, user: Any, revision: Any):
+        self.user = user
+        self.user_revision = revision
+
+class SessionStore:
+    def __init__(self, idle_ttl: float = 30 * 60, absolute_ttl: float = 12 * 3600,
+                 max_sessions: int = 10000, sweep_interval: float = 60,
+                 clock: Callable[[], float] = time.time,
+                 backend: SessionBackend | None = None, cache_ttl: float = 5.0,
+                 touch_interval: float | None = None):
+        self.idle_ttl = idle_ttl
+        self.absolute_ttl = absolute_ttl
+        self.max_sessions = max_sessions
+        self.sweep_interval = sweep_interval
+        self._clock = clock
+        self.backend = backend
+        self.cache_ttl = cache_ttl
+        self.touch_interval = min(60.0, idle_ttl / 10) if touch_interval is None else touch_interval
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict() # 按最近访问时间排序，最旧的在前
+        self._lock = threading.Lock()
+        self._last_sweep = clock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+    def _expired(self, session: Session, now: float) -> bool:
+        return now - session.last_seen > self.idle_ttl or now - session.created_at > self.absolute_ttl
+
+    def _maybe_sweep(self, now: float):
+        if now - self._last_sweep >= self.sweep_interval:
+            self._sweep(now)
+
+    def _sweep(self, now: float) -> int:
+        expired = [sid for sid, session in self._sessions.items() if self._expired(session, now)]
+        for sid in expired:
+            del self._sessions[sid]
+        self._last_sweep = now
+        if self.backend is not None:
+            removed = self.backend.delete_expired(now - self.idle_ttl, now - self.absolute_ttl)
+            removed += self.backend.trim(self.max_sessions)
+            return removed
+        return len(expired)
+
+    def sweep(self) -> int:
+        """立即清理所有过期会话，返回清理的数量"""
+        with self._lock:
+            return self._sweep(self._clock())
+
+    def _remember(self, session: Session):
+        """放入本地字典；超过容量时淘汰最久未访问的（有共享后端时只是丢掉本地缓存）"""
+        self._sessions[session.session_id] = session
+        self._sessions.move_to_end(session.session_id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+    def _refresh(self, session_id: str, session: Session | None, now: float) -> Session | None:
+        """本地副本缺失或超过 cache_ttl 时回共享后端核对"""
+        if self.backend is None or (session is not None and now - session.verified_at <= self.cache_ttl):
+            return session
+        row = self.backend.load(session_id)
+        if row is None:
+            self._sessions.pop(session_id, None)
+            return None
+        user_id, created_at, last_seen = row
+        if session is None or session.user_id != user_id:
+            session = Session(session_id, user_id, created_at, last_seen)
+        else:
+            session.last_seen = max(session.last_seen, last_seen)
+            session.persisted_seen = max(session.persisted_seen, last_seen)
+        session.verified_at = now
+        self._remember(session)
+        return session
+
+    def create(self, user_id: int, user: Any = None, revision: Any = None) -> str:
+        """为用户创建新会话，可以顺带缓存已经读取到的 User 对象"""
+        with self._lock:
+            now = self._clock()
+            self._maybe_sweep(now)
+            session_id = str(uuid.uuid4())
+            session = Session(session_id, user_id, now)
+            if user is not None:
+                session.cache_user(user, revision)
+            if self.backend is not None:
+                self.backend.save(session_id, (user_id, now, now))
+            self._remember(session)
+            return session_id
+
+    def get(self, session_id: str) -> Session | None:
+        """返回有效会话并刷新其访问时间；会话不存在或已过期时返回 None"""
+        with self._lock:
+            now = self._clock()
+            self._maybe_sweep(now)
+            session = self._refresh(session_id, self._sessions.get(session_id), now)
+            if session is None:
+                return None
+            if self._expired(session, now):
+                self._sessions.pop(session_id, None)
+                if self.backend is not None:
+                    self.backend.delete(session_id)
+                return None
+            session.last_seen = now
+            self._sessions.move_to_end(session_id)
+            if self.backend is not None and now - session.persisted_seen >= self.touch_interval:
+                self.backend.touch(session_id, now)
+                session.persisted_seen = now
+            return session
+
+    def remove(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            if self.backend is not None:
+                self.backend.delete(session_id)
@@ -0,0 +1,329 @@
+"""
+基于标准库 sqlite3 的数据管理器。
+
+保持 DataManager 的 get_all / save_all / get_new_id 接口不变，
+同时提供走索引的单条查询（按 id、按邮箱）和单条插入/删除。
+"""
+
+import json
+import math
+import os
+import sqlite3
+from dataclasses import fields
+from typing import Callable, Iterable, Iterator, List, Dict, Any, Tuple
+from src.data_manager import DataManager, _CacheEntry, Op, _record
+from src.indexes import normalize_email
+
+# 每张表额外建立的二级索引：model_type -> [(索引名, 列名, 是否唯一)]
+_SECONDARY_INDEXES: Dict[str, List[Tuple[str, str, bool]]] = {
+    'user': [('idx_users_email', 'email COLLATE NOCASE', True)],
+    'item': [('idx_items_seller_id', 'seller_id', False)],
+    'interaction': [
+        ('idx_interactions_item_id', 'item_id', False),
+        ('idx_interactions_buyer_id', 'buyer_id', False),
+    ],
+}
+
+# 流式遍历时每次从数据库读取的行数
+_PAGE_SIZE = 1000
+
+_TABLES = {'user': 'users', 'item': 'items', 'interaction': 'interactions'}
+
+def _is_json(py_type: Any) -> bool:
+    """列表等复杂类型以 JSON 文本存储"""
+    return py_type not in (int, float, str)
+
+def _column_type(py_type: Any) -> str:
+    if py_type is int: return "INTEGER"
+    if py_type is float: return "REAL"
+    return "TEXT"
+
+class SqliteDataManager(DataManager):
+    def __init__(self, data_folder: str = "data", db_file: str = "trade.db", compact_models: bool = False):
+        super().__init__(data_folder, compact_models=compact_models)
+        self.db_file = os.path.join(data_folder, db_file)
+        # 服务层可能在多个线程中调用，连接的访问与缓存共用基类的可重入锁 self._lock
+        self._column_defs = {
+            model_type: [(f.name, _column_type(f.type)) for f in fields(self._model_info(model_type)[1])]
+            for model_type in _TABLES
+        }
+        self._conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.create_function("normalize_email", 1,
+                                   lambda email: normalize_email(email) if isinstance(email, str) else email,
+                                   deterministic=True)
+        self._create_schema()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # --- Schema ---
+    def _columns(self, model_type: str) -> List[Tuple[str, str]]:
+        return self._column_defs[model_type]
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            # 每张表的版本号，写入该表时在同一事务中递增；model_type 为空的一行是建库时生成的随机标识
+            self._conn.execute("CREATE TABLE IF NOT EXISTS versions (model_type TEXT PRIMARY KEY, n INTEGER NOT NULL)")
+            self._conn.execute("INSERT OR IGNORE INTO versions (model_type, n) VALUES ('', random())")
+            for model_type, table in _TABLES.items():
+                columns = ", ".join(
+                    f"{name} {sql_type}" + (" PRIMARY KEY" if name == 'id' else "")
+                    for name, sql_type in self._columns(model_type)
+                )
+                self._conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({columns})")
+                self._add_missing_columns(model_type, table)
+                if model_type == 'user':
+                    # 邮箱写入时规范化，与 JSON 后端的邮箱索引一致；补齐旧版本写入的未规范化数据。
+                    # 规范化后与已有邮箱冲突的行保持原样
+                    normalized = self._conn.execute("UPDATE OR IGNORE users SET email = normalize_email(email) "
+                                                    "WHERE email != normalize_email(email)")
+                    if normalized.rowcount > 0:
+                        self._bump_version(model_type)
+                for index_name, column, unique in _SECONDARY_INDEXES[model_type]:
+                    self._conn.execute(
+                        f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {index_name} ON {table} ({column})"
+                    )
+
+            self._conn.execute("CREATE TABLE IF NOT EXISTS sequences (model_type TEXT PRIMARY KEY, last_id INTEGER NOT NULL)")
+
+    def _add_missing_columns(self, model_type: str, table: str):
+        """旧版本创建的表缺少模型新增的字段时补上该列，已有行取字段默认值"""
+        existing = {row['name'] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+        defaults = {f.name: f.default for f in fields(self._model_info(model_type)[1])}
+        for name, sql_type in self._columns(model_type):
+            if name not in existing:
+                default = defaults[name]
+                clause = f" DEFAULT {default!r}" if isinstance(default, (int, float, str)) else ""
+                self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {sql_type}{clause}")
+
+    # --- Row <-> Object ---
+    def _to_row(self, model_type: str, record: Dict[str, Any]) -> Tuple[Any, ...]:
+        if model_type == 'user':
+            record = dict(record, email=normalize_email(record['email']))
+        return tuple(
+            json.dumps(record[name], ensure_ascii=False) if isinstance(record[name], (list, tuple)) else record[name]
+            for name, _ in self._columns(model_type)
+        )
+
+    def _from_row(self, model_type: str, row: sqlite3.Row) -> Any:
+        _, model_class = self._model_info(model_type)
+        data = dict(row)
+        for f in fields(model_class):
+            if _is_json(f.type) and isinstance(data.get(f.name), str):
+                data[f.name] = json.loads(data[f.name])
+        return model_class(**data)
+
+    def _insert_sql(self, model_type: str) -> str:
+        names = [name for name, _ in self._columns(model_type)]
+        return f"INSERT INTO {_TABLES[model_type]} ({', '.join(names)}) VALUES ({', '.join('?' for _ in names)})"
+
+    def _upsert_sql(self, model_type: str) -> str:
+        # 只在主键冲突时覆盖；邮箱等唯一索引冲突仍然报错，不能用 INSERT OR REPLACE 悄悄删掉别的行
+        updates = ", ".join(f"{name} = excluded.{name}" for name, _ in self._columns(model_type) if name != 'id')
+        return f"{self._insert_sql(model_type)} ON CONFLICT(id) DO UPDATE SET {updates}"
+
+    # --- Storage hooks ---
+    def _storage_stamp(self, model_type: str) -> Any:
+        # 取该表自己的版本号：其他连接（例如其他 worker）写入别的表时，本表的缓存仍然有效
+        self._model_info(model_type)
+        with self._lock:
+            row = self._conn.execute("SELECT n FROM versions WHERE model_type = ?", (model_type,)).fetchone()
+        return row[0] if row else 0
+
+    def _persistent_stamp(self, model_type: str) -> Any:
+        # 版本号随数据库持久化，跨进程依然有效；加上建库标识，换成另一个数据库文件时不会误认
+        self._model_info(model_type)
+        with self._lock:
+            token = self._conn.execute("SELECT n FROM versions WHERE model_type = ''").fetchone()[0]
+        return [token, self._storage_stamp(model_type)]
+
+    def _bump_version(self, model_type: str) -> int:
+        """在当前写事务中递增表的版本号并返回新值；写事务持有数据库写锁，期间不会有其他连接写入"""
+        self._conn.execute("INSERT INTO versions (model_type, n) VALUES (?, 1) "
+                           "ON CONFLICT(model_type) DO UPDATE SET n = n + 1", (model_type,))
+        return self._conn.execute("SELECT n FROM versions WHERE model_type = ?", (model_type,)).fetchone()[0]
+
+    def _load_from_storage(self, model_type: str) -> Tuple[List[Any], int]:
+        with self._lock:
+            rows = self._conn.execute(f"SELECT * FROM {_TABLES[model_type]} ORDER BY id").fetchall()
+        return [self._from_row(model_type, row) for row in rows], 0
+
+    def _iter_from_storage(self, model_type: str) -> Iterator[Any]:
+        # 按主键分页读取，每页单独加锁，遍历过程中不长期占用连接
+        last_id = -math.inf
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT * FROM {_TABLES[model_type]} WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, _PAGE_SIZE),
+                ).fetchall()
+            for row in rows:
+                yield self._from_row(model_type, row)
+            if len(rows) < _PAGE_SIZE:
+                return
+            last_id = rows[-1]['id']
+
+    def _commit(self, model_type: str, entry: _CacheEntry, objects: List[Any], ops: List[Op], full: bool = False):
+        # 与日志模式相同，只把差异部分落盘；缓存的版本号取自写事务内递增后的值
+        if not ops:
+            entry.apply(objects, ops, full)
+            return
+        upserts = [self._to_row(model_type, _record(target)) for op, target in ops if op != 'delete']
+        deletes = [(target,) for op, target in ops if op == 'delete']
+        try:
+            with self._lock, self._conn:
+                if deletes:
+                    self._conn.executemany(f"DELETE FROM {_TABLES[model_type]} WHERE id = ?", deletes)
+                if upserts:
+                    self._conn.executemany(self._upsert_sql(model_type), upserts)
+                version = self._bump_version(model_type)
+        except sqlite3.IntegrityError as e:
+            raise ValueError(f"Duplicate {model_type}: {e}") from e
+        self._apply_committed(model_type, entry, lambda _: objects, ops, version, full)
+
+    # --- Point Access ---
+    # 事务中的单条读写走基类实现，作用于事务的工作视图，提交时统一写入数据库
+    def get_by_id(self, model_type: str, obj_id: int) -> Any | None:
+        if self._active_tx() is not None:
+            return super().get_by_id(model_type, obj_id)
+        self._model_info(model_type)
+        with self._lock:
+            row = self._conn.execute(f"SELECT * FROM {_TABLES[model_type]} WHERE id = ?", (obj_id,)).fetchone()
+        return self._from_row(model_type, row) if row else None
+
+    def count(self, model_type: str) -> int:
+        if self._active_tx() is not None:
+            return super().count(model_type)
+        self._model_info(model_type)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {_TABLES[model_type]}").fetchone()[0]
+
+    def get_user_by_email(self, email: str) -> Any | None:
+        if self._active_tx() is not None:
+            return super().get_user_by_email(email)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM users WHERE email = ? COLLATE NOCASE", (normalize_email(email),)
+            ).fetchone()
+        return self._from_row('user', row) if row else None
+
+    # 单条写入直接执行 SQL，提交后像 _commit 一样把变更应用到已加载的缓存和派生索引上，
+    # 不丢弃缓存，下次读取也就不必整表重新加载、重建索引
+    def _apply_committed(self, model_type: str, entry: _CacheEntry | None, change: Callable[[List[Any]], List[Any]],
+                         ops: List[Op], version: int, full: bool = False):
+        if entry is not None and entry.stamp == version - 1:
+            entry.apply(change(entry.objects), ops, full)
+            entry.stamp = version
+        else:
+            # 写入前其他连接已经改过这张表，缓存缺少那些变更，下次读取时重新加载
+            self._cache.pop(model_type, None)
+        self._revisions[model_type] += 1
+
+    def insert(self, model_type: str, obj: Any):
+        if self._active_tx() is not None:
+            return super().insert(model_type, obj)
+        self._model_info(model_type)
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.execute(self._insert_sql(model_type), self._to_row(model_type, _record(obj)))
+                    version = self._bump_version(model_type)
+            except sqlite3.IntegrityError as e:
+                raise ValueError(f"Duplicate {model_type}: {e}") from e
+            self._apply_committed(model_type, self._cache.get(model_type), lambda objects: objects + [obj],
+                                  [('insert', obj)], version)
+
+    def update(self, model_type: str, obj: Any):
+        if self._active_tx() is not None:
+            return super().update(model_type, obj)
+        self._model_info(model_type)
+        with self._lock:
+            with self._conn:
+                exists = self._conn.execute(f"SELECT 1 FROM {_TABLES[model_type]} WHERE id = ?", (obj.id,)).fetchone()
+                if exists:
+                    self._conn.execute(self._upsert_sql(model_type), self._to_row(model_type, _record(obj)))
+                    version = self._bump_version(model_type)
+            if not exists:
+                raise ValueError(f"Unknown {model_type} id: {obj.id}")
+            self._apply_committed(model_type, self._cache.get(model_type),
+                                  lambda objects: [obj if o.id == obj.id else o for o in objects],
+                                  [('update', obj)], version)
+
+    def delete(self, model_type: str, obj_id: int) -> bool:
+        if self._active_tx() is not None:
+            return super().delete(model_type, obj_id)
+        return self.delete_many(model_type, [obj_id]) > 0
+
+    def delete_many(self, model_type: str, obj_ids: Iterable[int]) -> int:
+        if self._active_tx() is not None:
+            return super().delete_many(model_type, obj_ids)
+        self._model_info(model_type)
+        obj_ids = set(obj_ids)
+        with self._lock:
+            with self._conn:
+                deleted = self._conn.executemany(f"DELETE FROM {_TABLES[model_type]} WHERE id = ?",
+                                                 ((obj_id,) for obj_id in obj_ids)).rowcount
+                if deleted:
+                    version = self._bump_version(model_type)
+            if deleted:
+                self._apply_committed(model_type, self._cache.get(model_type),
+                                      lambda objects: [o for o in objects if o.id not in obj_ids],
+                                      [('delete', obj_id) for obj_id in obj_ids], version)
+        return deleted
+
+    def next_id(self, model_type: str) -> int:
+        """在 BEGIN IMMEDIATE 事务中递增序列，多个连接/进程并发分配也不会重复"""
+        self._model_info(model_type)
+        table = _TABLES[model_type]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT last_id FROM sequences WHERE model_type = ?", (model_type,)).fetchone()
+                last = row[0] if row else self._conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+                new_id = last + 1
+                while self._conn.execute(f"SELECT 1 FROM {table} WHERE id = ?", (new_id,)).fetchone():
+                    new_id += 1
+                self._conn.execute(
+                    "INSERT INTO sequences (model_type, last_id) VALUES (?, ?) "
+                    "ON CONFLICT(model_type) DO UPDATE SET last_id = excluded.last_id",
+                    (model_type, new_id),
+                )
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+        return new_id
+
+    # --- Migration ---
+    def migrate_from_json(self, json_folder: str = "data") -> Dict[str, int]:
+        """一次性把 JSON 数据目录导入数据库（按 id 覆盖），返回各模型导入的条数"""
+        source = DataManager(data_folder=json_folder)
+        counts = {}
+        with self._lock, self._conn:
+            for model_type in _TABLES:
+                # 逐条流式读取 JSON，内存占用与数据量无关
+                counts[model_type] = 0
+                def rows(model_type=model_type):
+                    for obj in source.iter_all(model_type):
+                        counts[model_type] += 1
+                        yield self._to_row(model_type, _record(obj))
+                self._conn.executemany(self._upsert_sql(model_type), rows())
+                self._bump_version(model_type)
+        self.invalidate_cache()
+        return counts
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Migrate JSON data files into a SQLite database.")
+    parser.add_argument("--json-folder", default="data")
+    parser.add_argument("--data-folder", default="data")
+    parser.add_argument("--db-file", default="trade.db")
+    args = parser.parse_args()
+
+    manager = SqliteDataManager(data_folder=args.data_folder, db_file=args.db_file)
+    print(f"Migrated: {manager.migrate_from_json(args.json_folder)}")
+    manager.close()
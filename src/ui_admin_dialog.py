@@ -44,6 +44,9 @@ class Ui_Dialog(object):
         self.deleteItemButton.setGeometry(QtCore.QRect(120, 160, 91, 31))
         self.deleteItemButton.setObjectName("deleteItemButton")
         self.tabWidget.addTab(self.tab_2, "")
+        self.filterLineEdit = QtWidgets.QLineEdit(Dialog)
+        self.filterLineEdit.setGeometry(QtCore.QRect(80, 50, 331, 31))
+        self.filterLineEdit.setObjectName("filterLineEdit")
         self.errorLabel = QtWidgets.QLabel(Dialog)
         self.errorLabel.setGeometry(QtCore.QRect(90, 320, 311, 21))
         self.errorLabel.setObjectName("errorLabel")
@@ -59,6 +62,7 @@ class Ui_Dialog(object):
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab), _translate("Dialog", "User"))
         self.deleteItemButton.setText(_translate("Dialog", "Delete Item"))
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_2), _translate("Dialog", "Item"))
+        self.filterLineEdit.setPlaceholderText(_translate("Dialog", "filter..."))
         self.errorLabel.setText(_translate("Dialog", "<html><head/><body><p align=\"center\"><br/></p></body></html>"))
 
 
@@ -38,15 +38,20 @@ class Ui_MainWindow(object):
         self.searchButton.setFont(font)
         self.searchButton.setObjectName("searchButton")
         self.horizontalLayout.addWidget(self.searchButton)
-        self.itemTableWidget = QtWidgets.QTableWidget(self.centralwidget)
-        self.itemTableWidget.setGeometry(QtCore.QRect(50, 90, 701, 371))
-        self.itemTableWidget.setLineWidth(1)
-        self.itemTableWidget.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
-        self.itemTableWidget.setRowCount(0)
-        self.itemTableWidget.setColumnCount(4)
-        self.itemTableWidget.setObjectName("itemTableWidget")
-        self.itemTableWidget.horizontalHeader().setDefaultSectionSize(170)
-        self.itemTableWidget.verticalHeader().setDefaultSectionSize(50)
+        self.trendingButton = QtWidgets.QPushButton(self.horizontalLayoutWidget)
+        font = QtGui.QFont()
+        font.setPointSize(11)
+        self.trendingButton.setFont(font)
+        self.trendingButton.setObjectName("trendingButton")
+        self.horizontalLayout.addWidget(self.trendingButton)
+        self.itemTableView = QtWidgets.QTableView(self.centralwidget)
+        self.itemTableView.setGeometry(QtCore.QRect(50, 90, 701, 371))
+        self.itemTableView.setLineWidth(1)
+        self.itemTableView.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.itemTableView.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.itemTableView.setObjectName("itemTableView")
+        self.itemTableView.horizontalHeader().setDefaultSectionSize(170)
+        self.itemTableView.verticalHeader().setDefaultSectionSize(50)
         self.publishItemButton = QtWidgets.QPushButton(self.centralwidget)
         self.publishItemButton.setGeometry(QtCore.QRect(580, 470, 151, 41))
         font = QtGui.QFont()
@@ -86,6 +91,7 @@ class Ui_MainWindow(object):
         self.welcomeLabel.setText(_translate("MainWindow", "<html><head/><body><p align=\"center\"><span style=\" font-size:18pt; font-weight:600;\">Welcome !</span></p></body></html>"))
         self.searchLineEdit.setPlaceholderText(_translate("MainWindow", "search products..."))
         self.searchButton.setText(_translate("MainWindow", "Search"))
+        self.trendingButton.setText(_translate("MainWindow", "Hot"))
         self.publishItemButton.setText(_translate("MainWindow", "Publish Products"))
         self.adminPanelButton.setText(_translate("MainWindow", "AdminPanel"))
         self.logoutButton.setText(_translate("MainWindow", "Log Out"))
@@ -9,17 +9,16 @@ import os
 
 # ... (后续代码与上一版完全相同) ...
 def setup_initial_data(data_manager: DataManager, auth_service: AuthService):
-    """清空数据并创建一个管理员账户"""
-    for file in [data_manager.users_file, data_manager.items_file, data_manager.interactions_file]:
+    """清空数据（包括持久化的 id 序列，使 id 从 1 重新分配）并创建一个管理员账户"""
+    for file in [data_manager.users_file, data_manager.items_file, data_manager.interactions_file,
+                 data_manager.sequences_file]:
         if os.path.exists(file):
             os.remove(file)
     
-    # 创建管理员
-    users = data_manager.get_all('user')
-    admin_user = auth_service.register("admin@app.com", "admin123", "Admin", "Internal")
-    admin_user.role = "ADMIN"
-    users = [u if u.id != admin_user.id else admin_user for u in data_manager.get_all('user')]
-    data_manager.save_all('user', users)
+    # 创建管理员：注册与修改角色在同一事务中提交
+    with data_manager.transaction():
+        admin_user = auth_service.register("admin@app.com", "admin123", "Admin", "Internal")
+        admin_user.role = "ADMIN"
     print("--- Initial setup complete. Admin user created. ---")
 
 
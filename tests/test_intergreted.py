@@ -1,8 +1,14 @@
+import json
+import os
 import pytest
 from src.data_manager import DataManager
 from src.services.auth_service import AuthService
 from src.services.item_service import ItemService
 from src.services.admin_service import AdminService
+from src.services.session_store import SessionStore
+from src.services.session_backends import SqliteSessionBackend
+from src.sqlite_data_manager import SqliteDataManager
+from src.models import User, Item
 
 # --- 集成测试环境搭建 ---
 
@@ -129,3 +135,920 @@ def test_integration_admin_governance(integration_env):
     with pytest.raises(ValueError) as excinfo:
         auth_service.login("spammer@bad.com", "123")
     assert "Invalid email" in str(excinfo.value) # 此时邮箱已不存在于系统中
+
+
+# =========================================================
+# 集成测试组 3: DataManager 缓存 (Cache Integration)
+# 场景：重复读取命中缓存 -> 外部修改文件后自动失效 -> save_all 写穿透
+# =========================================================
+
+def test_integration_data_manager_cache(integration_env, monkeypatch):
+    dm, auth_service, _, _ = integration_env
+    auth_service.register("cache@test.com", "pwd", "Cache", "C1")
+
+    # 1. 缓存已热，再次读取不应重新解析文件
+    dm.get_all('user')
+    calls = []
+    original_read = dm._read_data
+    monkeypatch.setattr(dm, "_read_data", lambda path: calls.append(path) or original_read(path))
+    users = dm.get_all('user')
+    assert len(users) == 1
+    assert calls == []
+
+    # 2. 返回的是列表副本，调用方修改列表不会污染缓存
+    users.clear()
+    assert len(dm.get_all('user')) == 1
+
+    # 3. 外部直接改写文件（大小变化）后，缓存应失效并重新加载
+    with open(dm.users_file, 'w', encoding='utf-8') as f:
+        f.write("[]")
+    assert dm.get_all('user') == []
+    assert calls == [dm.users_file]
+
+
+# =========================================================
+# 集成测试组 4: 日志存储模式 (Journal Integration)
+# 场景：日志模式下读写 -> 只追加日志不重写快照 -> 重启回放 -> 合并
+# =========================================================
+
+def test_integration_journal_mode(tmp_path):
+    data_dir = str(tmp_path / "journal_data")
+    dm = DataManager(data_folder=data_dir, journal=True, compact_threshold=0)
+    auth = AuthService(dm)
+    item = ItemService(dm, auth)
+    admin = AdminService(dm, auth)
+
+    auth.register("seller@j.com", "p", "Seller", "C1")
+    seller_session, _ = auth.login("seller@j.com", "p")
+    kept = item.publish_item(seller_session, "Desk", "Wooden", 80.0, [])
+    removed = item.publish_item(seller_session, "Lamp", "LED", 20.0, [])
+
+    auth.register("admin@j.com", "p", "Admin", "C2")
+    users = dm.get_all('user')
+    users[-1].role = "ADMIN"
+    dm.save_all('user', users)
+    admin_session, _ = auth.login("admin@j.com", "p")
+    admin.delete_item(admin_session, removed.id)
+
+    # 1. 快照文件从未被写入，所有改动都在日志中
+    assert not os.path.exists(dm.items_file)
+    with open(dm._log_file(dm.items_file), encoding='utf-8') as f:
+        ops = [json.loads(line)['op'] for line in f]
+    assert ops == ['insert', 'insert', 'delete']
+    with open(dm._log_file(dm.users_file), encoding='utf-8') as f:
+        assert [json.loads(line)['op'] for line in f] == ['insert', 'insert', 'update']
+
+    # 2. 新进程启动时回放 快照 + 日志
+    reopened = DataManager(data_folder=data_dir, journal=True)
+    assert [i.id for i in reopened.get_all('item')] == [kept.id]
+    assert reopened.get_all('user')[-1].role == "ADMIN"
+
+    # 3. 合并后日志被清空，数据保持不变
+    reopened.compact()
+    assert not os.path.exists(reopened._log_file(reopened.items_file))
+    assert [i.title for i in DataManager(data_folder=data_dir, journal=True).get_all('item')] == ["Desk"]
+
+
+# =========================================================
+# 集成测试组 5: SQLite 存储后端 (SQLite Integration)
+# 场景：从 JSON 迁移 -> 服务层照常工作 -> 单条查询走索引 -> 邮箱写入时规范化，与 JSON 后端一致
+#       -> 单条写入增量更新缓存与派生索引，不整表重建
+# =========================================================
+
+def test_integration_sqlite_backend(tmp_path, monkeypatch):
+    json_dir = tmp_path / "json_data"
+    json_dm = DataManager(data_folder=str(json_dir))
+    json_auth = AuthService(json_dm)
+    json_auth.register("old@json.com", "p", "Old", "C0")
+    session_id, _ = json_auth.login("old@json.com", "p")
+    ItemService(json_dm, json_auth).publish_item(session_id, "旧书", "Old book", 5.0, ["a.png"])
+
+    # 1. 一次性迁移
+    dm = SqliteDataManager(data_folder=str(tmp_path / "db_data"))
+    assert dm.migrate_from_json(str(json_dir)) == {'user': 1, 'item': 1, 'interaction': 0}
+    assert dm.get_all('item')[0].image_paths == ["a.png"]
+
+    # 2. 服务层通过 get_all/save_all 契约照常工作
+    auth = AuthService(dm)
+    item_service = ItemService(dm, auth)
+    auth.register("buyer@db.com", "p", "Buyer", "C1")
+    buyer_session, buyer = auth.login("buyer@db.com", "p")
+    assert item_service.express_interest(buyer_session, 1) == "C0"
+    assert len(dm.get_all('interaction')) == 1
+
+    # 3. 单条查询、插入与删除
+    assert dm.get_user_by_email("buyer@db.com").id == buyer.id
+    assert dm.get_by_id('item', 1).title == "旧书"
+    assert dm.get_by_id('item', 99) is None
+    with pytest.raises(ValueError):
+        dm.insert('user', User(99, "old@json.com", "h", "Dup", "C"))
+    assert dm.delete('item', 1) is True
+    assert dm.delete('item', 1) is False
+    assert dm.get_all('item') == []
+
+    # 4. 另一个连接（例如另一个 worker）写入后，只有被写入的那张表在本连接的缓存失效
+    dm.get_all('user')
+    user_revision = dm.revision('user')
+    other = SqliteDataManager(data_folder=str(tmp_path / "db_data"))
+    other.insert('item', Item(7, buyer.id, "New", "desc", 1.0))
+    assert [i.id for i in dm.get_all('item')] == [7]
+    assert dm.revision('user') == user_revision
+
+    # 缓存过期后本连接再写同一张表：丢弃缓存，重新加载后两边的写入都在
+    other.insert('item', Item(8, buyer.id, "Other", "desc", 1.0))
+    dm.insert('item', Item(9, buyer.id, "Mine", "desc", 1.0))
+    assert [i.id for i in dm.get_all('item')] == [7, 8, 9]
+    assert dm.delete_many('item', [8, 9]) == 2
+    assert [i.id for i in other.get_all('item')] == [7]
+    other.close()
+
+    # 5. 带空白、大小写不同的邮箱：两种后端都能按规范化邮箱查到
+    for backend in (json_dm, dm):
+        backend.insert('user', User(50, " Mixed@Case.COM ", "h", "Mixed", "C"))
+        assert backend.get_user_by_email("mixed@case.com").id == 50
+    assert dm.get_by_id('user', 50).email == "mixed@case.com"
+    assert auth.register(" New@DB.com", "p", "New", "C").email == "new@db.com"
+    dm.close()
+
+    # 旧版本写入的未规范化邮箱在打开数据库时补齐
+    import sqlite3
+    conn = sqlite3.connect(tmp_path / "db_data" / "trade.db")
+    conn.execute("UPDATE users SET email = ' Legacy@DB.com' WHERE id = 50")
+    conn.commit()
+    conn.close()
+    reopened = SqliteDataManager(data_folder=str(tmp_path / "db_data"))
+    assert reopened.get_user_by_email("legacy@db.com").id == 50
+
+    # 6. 发布、修改、删除后缓存与搜索索引增量更新，搜索索引只构建一次
+    from src.indexes import SearchIndex
+    rebuilds = []
+    original_rebuild = SearchIndex.rebuild
+    monkeypatch.setattr(SearchIndex, "rebuild", lambda self, objects: rebuilds.append(1) or original_rebuild(self, objects))
+    auth = AuthService(reopened)
+    item_service = ItemService(reopened, auth)
+    reopened.insert('user', User(60, "pub@db.com", "hashed_p", "Pub", "C"))
+    session_id, _ = auth.login("pub@db.com", "p")
+    for n in range(3):
+        item = item_service.publish_item(session_id, f"Desk {n}", "oak", 10.0 + n, [])
+        assert item_service.search_page("desk").total == n + 1
+    item.title = "Chair"
+    reopened.update('item', item)
+    assert item_service.search_page("desk").total == 2
+    reopened.delete('item', item.id)
+    assert item_service.search_page("chair").total == 0
+    assert [i.title for i in reopened.get_all('item')] == ["New", "Desk 0", "Desk 1"]
+    assert rebuilds == [1]
+    reopened.close()
+
+
+# =========================================================
+# 集成测试组 6: 主键与邮箱索引 (Index Integration)
+# 场景：规范化邮箱查重/登录 -> 删除用户后索引同步 -> 外部修改文件后重建
+# =========================================================
+
+def test_integration_user_indexes(integration_env):
+    dm, auth_service, _, admin_service = integration_env
+    user = auth_service.register("Mixed@Case.com", "p", "Mixed", "C1")
+
+    # 1. 邮箱按规范化形式查重与登录
+    with pytest.raises(ValueError, match="already registered"):
+        auth_service.register("  mixed@case.COM ", "p", "Dup", "C2")
+    _, logged_in = auth_service.login("mixed@case.com", "p")
+    assert logged_in is dm.get_by_id('user', user.id)
+
+    # 2. 管理员删除用户后，主键与邮箱索引同步失效，邮箱可以重新注册
+    auth_service.register("root@sys.com", "p", "Root", "C3")
+    users = dm.get_all('user')
+    users[-1].role = "ADMIN"
+    dm.save_all('user', users)
+    admin_session, _ = auth_service.login("root@sys.com", "p")
+    assert admin_service.delete_user(admin_session, user.id) is True
+    assert admin_service.delete_user(admin_session, user.id) is False
+    assert dm.get_by_id('user', user.id) is None
+    assert dm.get_user_by_email("mixed@case.com") is None
+    auth_service.register("mixed@case.com", "p", "Again", "C4")
+
+    # 3. 外部改写文件后，索引随缓存一起重建
+    with open(dm.users_file, 'w', encoding='utf-8') as f:
+        f.write("[]")
+    assert dm.get_user_by_email("root@sys.com") is None
+
+
+# =========================================================
+# 集成测试组 7: 分面查询索引维护 (Faceted Query Integration)
+# 场景：发布商品 -> 按卖家/价格查询 -> 管理员删除后索引同步
+# =========================================================
+
+def test_integration_query_items_indexes(integration_env):
+    dm, auth_service, item_service, admin_service = integration_env
+    auth_service.register("s@q.com", "p", "S", "C")
+    session_id, seller = auth_service.login("s@q.com", "p")
+    cheap = item_service.publish_item(session_id, "Pen", "blue", 3.0, [])
+    item_service.publish_item(session_id, "Bag", "black", 150.0, [])
+
+    assert [i.id for i in item_service.query_items(max_price=100).items] == [cheap.id]
+    assert item_service.query_items(seller_id=seller.id, include_total=True).total == 2
+
+    auth_service.register("a@q.com", "p", "A", "C")
+    users = dm.get_all('user')
+    users[-1].role = "ADMIN"
+    dm.save_all('user', users)
+    admin_session, _ = auth_service.login("a@q.com", "p")
+    admin_service.delete_item(admin_session, cheap.id)
+
+    assert item_service.query_items(max_price=100).items == []
+    assert item_service.query_items(status="AVAILABLE", include_total=True).total == 1
+
+
+# =========================================================
+# 集成测试组 8: 共享会话后端 (Shared Session Backend Integration)
+# 场景：两个“进程”各自持有 DataManager/SessionStore，共用 data 目录与会话库
+# =========================================================
+
+def test_integration_shared_session_backend(tmp_path):
+    data_dir = str(tmp_path / "shared_data")
+    db_file = str(tmp_path / "shared_data" / "sessions.db")
+    now = [1000.0]
+    clock = lambda: now[0]
+
+    def make_worker():
+        dm = DataManager(data_folder=data_dir)
+        store = SessionStore(idle_ttl=60, clock=clock, cache_ttl=5, backend=SqliteSessionBackend(db_file))
+        auth = AuthService(dm, session_store=store)
+        return auth, ItemService(dm, auth), store
+
+    auth_a, _, _ = make_worker()
+    auth_b, item_b, store_b = make_worker()
+
+    # 1. 进程 A 签发的会话可以在进程 B 上使用
+    auth_a.register("w@shared.com", "p", "Worker", "C")
+    session_id, user = auth_a.login("w@shared.com", "p")
+    assert auth_b.get_user_from_session(session_id).id == user.id
+    assert item_b.publish_item(session_id, "Shared", "desc", 1.0, []).seller_id == user.id
+
+    # 2. A 登出后，B 的本地缓存在 cache_ttl 内仍有效，过期后回后端核对得知会话已失效
+    auth_a.logout(session_id)
+    assert auth_b.get_user_from_session(session_id) is not None
+    now[0] += 6
+    assert auth_b.get_user_from_session(session_id) is None
+
+    # 3. 空闲过期的会话由清理过程从共享后端删除
+    auth_a.login("w@shared.com", "p")
+    now[0] += 61
+    assert store_b.sweep() == 1
+
+
+# =========================================================
+# 集成测试组 9: 基准套件冒烟测试 (Benchmark Smoke Test)
+# 场景：小规模跑一遍基准，确保每个公开方法都有对应用例且报告可序列化
+# =========================================================
+
+def test_integration_benchmark_smoke():
+    from benchmarks.run import run_benchmarks
+
+    report = run_benchmarks([50], repeat=1)
+    assert report['uncovered'] == []
+    assert {row['target'] for row in report['results']} >= {"DataManager.get_all", "ItemService.search_items"}
+    json.dumps(report)
+
+
+# =========================================================
+# 集成测试组 10: 持久化 id 序列 (ID Allocator Integration)
+# 场景：删除后不复用 -> 多线程/多进程并发分配不重复 -> SQLite 后端同样适用
+# =========================================================
+
+def _allocate_ids(data_dir, count):
+    dm = DataManager(data_folder=data_dir)
+    return [dm.next_id('item') for _ in range(count)]
+
+def test_integration_id_allocator(integration_env, tmp_path):
+    dm, auth_service, item_service, admin_service = integration_env
+    auth_service.register("seq@a.com", "p", "Seq", "C")
+    session_id, _ = auth_service.login("seq@a.com", "p")
+
+    # 1. 删除最新的商品后，新商品不会复用它的 id
+    first = item_service.publish_item(session_id, "A", "a", 1.0, [])
+    assert dm.delete('item', first.id)
+    second = item_service.publish_item(session_id, "B", "b", 1.0, [])
+    assert second.id == first.id + 1
+
+    # 2. 多线程与多进程并发分配得到的 id 互不重复
+    from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        thread_ids = [i for batch in pool.map(lambda _: [dm.next_id('item') for _ in range(25)], range(4)) for i in batch]
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        process_ids = [i for batch in pool.map(_allocate_ids, [dm.data_folder] * 2, [25] * 2) for i in batch]
+    all_ids = thread_ids + process_ids
+    assert len(set(all_ids)) == len(all_ids) == 150
+    assert min(all_ids) > second.id
+
+    # 3. SQLite 后端使用事务中的序列表
+    sqlite_dm = SqliteDataManager(data_folder=str(tmp_path / "seq_db"))
+    sqlite_dm.insert('item', Item(5, 1, "X", "x", 1.0))
+    assert sqlite_dm.next_id('item') == 6
+    sqlite_dm.delete('item', 5)
+    assert sqlite_dm.next_id('item') == 7
+    sqlite_dm.close()
+
+
+# =========================================================
+# 集成测试组 11: 工作单元事务 (Transaction Integration)
+# 场景：事务内多次保存只落盘一次 -> 异常时回滚（含原地修改） -> 表达意向失败不留记录 -> 单条写入不做全量对比
+# =========================================================
+
+def test_integration_transaction(integration_env, monkeypatch):
+    dm, auth_service, item_service, admin_service = integration_env
+    auth_service.register("tx@a.com", "p", "Tx", "C")
+    session_id, user = auth_service.login("tx@a.com", "p")
+    item = item_service.publish_item(session_id, "Lamp", "desk lamp", 20.0, [])
+
+    writes = []
+    original_write = dm._write_data
+    monkeypatch.setattr(dm, "_write_data", lambda path, data: writes.append(path) or original_write(path, data))
+
+    # 1. 事务内多次修改同一模型，提交时只写一次文件，事务内读到的是未提交的视图
+    with dm.transaction():
+        for price in (21.0, 22.0, 23.0):
+            items = dm.get_all('item')
+            items[0].price = price
+            dm.save_all('item', items)
+        dm.insert('item', Item(99, user.id, "Desk", "oak", 50.0))
+        assert dm.get_by_id('item', 99).title == "Desk"
+        assert writes == []
+    assert writes == [dm.items_file]
+    assert DataManager(data_folder=dm.data_folder).get_by_id('item', item.id).price == 23.0
+
+    # 2. 抛出异常时丢弃所有修改，包括对缓存对象的原地修改
+    writes.clear()
+    with pytest.raises(RuntimeError):
+        with dm.transaction():
+            dm.get_by_id('item', item.id).price = 1.0
+            dm.delete('item', 99)
+            auth_service.register("ghost@a.com", "p", "Ghost", "C")
+            raise RuntimeError("abort")
+    assert writes == []
+    assert dm.get_by_id('item', item.id).price == 23.0
+    assert dm.get_by_id('item', 99) is not None
+    assert dm.get_user_by_email("ghost@a.com") is None
+
+    # 3. 卖家不存在时表达意向失败，不会留下互动记录
+    dm.insert('item', Item(100, 12345, "Orphan", "no seller", 5.0))
+    with pytest.raises(ValueError, match="Seller not found"):
+        item_service.express_interest(session_id, 100)
+    assert dm.get_all('interaction') == []
+    assert not os.path.exists(dm.items_file + ".tmp")
+
+    # 4. SQLite 后端：事务内的单条读写作用于工作视图，回滚后数据库不变
+    sqlite_dm = SqliteDataManager(data_folder=os.path.join(dm.data_folder, "tx_db"))
+    with pytest.raises(RuntimeError):
+        with sqlite_dm.transaction():
+            sqlite_dm.insert('item', Item(1, 1, "X", "x", 1.0))
+            assert sqlite_dm.get_by_id('item', 1).title == "X"
+            raise RuntimeError("abort")
+    assert sqlite_dm.get_by_id('item', 1) is None
+    with sqlite_dm.transaction():
+        sqlite_dm.insert('item', Item(1, 1, "X", "x", 1.0))
+    assert sqlite_dm.get_by_id('item', 1).title == "X"
+    sqlite_dm.update('item', Item(1, 1, "Y", "x", 1.0))
+    assert sqlite_dm.get_by_id('item', 1).title == "Y"
+    with pytest.raises(ValueError, match="Unknown item"):
+        sqlite_dm.update('item', Item(2, 1, "Z", "z", 1.0))
+    sqlite_dm.close()
+
+    # 5. 只经 insert / update / delete 修改的事务按记录的操作提交，不逐条对比全部记录
+    monkeypatch.setattr(dm, "_diff", lambda entry, objects: pytest.fail("keyed writes should not diff"))
+    writes.clear()
+    with dm.transaction():
+        lamp = dm.get_by_id('item', item.id)
+        lamp.price = 30.0
+        dm.update('item', lamp)
+        dm.insert('item', Item(101, user.id, "Chair", "wood", 15.0))
+        dm.delete('item', 100)
+        assert dm.get_by_id('item', 101).title == "Chair"
+        assert dm.get_by_id('item', 100) is None
+    assert writes == [dm.items_file]
+    reloaded = DataManager(data_folder=dm.data_folder)
+    assert reloaded.get_by_id('item', item.id).price == 30.0
+    assert reloaded.get_by_id('item', 101).title == "Chair"
+    assert reloaded.get_by_id('item', 100) is None
+    with pytest.raises(ValueError, match="Unknown item"):
+        dm.update('item', Item(12345, user.id, "Missing", "x", 1.0))
+
+
+# =========================================================
+# 集成测试组 12: 列式商品统计 (Columnar Statistics Integration)
+# 场景：管理员统计 -> 发布/删除商品后列式视图增量更新
+# =========================================================
+
+def test_integration_item_statistics(integration_env):
+    pytest.importorskip("numpy")
+    dm, auth_service, item_service, admin_service = integration_env
+    admin = auth_service.register("stats_admin@a.com", "p", "Admin", "C")
+    admin.role = "ADMIN"
+    dm.save_all('user', dm.get_all('user'))
+    auth_service.register("stats_seller@a.com", "p", "Seller", "C")
+    admin_session, _ = auth_service.login("stats_admin@a.com", "p")
+    seller_session, seller = auth_service.login("stats_seller@a.com", "p")
+
+    cheap = item_service.publish_item(seller_session, "Pen", "blue", 2.0, [])
+    assert admin_service.get_item_statistics(admin_session)['count'] == 1
+
+    item_service.publish_item(seller_session, "Chair", "wood", 40.0, [])
+    admin_service.delete_item(admin_session, cheap.id)
+    stats = admin_service.get_item_statistics(admin_session)
+    assert stats['count'] == 1
+    assert stats['mean_price'] == 40.0
+    assert stats['seller_counts'] == {seller.id: 1}
+
+
+# =========================================================
+# 集成测试组 13: 流式遍历 (Streaming Iterator Integration)
+# 场景：冷启动流式读取不填充缓存 -> 日志模式合并日志改动 -> JSON Lines 文件 -> SQLite 分页遍历
+# =========================================================
+
+def test_integration_iter_all(tmp_path):
+    data_dir = str(tmp_path / "stream")
+    DataManager(data_folder=data_dir).save_all('item', [Item(i, 1, f"T{i}", "d", float(i)) for i in range(1, 6)])
+
+    # 1. 冷启动时流式解码，与 get_all 结果一致且不填充缓存
+    dm = DataManager(data_folder=data_dir)
+    assert [i.id for i in dm.iter_all('item')] == [1, 2, 3, 4, 5]
+    assert 'item' not in dm._cache
+    assert list(dm.iter_all('item')) == dm.get_all('item')
+
+    # 2. 日志模式：快照流式读取，日志中的修改、删除和新增都会体现
+    journal_dm = DataManager(data_folder=data_dir, journal=True, compact_threshold=0)
+    items = journal_dm.get_all('item')
+    items[0].price = 100.0
+    journal_dm.save_all('item', [i for i in items if i.id != 2] + [Item(6, 1, "T6", "d", 6.0)])
+    fresh = DataManager(data_folder=data_dir, journal=True)
+    assert [(i.id, i.price) for i in fresh.iter_all('item')] == [(1, 100.0), (3, 3.0), (4, 4.0), (5, 5.0), (6, 6.0)]
+
+    # 3. JSON Lines 格式的数据文件同样可以流式读取与整体加载
+    lines_dir = tmp_path / "lines"
+    lines_dir.mkdir()
+    with open(lines_dir / "users.json", 'w', encoding='utf-8') as f:
+        for i in range(1, 4):
+            f.write(json.dumps({'id': i, 'email': f"u{i}@a.com", 'password_hash': "h", 'nickname': "n", 'contact_info': "c"}) + "\n")
+    lines_dm = DataManager(data_folder=str(lines_dir))
+    assert [u.email for u in lines_dm.iter_all('user')] == ["u1@a.com", "u2@a.com", "u3@a.com"]
+    assert len(lines_dm.get_all('user')) == 3
+
+    # 4. SQLite 后端按主键分页遍历；迁移同样走流式读取
+    sqlite_dm = SqliteDataManager(data_folder=str(tmp_path / "stream_db"))
+    assert sqlite_dm.migrate_from_json(data_dir)['item'] == 5
+    assert [i.id for i in sqlite_dm.iter_all('item')] == [1, 2, 3, 4, 5]
+    sqlite_dm.close()
+
+
+# =========================================================
+# 集成测试组 14: 内存映射商品存储 (Mapped Store Integration)
+# 场景：按 id 查找走二分 -> 本进程写入后浏览走缓存、不重写存储 -> 冷启动时过期才重建 -> 之后直接映射而不解析 JSON
+#       -> SQLite 后端发布后浏览同样不重写存储
+# =========================================================
+
+def test_integration_mapped_store(integration_env, monkeypatch, tmp_path):
+    from src.mapped_store import MappedStore
+    dm, auth_service, item_service, admin_service = integration_env
+    auth_service.register("mmap@a.com", "p", "M", "C")
+    session_id, _ = auth_service.login("mmap@a.com", "p")
+    published = [item_service.publish_item(session_id, f"Item {i}", "d", float(i), []) for i in range(5)]
+
+    # 1. 存储按 id 顺序保存，按 id 查找走二分
+    store = dm.mapped_store('item')
+    assert [i.title for i in store[1:3]] == ["Item 1", "Item 2"] and len(store) == 5
+    assert store.get(published[3].id).title == "Item 3"
+    assert store.get(10**6) is None
+    assert store[-1].title == "Item 4"
+
+    # 2. 本进程写入后缓存是最新的：浏览直接取缓存，不重写整个存储文件
+    dm.delete('item', published[0].id)
+    original_write = MappedStore.write
+    monkeypatch.setattr(MappedStore, "write", staticmethod(lambda *args: pytest.fail("store was rewritten")))
+    page = item_service.browse_items(offset=1, limit=2)
+    assert [i.title for i in page.items] == ["Item 2", "Item 3"] and page.total == 4
+
+    # 3. 冷启动的新实例发现存储过期时加载缓存并重建一次存储，之后的写入与浏览都不再重写
+    writes = []
+    monkeypatch.setattr(MappedStore, "write", staticmethod(lambda *args: writes.append(args[0]) or original_write(*args)))
+    fresh = DataManager(data_folder=dm.data_folder)
+    fresh_items = ItemService(fresh, AuthService(fresh))
+    page = fresh_items.browse_items(limit=2)
+    assert [i.title for i in page.items] == ["Item 1", "Item 2"] and page.total == 4
+    fresh.delete('item', published[4].id)
+    assert fresh_items.browse_items().total == 3
+    assert len(writes) == 1
+
+    # 过期的映射先关闭再替换文件
+    stale = fresh.mapped_store('item')
+    dm.delete('item', published[1].id)
+    assert len(fresh.mapped_store('item')) == 2
+    with pytest.raises(ValueError):
+        stale[0]
+
+    # 4. 数据文件未变时新实例直接映射已有文件，不解析 JSON
+    cold = DataManager(data_folder=dm.data_folder)
+    monkeypatch.setattr(cold, "_load_from_storage", lambda model_type: pytest.fail("catalog was parsed"))
+    monkeypatch.setattr(cold, "_iter_from_storage", lambda model_type: pytest.fail("catalog was parsed"))
+    assert [i.title for i in cold.mapped_store('item')[:2]] == ["Item 2", "Item 3"]
+
+    # 5. SQLite 后端：发布后立即浏览，存储最多在第一次浏览时重建一次
+    sqlite_dm = SqliteDataManager(data_folder=str(tmp_path / "mmap_db"))
+    sqlite_auth = AuthService(sqlite_dm)
+    sqlite_items = ItemService(sqlite_dm, sqlite_auth)
+    sqlite_auth.register("pub@db.com", "p", "Pub", "C")
+    session_id, _ = sqlite_auth.login("pub@db.com", "p")
+    writes.clear()
+    for n in range(10):
+        sqlite_items.publish_item(session_id, f"Lamp {n}", "d", 1.0, [])
+        page = sqlite_items.browse_items(offset=n, limit=5)
+        assert page.total == n + 1 and page.items[0].title == f"Lamp {n}"
+    assert len(writes) <= 1
+    sqlite_dm.close()
+
+
+# =========================================================
+# 集成测试组 15: 二进制快照 (Binary Snapshot Integration)
+# 场景：写入时同时生成快照 -> 冷启动从快照加载 -> JSON 被单独修改或删除后快照失效 -> 双向转换
+# =========================================================
+
+def test_integration_binary_snapshot(tmp_path, monkeypatch):
+    from src import binary_snapshot
+    data_dir = str(tmp_path / "binary")
+    dm = DataManager(data_folder=data_dir, binary_snapshots=True)
+    items = [Item(1, 1, "键盘", "机械", 150, image_paths=["a.png", "b.png"]), Item(2, 1, "Lamp", "desk", 9.5, status="SOLD")]
+    dm.save_all('item', items)
+    assert os.path.exists(os.path.join(data_dir, "items.bin"))
+
+    # 1. 冷启动时从快照加载，不解析 JSON
+    fresh = DataManager(data_folder=data_dir)
+    monkeypatch.setattr(fresh, "_read_data", lambda path: pytest.fail("JSON was parsed"))
+    assert fresh.get_all('item') == items
+    monkeypatch.undo()
+
+    # 2. 不写快照的实例修改 JSON 后，旧快照不再被使用
+    plain = DataManager(data_folder=data_dir)
+    plain.save_all('item', items[:1])
+    assert [i.id for i in DataManager(data_folder=data_dir).get_all('item')] == [1]
+
+    # 3. 损坏的快照退回到 JSON
+    with open(os.path.join(data_dir, "items.bin"), 'wb') as f:
+        f.write(b"TPBS garbage")
+    assert [i.id for i in DataManager(data_folder=data_dir).get_all('item')] == [1]
+
+    # 4. JSON 与快照双向转换，内容保持一致；只删除 JSON 即清空数据，残留的快照不会被加载
+    json_path, bin_path = os.path.join(data_dir, "items.json"), os.path.join(data_dir, "items.bin")
+    assert binary_snapshot.json_to_binary(json_path, bin_path, Item) == 1
+    os.remove(json_path)
+    assert DataManager(data_folder=data_dir).get_all('item') == []
+    assert binary_snapshot.binary_to_json(bin_path, json_path, Item) == 1
+    with open(json_path, encoding='utf-8') as f:
+        assert json.load(f)[0]['image_paths'] == ["a.png", "b.png"]
+    assert DataManager(data_folder=data_dir).get_all('item') == items[:1]
+
+    # 5. 开启快照写入后删除 JSON（例如重置数据），新实例同样得到空数据
+    DataManager(data_folder=data_dir, binary_snapshots=True).save_all('user', [User(1, "a@a.com", "h", "A", "C")])
+    os.remove(os.path.join(data_dir, "users.json"))
+    assert DataManager(data_folder=data_dir).get_all('user') == []
+
+
+# =========================================================
+# 集成测试组 16: asyncio 服务层 (Async Service Integration)
+# 场景：同一事件循环上并发注册、发布与表达意向 -> 数据完整且 id 不重复 -> 权限错误照常抛出
+# =========================================================
+
+def test_integration_async_services(tmp_path):
+    import asyncio
+    from src.async_data_manager import AsyncDataManager
+    from src.services.async_services import AsyncAuthService, AsyncItemService, AsyncAdminService
+
+    async def scenario():
+        adm = AsyncDataManager(DataManager(data_folder=str(tmp_path / "async_data")))
+        auth = AsyncAuthService(adm)
+        items = AsyncItemService(adm, auth)
+        admin = AsyncAdminService(adm, auth)
+
+        # 1. 并发注册与登录
+        await asyncio.gather(*(auth.register(f"u{i}@a.com", "p", f"U{i}", f"wx{i}") for i in range(20)))
+        logins = await asyncio.gather(*(auth.login(f"u{i}@a.com", "p") for i in range(20)))
+        sessions = [session_id for session_id, _ in logins]
+
+        # 2. 并发发布与表达意向，写入按模型串行化，不丢数据
+        published = await asyncio.gather(*(items.publish_item(s, f"Item {n}", "d", 1.0, []) for n, s in enumerate(sessions)))
+        contacts = await asyncio.gather(*(items.express_interest(sessions[0], it.id) for it in published[1:]))
+        assert contacts == [f"wx{i}" for i in range(1, 20)]
+        assert len({it.id for it in published}) == 20
+        assert len(await adm.get_all('interaction')) == 19
+        assert (await items.search_page("Item 1")).total == 11
+
+        # 意向统计、榜单与整理同样可以在事件循环中调用 (推荐见下一个测试，需要 numpy)
+        assert (await items.get_interest_stats(published[1].id))['count'] == 1
+        assert await items.get_seller_interest(published[1].seller_id) == 1
+        assert len(await items.trending_items(limit=5, by='count')) == 5
+        assert await items.compact_interactions() == 0
+
+        # 3. 同步服务的异常原样传递给调用方
+        with pytest.raises(PermissionError):
+            await admin.delete_item(sessions[1], published[0].id)
+        adm.close()
+
+    asyncio.run(scenario())
+
+
+def test_integration_async_recommendations(tmp_path):
+    pytest.importorskip("numpy")
+    import asyncio
+    from src.async_data_manager import AsyncDataManager
+    from src.services.async_services import AsyncAuthService, AsyncItemService
+
+    async def scenario():
+        adm = AsyncDataManager(DataManager(data_folder=str(tmp_path / "async_data")))
+        auth = AsyncAuthService(adm)
+        items = AsyncItemService(adm, auth)
+
+        # 1. 一个买家对所有商品表达意向，推荐其余共同意向的商品
+        await asyncio.gather(*(auth.register(f"u{i}@a.com", "p", f"U{i}", f"wx{i}") for i in range(7)))
+        sessions = [session_id for session_id, _ in
+                    await asyncio.gather(*(auth.login(f"u{i}@a.com", "p") for i in range(7)))]
+        published = await asyncio.gather(*(items.publish_item(s, f"Item {n}", "d", 1.0, []) for n, s in enumerate(sessions[1:])))
+        await asyncio.gather(*(items.express_interest(sessions[0], it.id) for it in published))
+
+        # 2. 推荐在事件循环中计算，不包含商品本身
+        recommended = await items.recommend_items(published[0].id)
+        assert len(recommended) == 5 and published[0].id not in {it.id for it in recommended}
+        adm.close()
+
+    asyncio.run(scenario())
+
+
+# =========================================================
+# 集成测试组 17: HTTP/JSON 接口 (HTTP API Integration)
+# 场景：同一连接上连续请求 (keep-alive) 完成注册、登录、发布、搜索、表达意向 -> 错误码映射
+# =========================================================
+
+def test_integration_http_api(tmp_path):
+    import asyncio
+    from urllib.parse import quote
+    from src.http_server import build_server
+
+    async def request(reader, writer, method, path, body=None, token=None):
+        data = json.dumps(body).encode('utf-8') if body is not None else b""
+        head = f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(data)}\r\n"
+        if token:
+            head += f"Authorization: Bearer {token}\r\n"
+        writer.write((head + "\r\n").encode('latin-1') + data)
+        status_line = await reader.readline()
+        headers = {}
+        while (line := await reader.readline()) != b"\r\n":
+            name, _, value = line.decode('latin-1').partition(":")
+            headers[name.lower()] = value.strip()
+        payload = json.loads(await reader.readexactly(int(headers['content-length'])))
+        return int(status_line.split()[1]), payload
+
+    async def scenario():
+        api = build_server(str(tmp_path / "http_data"))
+        server = await asyncio.start_server(api.handle_connection, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+        # 1. 同一个连接上完成完整交易流程
+        assert (await request(reader, writer, "POST", "/register",
+                              {'email': "s@a.com", 'password': "p", 'nickname': "S", 'contact_info': "wx:s"}))[0] == 201
+        await request(reader, writer, "POST", "/register", {'email': "b@a.com", 'password': "p", 'nickname': "B", 'contact_info': "c"})
+        status, login = await request(reader, writer, "POST", "/login", {'email': "s@a.com", 'password': "p"})
+        assert status == 200 and 'password_hash' not in login['user']
+        seller_token = login['session_id']
+        buyer_token = (await request(reader, writer, "POST", "/login", {'email': "b@a.com", 'password': "p"}))[1]['session_id']
+        status, item = await request(reader, writer, "POST", "/items", {'title': "机械键盘", 'price': 99}, seller_token)
+        assert status == 201
+        status, page = await request(reader, writer, "GET", "/items/search?q=" + quote("键盘"))
+        assert page['total'] == 1 and page['items'][0]['id'] == item['id']
+        assert await request(reader, writer, "POST", f"/items/{item['id']}/interest", token=buyer_token) == (200, {'contact_info': "wx:s"})
+
+        # 2. 错误映射：未登录 401、权限不足 403、业务错误 400、未知路径 404、方法不允许 405
+        assert (await request(reader, writer, "POST", "/items", {'title': "x", 'price': 1}))[0] == 401
+        assert (await request(reader, writer, "GET", "/admin/users", token=buyer_token))[0] == 403
+        assert (await request(reader, writer, "POST", f"/items/{item['id']}/interest", token=seller_token))[0] == 400
+        assert (await request(reader, writer, "GET", "/unknown"))[0] == 404
+        assert (await request(reader, writer, "PUT", "/items"))[0] == 405
+
+        # 3. 字段类型校验：非字符串字段返回 400 且不写入数据，之后的搜索不受影响
+        assert (await request(reader, writer, "POST", "/items", {'title': 123, 'price': 1}, seller_token))[0] == 400
+        assert (await request(reader, writer, "POST", "/items", {'title': "x", 'price': 1, 'image_paths': [1]}, seller_token))[0] == 400
+        assert (await request(reader, writer, "POST", "/register",
+                              {'email': 1, 'password': "p", 'nickname': "N", 'contact_info': "c"}))[0] == 400
+        assert (await request(reader, writer, "GET", "/items/search?q=nothing-here"))[1]['total'] == 0
+
+        # 4. 管理员列表走游标分页
+        dm = api.auth_service.sync.data_manager
+        dm.get_user_by_email("s@a.com").role = "ADMIN"
+        dm.save_all('user', dm.get_all('user'))
+        status, page = await request(reader, writer, "GET", "/admin/users?limit=1&total=1", token=seller_token)
+        assert status == 200 and page['total'] == 2 and 'password_hash' not in page['items'][0]
+        status, page = await request(reader, writer, "GET", f"/admin/users?limit=1&cursor={page['next_cursor']}", token=seller_token)
+        assert [u['email'] for u in page['items']] == ["b@a.com"] and page['next_cursor'] is None
+        assert (await request(reader, writer, "GET", "/admin/items?cursor=bad", token=seller_token))[0] == 400
+
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        api.auth_service.data_manager.close()
+
+    asyncio.run(scenario())
+
+
+# =========================================================
+# 集成测试组 18: 热门商品榜单 (Trending Integration)
+# 场景：多个买家表达意向 -> 计数与榜单增量更新 -> 删除商品后榜单跳过 -> 重新加载后计数一致
+# =========================================================
+
+def test_integration_trending(integration_env):
+    dm, auth_service, item_service, admin_service = integration_env
+    auth_service.register("hot_seller@a.com", "p", "Seller", "C")
+    seller_session, seller = auth_service.login("hot_seller@a.com", "p")
+    items = [item_service.publish_item(seller_session, f"Item {i}", "d", 1.0, []) for i in range(3)]
+    assert item_service.trending_items() == []
+
+    for n in range(3):
+        auth_service.register(f"hot_buyer{n}@a.com", "p", f"Buyer{n}", "C")
+        buyer_session, _ = auth_service.login(f"hot_buyer{n}@a.com", "p")
+        for item in items[:n + 1]:
+            item_service.express_interest(buyer_session, item.id)
+
+    assert [i.id for i in item_service.trending_items(limit=2, by='count')] == [items[0].id, items[1].id]
+    assert item_service.get_interest_stats(items[0].id)['count'] == 3
+    assert item_service.get_interest_stats(items[0].id)['score'] > 2.9
+    assert item_service.get_seller_interest(seller.id) == 6
+
+    # 被删除的商品不出现在榜单中，空出的名额由后面的商品补上
+    admin = auth_service.register("hot_admin@a.com", "p", "Admin", "C")
+    admin.role = "ADMIN"
+    dm.save_all('user', dm.get_all('user'))
+    admin_session, _ = auth_service.login("hot_admin@a.com", "p")
+    admin_service.delete_item(admin_session, items[0].id)
+    assert [i.id for i in item_service.trending_items(limit=2, by='count')] == [items[1].id, items[2].id]
+
+    with pytest.raises(ValueError):
+        item_service.trending_items(by='price')
+
+    dm.invalidate_cache('interaction')
+    assert item_service.get_interest_stats(items[1].id)['count'] == 2
+
+
+# =========================================================
+# 集成测试组 19: 共同意向推荐 (Recommendation Integration)
+# 场景：买家表达意向 -> "也看了" 推荐随新记录增量更新 -> 删除的商品不再推荐
+# =========================================================
+
+def test_integration_recommendations(integration_env):
+    pytest.importorskip("numpy")
+    dm, auth_service, item_service, admin_service = integration_env
+    auth_service.register("rec_seller@a.com", "p", "Seller", "C")
+    seller_session, _ = auth_service.login("rec_seller@a.com", "p")
+    desk, lamp, chair = (item_service.publish_item(seller_session, title, "d", 1.0, []) for title in ("Desk", "Lamp", "Chair"))
+    assert item_service.recommend_items(desk.id) == []
+
+    auth_service.register("rec_buyer1@a.com", "p", "Buyer1", "C")
+    auth_service.register("rec_buyer2@a.com", "p", "Buyer2", "C")
+    buyer1, _ = auth_service.login("rec_buyer1@a.com", "p")
+    buyer2, _ = auth_service.login("rec_buyer2@a.com", "p")
+    for session, items in ((buyer1, [desk, lamp]), (buyer2, [desk, lamp, chair])):
+        for item in items:
+            item_service.express_interest(session, item.id)
+
+    assert [i.id for i in item_service.recommend_items(desk.id)] == [lamp.id, chair.id]
+    assert [i.id for i in item_service.recommend_items(chair.id, limit=1)] == [desk.id]
+
+    admin = auth_service.register("rec_admin@a.com", "p", "Admin", "C")
+    admin.role = "ADMIN"
+    dm.save_all('user', dm.get_all('user'))
+    admin_session, _ = auth_service.login("rec_admin@a.com", "p")
+    admin_service.delete_item(admin_session, lamp.id)
+    assert [i.id for i in item_service.recommend_items(desk.id)] == [chair.id]
+
+
+# =========================================================
+# 集成测试组 20: 互动记录去重 (Interaction Dedup Integration)
+# 场景：重复表达意向只更新计数 -> 整理旧数据中的重复记录 -> 旧版 SQLite 表自动补列
+# =========================================================
+
+def test_integration_interaction_dedup(integration_env, tmp_path):
+    import sqlite3
+    from src.models import InterestInteraction
+    dm, auth_service, item_service, _ = integration_env
+    auth_service.register("dup_seller@a.com", "p", "Seller", "C")
+    auth_service.register("dup_buyer@a.com", "p", "Buyer", "C")
+    seller_session, _ = auth_service.login("dup_seller@a.com", "p")
+    buyer_session, buyer = auth_service.login("dup_buyer@a.com", "p")
+    item = item_service.publish_item(seller_session, "Kettle", "d", 5.0, [])
+
+    for _ in range(3):
+        item_service.express_interest(buyer_session, item.id)
+    dm.invalidate_cache('interaction')
+    [interaction] = dm.get_all('interaction')
+    assert interaction.count == 3
+    assert item_service.get_interest_stats(item.id)['count'] == 3
+
+    # 去重之前写入的数据：同一 (买家, 商品) 有多条记录
+    dm.insert('interaction', InterestInteraction(dm.next_id('interaction'), item.id, buyer.id, interaction_time=1.0))
+    assert item_service.compact_interactions() == 1
+    assert item_service.compact_interactions() == 0
+    dm.invalidate_cache('interaction')
+    assert [(i.id, i.count) for i in dm.get_all('interaction')] == [(interaction.id, 4)]
+
+    # 旧版本创建的 interactions 表没有 count 列，打开时补列并取默认值
+    db_dir = tmp_path / "legacy_db"
+    db_dir.mkdir()
+    conn = sqlite3.connect(db_dir / "trade.db")
+    conn.execute("CREATE TABLE interactions (id INTEGER PRIMARY KEY, item_id INTEGER, buyer_id INTEGER, interaction_time REAL)")
+    conn.execute("INSERT INTO interactions VALUES (1, 2, 3, 4.0)")
+    conn.commit()
+    conn.close()
+    legacy = SqliteDataManager(data_folder=str(db_dir))
+    assert legacy.get_all('interaction') == [InterestInteraction(1, 2, 3, 4.0, count=1)]
+    legacy.close()
+
+
+# =========================================================
+# 集成测试组 21: 批量与级联删除 (Bulk & Cascade Delete Integration)
+# 场景：批量删除商品 -> 级联删除用户及其商品与互动记录，每个模型只写一次 -> SQLite 后端批量删除
+# =========================================================
+
+def test_integration_bulk_cascade_delete(integration_env, monkeypatch, tmp_path):
+    dm, auth_service, item_service, admin_service = integration_env
+    admin = auth_service.register("bulk_admin@a.com", "p", "Admin", "C")
+    admin.role = "ADMIN"
+    dm.save_all('user', dm.get_all('user'))
+    admin_session, _ = auth_service.login("bulk_admin@a.com", "p")
+    sessions = {}
+    for name in ("alice", "bob", "carol"):
+        auth_service.register(f"{name}@a.com", "p", name, "C")
+        sessions[name] = auth_service.login(f"{name}@a.com", "p")
+    alice_items = [item_service.publish_item(sessions["alice"][0], f"A{i}", "d", 1.0, []) for i in range(3)]
+    bob_item = item_service.publish_item(sessions["bob"][0], "B", "d", 1.0, [])
+    item_service.express_interest(sessions["bob"][0], alice_items[0].id)
+    item_service.express_interest(sessions["carol"][0], alice_items[1].id)
+    item_service.express_interest(sessions["alice"][0], bob_item.id)
+    item_service.express_interest(sessions["carol"][0], bob_item.id)
+
+    with pytest.raises(ValueError):
+        admin_service.delete_users(admin_session, [admin.id])
+    assert admin_service.delete_items(admin_session, [alice_items[2].id, 12345]) == {'item': 1}
+
+    writes = []
+    original_write = dm._write_data
+    monkeypatch.setattr(dm, "_write_data", lambda path, data: writes.append(path) or original_write(path, data))
+    alice = sessions["alice"][1]
+    deleted = admin_service.delete_users(admin_session, [alice.id], cascade=True)
+    assert deleted == {'user': 1, 'item': 2, 'interaction': 3}
+    assert sorted(writes) == sorted([dm.users_file, dm.items_file, dm.interactions_file])
+    assert [i.id for i in dm.get_all('item')] == [bob_item.id]
+    assert [(i.buyer_id, i.item_id) for i in dm.get_all('interaction')] == [(sessions["carol"][1].id, bob_item.id)]
+
+    assert admin_service.delete_items(admin_session, [bob_item.id], cascade=True) == {'item': 1, 'interaction': 1}
+    assert dm.get_all('interaction') == []
+
+    sqlite_dm = SqliteDataManager(data_folder=str(tmp_path / "bulk_db"))
+    for i in range(1, 6):
+        sqlite_dm.insert('item', Item(i, 1, f"I{i}", "d", 1.0))
+    assert sqlite_dm.delete_many('item', [1, 2, 99]) == 2
+    assert [i.id for i in sqlite_dm.get_all('item')] == [3, 4, 5]
+    sqlite_dm.close()
+
+
+# =========================================================
+# 集成测试组 22: 管理员分页列表 (Admin Listing Integration)
+# 场景：按价格游标翻页 -> 翻页期间删除商品不影响后续页 -> 文本过滤与总数 -> SQLite 计数
+# =========================================================
+
+def test_integration_admin_listing(integration_env, tmp_path):
+    dm, auth_service, item_service, admin_service = integration_env
+    admin = auth_service.register("list_admin@a.com", "p", "Admin", "C")
+    admin.role = "ADMIN"
+    dm.save_all('user', dm.get_all('user'))
+    admin_session, _ = auth_service.login("list_admin@a.com", "p")
+    auth_service.register("list_seller@a.com", "p", "Seller", "C")
+    seller_session, _ = auth_service.login("list_seller@a.com", "p")
+    items = [item_service.publish_item(seller_session, f"Desk {i}" if i % 2 else f"Lamp {i}", "d", float(10 - i), [])
+             for i in range(6)]
+
+    first = admin_service.list_items(admin_session, sort_by='price', limit=4, include_total=True)
+    assert [i.price for i in first.items] == [5.0, 6.0, 7.0, 8.0] and first.total == 6
+    # 游标记录的是位置而不是偏移：翻页期间删除已显示的商品，下一页不会漏掉或重复
+    admin_service.delete_item(admin_session, items[5].id)
+    second = admin_service.list_items(admin_session, sort_by='price', limit=4, cursor=first.next_cursor)
+    assert [i.price for i in second.items] == [9.0, 10.0] and second.next_cursor is None
+
+    desks = admin_service.list_items(admin_session, sort_by='price', descending=True, text="Desk", include_total=True)
+    assert [i.title for i in desks.items] == ["Desk 1", "Desk 3"] and desks.total == 2
+
+    users = admin_service.list_users(admin_session, sort_by='role', include_total=True)
+    assert [u.role for u in users.items] == ["ADMIN", "USER"] and users.total == 2
+
+    sqlite_dm = SqliteDataManager(data_folder=str(tmp_path / "count_db"))
+    sqlite_dm.save_all('item', [Item(i, 1, "t", "d", 1.0) for i in range(1, 4)])
+    assert sqlite_dm.count('item') == 3
+    with sqlite_dm.transaction():
+        sqlite_dm.delete('item', 1)
+        assert sqlite_dm.count('item') == 2
+    sqlite_dm.close()
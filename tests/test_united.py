@@ -2,8 +2,10 @@ import pytest
 from unittest.mock import MagicMock
 from src.services.auth_service import AuthService
 from src.services.item_service import ItemService
-from src.models import User, Item
-from src.data_manager import DataManager
+from src.services.session_store import SessionStore
+from src.models import User, Item, InterestInteraction, CompactItem, CompactUser, ItemStatus, UserRole, estimate_memory
+from src.data_manager import DataManager, iter_json_records
+from src.indexes import SearchIndex
 
 # --- Fixtures: 初始化测试环境 ---
 
@@ -16,6 +18,14 @@ def mock_data_manager():
         if not objects: return 1
         return max(obj.id for obj in objects) + 1
     dm.get_new_id.side_effect = side_effect_get_id
+
+    # 模拟持久化序列：从已有数据的最大 id 接续，删除后也不复用
+    dm.sequences = {}
+    def side_effect_next_id(model_type):
+        last = max([o.id for o in side_effect_get_all(model_type)] + [dm.sequences.get(model_type, 0)])
+        dm.sequences[model_type] = last + 1
+        return last + 1
+    dm.next_id.side_effect = side_effect_next_id
     
     # 模拟数据存储列表
     dm.users = []
@@ -29,6 +39,31 @@ def mock_data_manager():
         if model_type == 'interaction': return dm.interactions
         return []
     dm.get_all.side_effect = side_effect_get_all
+    dm.iter_all.side_effect = lambda model_type: iter(side_effect_get_all(model_type))
+    dm.count.side_effect = lambda model_type: len(side_effect_get_all(model_type))
+
+    # 模拟主键与邮箱索引查找
+    def side_effect_get_by_id(model_type, obj_id):
+        return next((o for o in side_effect_get_all(model_type) if o.id == obj_id), None)
+    dm.get_by_id.side_effect = side_effect_get_by_id
+    dm.get_user_by_email.side_effect = lambda email: next((u for u in dm.users if u.email == email), None)
+    dm.revision.return_value = 0
+
+    # 模拟单条写入：insert 追加到列表，update 按 id 替换
+    dm.insert.side_effect = lambda model_type, obj: side_effect_get_all(model_type).append(obj)
+    def side_effect_update(model_type, obj):
+        objects = side_effect_get_all(model_type)
+        objects[[o.id for o in objects].index(obj.id)] = obj
+    dm.update.side_effect = side_effect_update
+
+    # 模拟派生索引：每次都从当前列表重建，保证测试直接替换列表后依然一致
+    dm.index_factories = {}
+    dm.register_index.side_effect = lambda model_type, name, factory: dm.index_factories.setdefault((model_type, name), factory)
+    def side_effect_get_index(model_type, name):
+        index = dm.index_factories[(model_type, name)]()
+        index.rebuild(side_effect_get_all(model_type))
+        return index
+    dm.get_index.side_effect = side_effect_get_index
     
     return dm
 
@@ -51,7 +86,7 @@ class TestAuthService:
         assert user.email == "test@test.com"
         assert user.nickname == "TestUser"
         assert len(mock_data_manager.users) == 1
-        assert mock_data_manager.save_all.called
+        mock_data_manager.insert.assert_called_once_with('user', user)
 
     # 2. 注册重复邮箱 (边界/错误处理)
     def test_register_duplicate_email(self, auth_service, mock_data_manager):
@@ -145,7 +180,7 @@ class TestItemService:
         assert item.title == "Gaming PC"
         assert item.seller_id == 10
         assert len(mock_data_manager.items) == 1
-        assert mock_data_manager.save_all.called
+        mock_data_manager.insert.assert_called_once_with('item', item)
 
     # 2. 发布商品 - 未登录 (权限控制)
     def test_publish_item_no_session(self, item_service):
@@ -229,3 +264,521 @@ class TestItemService:
     def test_express_interest_no_session(self, item_service):
         with pytest.raises(PermissionError):
             item_service.express_interest("fake-session", 1)
+
+    # 12. 表示兴趣 - 重复表达只更新已有记录的次数与时间 (去重)
+    def test_express_interest_repeat(self, item_service, mock_data_manager, auth_service):
+        mock_data_manager.users.extend([User(10, "s@s.com", "hashed_p", "Seller", "WX:Seller"),
+                                        User(20, "b@b.com", "hashed_b", "Buyer", "WX:Buyer")])
+        mock_data_manager.items.append(Item(100, 10, "Book", "Old book", 10.0))
+        buyer_session, _ = auth_service.login("b@b.com", "b")
+
+        item_service.express_interest(buyer_session, 100)
+        first_time = mock_data_manager.interactions[0].interaction_time
+        item_service.express_interest(buyer_session, 100)
+        assert len(mock_data_manager.interactions) == 1
+        assert mock_data_manager.interactions[0].count == 2
+        assert mock_data_manager.interactions[0].interaction_time >= first_time
+
+    # 13. 合并已有的重复记录：保留最小 id，累加次数并取最近时间
+    def test_compact_interactions(self, item_service, mock_data_manager):
+        mock_data_manager.interactions.extend([
+            InterestInteraction(1, 100, 20, interaction_time=5.0),
+            InterestInteraction(2, 100, 21, interaction_time=6.0),
+            InterestInteraction(3, 100, 20, interaction_time=9.0, count=2),
+        ])
+        saved = []
+        mock_data_manager.save_all.side_effect = lambda model_type, objects: saved.append(objects)
+        assert item_service.compact_interactions() == 1
+        assert [(i.id, i.count, i.interaction_time) for i in saved[-1]] == [(1, 3, 9.0), (2, 1, 6.0)]
+
+
+# --- Test Suite 3: SearchIndex (搜索索引测试) ---
+
+class TestSearchIndex:
+
+    @pytest.fixture
+    def index(self):
+        index = SearchIndex()
+        index.rebuild([
+            Item(1, 1, "九成新机械键盘", "手感好", 150.0),
+            Item(2, 1, "二手显示器", "24寸 1080p", 400.0),
+            Item(3, 1, "Gaming Mouse", "RGB mouse pad included", 50.0),
+        ])
+        return index
+
+    # 1. 中文无空格标题按字符 n-gram 命中 (分词)
+    def test_search_chinese_substring(self, index):
+        assert index.search("键盘") == [1]
+        assert index.search("机械键盘") == [1]
+        assert index.search("二手") == [2]
+
+    # 2. 英文子串与大小写 (与原线性扫描语义一致)
+    def test_search_matches_substring_semantics(self, index):
+        assert index.search("MOUSE") == [3]
+        assert index.search("ous") == [3]
+        assert index.search("mouse keyboard") == []
+
+    # 3. n-gram 都存在但原文不连续时不应误报 (校验)
+    def test_search_rejects_false_positive(self, index):
+        assert index.search("mouse pad") == [3]
+        assert index.search("pad mouse") == []
+
+    # 4. 增量删除与新增 (索引维护)
+    def test_incremental_update(self, index):
+        index.discard(1)
+        assert index.search("键盘") == []
+        index.add(Item(4, 2, "静音键盘", "办公", 80.0))
+        assert index.search("键盘") == [4]
+
+    # 5. BM25 排序：标题多次命中的商品排在前面 (相关度)
+    def test_rank_by_relevance(self):
+        index = SearchIndex()
+        now = 1_000_000.0
+        index.rebuild([
+            Item(1, 1, "Desk", "a desk lamp is included", 10.0, created_at=now),
+            Item(2, 1, "Lamp", "lamp lamp, warm light lamp", 10.0, created_at=now),
+            Item(3, 1, "Chair", "no match here", 10.0, created_at=now),
+        ])
+        top, total = index.rank("lamp", k=5, now=now)
+        assert top == [2, 1]
+        assert total == 2
+
+    # 6. 相关度相同时新发布的商品优先，且只取前 k 个 (新品加权/Top-k)
+    def test_rank_recency_and_top_k(self):
+        index = SearchIndex()
+        now = 1_000_000.0
+        index.rebuild([
+            Item(i, 1, "Book", "old book", 5.0, created_at=now - i * 24 * 3600) for i in range(1, 11)
+        ])
+        top, total = index.rank("book", k=3, now=now)
+        assert top == [1, 2, 3]
+        assert total == 10
+        # 空关键词按发布时间倒序
+        assert index.rank("", k=2, now=now) == ([1, 2], 10)
+
+    # 7. 没有任何命中（包括查询中含未被索引的 n-gram）时返回空结果 (边界)
+    def test_rank_no_match(self, index):
+        assert index.rank("nothing-here", k=5) == ([], 0)
+        assert index.rank("mouse xyz", k=5) == ([], 0)
+
+    # 8. 查询中间含连续空白时与原线性扫描一致 (纯空白 n-gram 不参与筛选)
+    def test_search_consecutive_spaces(self, index):
+        index.add(Item(4, 1, "a    b", "spaced   out", 1.0))
+        assert index.search("a    b") == [4]
+        assert index.search("spaced   out") == [4]
+        assert index.rank("a    b", k=5) == ([4], 1)
+        assert index.search("a     b") == []
+
+
+# --- Test Suite 4: 分页搜索 (Paginated Search) ---
+
+class TestSearchPage:
+
+    # 1. 分页返回第二页并给出总数 (分页)
+    def test_search_page_offset_limit(self, item_service, mock_data_manager):
+        mock_data_manager.items = [Item(i, 1, f"Phone {i}", "phone", 100.0, created_at=float(i)) for i in range(1, 6)]
+        page = item_service.search_page("phone", offset=2, limit=2)
+        assert [item.id for item in page.items] == [3, 2]
+        assert page.total == 5
+        assert page.has_more is True
+
+    # 2. 没有命中的关键词返回空页 (边界)
+    def test_search_page_no_match(self, item_service, mock_data_manager):
+        mock_data_manager.items = [Item(1, 1, "Phone", "phone", 100.0)]
+        page = item_service.search_page("nothing-here")
+        assert page.items == [] and page.total == 0 and not page.has_more
+
+    # 3. 非法分页参数 (错误处理)
+    def test_search_page_invalid_arguments(self, item_service):
+        with pytest.raises(ValueError):
+            item_service.search_page("phone", offset=-1)
+        with pytest.raises(ValueError):
+            item_service.search_page("phone", limit=0)
+
+
+# --- Test Suite 5: 分面查询 (Faceted Query) ---
+
+class TestQueryItems:
+
+    @pytest.fixture
+    def catalog(self, mock_data_manager):
+        mock_data_manager.items = [
+            Item(1, 10, "Desk", "d", 80.0, created_at=1.0),
+            Item(2, 10, "Lamp", "l", 20.0, status="SOLD", created_at=2.0),
+            Item(3, 20, "Chair", "c", 45.0, created_at=3.0),
+            Item(4, 20, "Sofa", "s", 300.0, created_at=4.0),
+            Item(5, 30, "Pen", "p", 5.0, created_at=5.0),
+        ]
+
+    # 1. "100 元以下、在售" 按价格升序 (价格区间 + 状态)
+    def test_price_range_and_status(self, item_service, catalog):
+        page = item_service.query_items(max_price=100, status="AVAILABLE", sort_by='price', descending=False, include_total=True)
+        assert [i.id for i in page.items] == [5, 3, 1]
+        assert page.total == 3
+
+    # 2. "我的商品" 按发布时间倒序 (卖家)
+    def test_my_listings(self, item_service, catalog):
+        page = item_service.query_items(seller_id=20)
+        assert [i.id for i in page.items] == [4, 3]
+        assert page.total is None
+
+    # 3. 价格区间 + 按发布时间排序 + 分页 (组合)
+    def test_price_range_sorted_by_created_at(self, item_service, catalog):
+        page = item_service.query_items(min_price=10, max_price=100, offset=1, limit=1, include_total=True)
+        assert [i.id for i in page.items] == [2]
+        assert page.total == 3
+
+    # 4. 不支持的排序字段 (错误处理)
+    def test_invalid_sort_field(self, item_service, catalog):
+        with pytest.raises(ValueError, match="Unsupported sort field"):
+            item_service.query_items(sort_by='title')
+
+
+# --- Test Suite 6: SessionStore (会话存储测试) ---
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class TestSessionStore:
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    # 1. 空闲超时后会话失效，访问会刷新空闲计时 (空闲 TTL)
+    def test_idle_ttl(self, clock):
+        store = SessionStore(idle_ttl=10, absolute_ttl=100, clock=clock)
+        sid = store.create(1)
+        clock.now += 8
+        assert store.get(sid) is not None
+        clock.now += 8
+        assert store.get(sid) is not None
+        clock.now += 11
+        assert store.get(sid) is None
+
+    # 2. 持续活跃也会在绝对超时后失效 (绝对 TTL)
+    def test_absolute_ttl(self, clock):
+        store = SessionStore(idle_ttl=10, absolute_ttl=25, clock=clock)
+        sid = store.create(1)
+        for _ in range(3):
+            clock.now += 9
+            store.get(sid)
+        assert store.get(sid) is None
+
+    # 3. 超过容量时淘汰最久未访问的会话 (LRU)
+    def test_max_sessions_lru(self, clock):
+        store = SessionStore(max_sessions=2, clock=clock)
+        first, second = store.create(1), store.create(2)
+        store.get(first)
+        third = store.create(3)
+        assert len(store) == 2
+        assert second not in store
+        assert first in store and third in store
+
+    # 4. 定期清理回收未被访问的过期会话 (内存有界)
+    def test_periodic_sweep(self, clock):
+        store = SessionStore(idle_ttl=10, sweep_interval=30, clock=clock)
+        for user_id in range(5):
+            store.create(user_id)
+        clock.now += 31
+        store.create(99)
+        assert len(store) == 1
+
+    # 5. 用户数据版本变化后重新读取缓存的用户 (缓存失效)
+    def test_cached_user_invalidated_on_revision_change(self, auth_service, mock_data_manager):
+        mock_data_manager.users.append(User(1, "c@test.com", "hashed_p", "Before", "C"))
+        session_id, _ = auth_service.login("c@test.com", "p")
+        mock_data_manager.users[0] = User(1, "c@test.com", "hashed_p", "After", "C")
+        assert auth_service.get_user_from_session(session_id).nickname == "Before"
+
+        mock_data_manager.revision.return_value = 1
+        assert auth_service.get_user_from_session(session_id).nickname == "After"
+
+        mock_data_manager.users.clear()
+        mock_data_manager.revision.return_value = 2
+        assert auth_service.get_user_from_session(session_id) is None
+
+
+# --- Test Suite 7: 紧凑模型 (Compact Models) ---
+
+class TestCompactModels:
+
+    # 1. 紧凑模型没有实例 __dict__，状态与角色映射为共享的枚举常量
+    def test_slots_and_interned_values(self):
+        a = CompactItem(1, 1, "A", "a", 1.0, status="".join(["AVAIL", "ABLE"]))
+        b = CompactItem(2, 1, "B", "b", 2.0)
+        assert not hasattr(a, '__dict__')
+        assert a.status is b.status is ItemStatus.AVAILABLE
+        assert a.status == "AVAILABLE"
+        assert CompactUser(1, "x@y.z", "h", "n", "c", role="ADMIN").is_admin
+        assert CompactUser(2, "u@y.z", "h", "n", "c").role is UserRole.USER
+
+    # 2. 未知状态值不会报错，而是驻留为普通字符串
+    def test_unknown_status_is_interned(self):
+        a = CompactItem(1, 1, "A", "a", 1.0, status="".join(["RESER", "VED"]))
+        b = CompactItem(2, 1, "B", "b", 1.0, status="".join(["RESER", "VED"]))
+        assert a.status is b.status
+
+    # 3. 内存估算：紧凑模型明显小于普通模型
+    def test_estimate_memory(self):
+        plain = [Item(i, 1, f"title {i}", f"desc {i}", 1.0, status="".join(["SO", "LD"])) for i in range(200)]
+        compact = [CompactItem(i, 1, f"title {i}", f"desc {i}", 1.0, status="".join(["SO", "LD"])) for i in range(200)]
+        assert estimate_memory(compact) < estimate_memory(plain)
+        assert estimate_memory([]) == 0
+
+    # 4. DataManager 使用紧凑模型加载，读写结果与普通模型一致
+    def test_data_manager_round_trip(self, tmp_path):
+        DataManager(data_folder=str(tmp_path)).save_all('item', [Item(1, 2, "Lamp", "desk", 9.5, image_paths=["a.png"])])
+        dm = DataManager(data_folder=str(tmp_path), compact_models=True)
+        item = dm.get_by_id('item', 1)
+        assert isinstance(item, CompactItem)
+        item.status = ItemStatus.SOLD
+        dm.save_all('item', dm.get_all('item'))
+        reloaded = DataManager(data_folder=str(tmp_path)).get_by_id('item', 1)
+        assert reloaded == Item(1, 2, "Lamp", "desk", 9.5, status="SOLD", image_paths=["a.png"], created_at=item.created_at)
+        assert dm.memory_usage('item') > 0
+
+
+# --- Test Suite 8: 列式商品视图 (Item Columns) ---
+
+class TestItemColumns:
+
+    @pytest.fixture
+    def columns(self):
+        pytest.importorskip("numpy")
+        from src.item_columns import ItemColumns
+        columns = ItemColumns()
+        columns.rebuild([
+            Item(1, 10, "A", "a", 10.0, created_at=0.0),
+            Item(2, 10, "B", "b", 20.0, status="SOLD", created_at=3600.0),
+            Item(3, 11, "C", "c", 30.0, created_at=86400.0),
+        ])
+        return columns
+
+    # 1. 布尔掩码过滤：价格区间、卖家、状态、发布时间
+    def test_filters(self, columns):
+        assert columns.filter_ids(min_price=15) == [2, 3]
+        assert columns.filter_ids(seller_id=10, status="AVAILABLE") == [1]
+        assert columns.filter_ids(created_after=3600.0) == [2, 3]
+        assert columns.filter_ids(status="RESERVED") == []
+
+    # 2. 增量维护：新增、修改与删除后列数据保持一致
+    def test_incremental_updates(self, columns):
+        for i in range(4, 40):
+            columns.add(Item(i, 12, "X", "x", 1.0, created_at=0.0))
+        columns.add(Item(1, 10, "A", "a", 99.0, created_at=0.0))
+        for i in range(4, 40):
+            columns.discard(i)
+        assert len(columns) == 3
+        assert columns.filter_ids(min_price=50) == [1]
+        assert columns.seller_counts() == {10: 2, 11: 1}
+
+    # 3. 向量化统计：分位数、卖家商品数与每日发布量
+    def test_aggregates(self, columns):
+        assert columns.price_percentiles((50,)) == {50: 20.0}
+        assert columns.daily_volume() == {0: 2, 86400: 1}
+        assert columns.summary(seller_id=10) == {'count': 2, 'mean_price': 15.0, 'price_percentiles': {25: 12.5, 50: 15.0, 75: 17.5}}
+        assert columns.summary(min_price=1000)['mean_price'] is None
+
+    # 4. 管理员统计接口只对管理员开放
+    def test_admin_statistics(self, mock_data_manager, auth_service):
+        pytest.importorskip("numpy")
+        from src.services.admin_service import AdminService
+        mock_data_manager.users.extend([
+            User(1, "admin@test.com", "hashed_p", "Admin", "C", role="ADMIN"),
+            User(2, "user@test.com", "hashed_p", "User", "C"),
+        ])
+        mock_data_manager.items.extend([Item(1, 2, "A", "a", 10.0), Item(2, 2, "B", "b", 30.0)])
+        admin_service = AdminService(mock_data_manager, auth_service)
+        admin_session, _ = auth_service.login("admin@test.com", "p")
+        stats = admin_service.get_item_statistics(admin_session, max_price=20)
+        assert stats['count'] == 1 and stats['seller_counts'] == {2: 1}
+
+        user_session, _ = auth_service.login("user@test.com", "p")
+        with pytest.raises(PermissionError):
+            admin_service.get_item_statistics(user_session)
+
+
+# --- Test Suite 9: 流式 JSON 解码 (Streaming Decoder) ---
+
+class TestIterJsonRecords:
+
+    # 1. 顶层数组与 JSON Lines 都能逐条解码，记录跨越读取块边界也不受影响
+    @pytest.mark.parametrize("text", [
+        '[{"id": 1, "tags": ["a", "b"]}, {"id": 2}, 12345]',
+        '{"id": 1, "tags": ["a", "b"]}\n{"id": 2}\n12345\n',
+    ])
+    def test_formats_across_chunks(self, text):
+        import io
+        assert list(iter_json_records(io.StringIO(text), chunk_size=4)) == [{"id": 1, "tags": ["a", "b"]}, {"id": 2}, 12345]
+
+    # 2. 空文件与空数组不产生记录，截断的文件抛出异常
+    def test_empty_and_truncated(self):
+        import io
+        assert list(iter_json_records(io.StringIO(""))) == []
+        assert list(iter_json_records(io.StringIO(" [ ] "))) == []
+        with pytest.raises(ValueError):
+            list(iter_json_records(io.StringIO('[{"id": 1}, {"id": '), chunk_size=4))
+
+
+# --- Test Suite 10: 意向计数与热度 (Interest Index) ---
+
+class TestInterestIndex:
+
+    @pytest.fixture
+    def index(self):
+        from src.indexes import InterestIndex
+        sellers = {1: 10, 2: 10, 3: 11}
+        index = InterestIndex(sellers.get, half_life=100.0)
+        index.rebuild([
+            InterestInteraction(1, 1, 5, interaction_time=1000.0),
+            InterestInteraction(2, 1, 6, interaction_time=1000.0),
+            InterestInteraction(3, 2, 5, interaction_time=1000.0),
+        ])
+        return index
+
+    # 1. 商品与卖家计数，增量新增与删除
+    def test_counts(self, index):
+        assert index.count(1) == 2 and index.seller_count(10) == 3
+        index.add(InterestInteraction(4, 3, 5, interaction_time=1000.0))
+        index.discard(1)
+        index.discard(99)
+        assert index.count(1) == 1 and index.count(3) == 1
+        assert index.seller_count(10) == 2 and index.seller_count(11) == 1
+
+    # 2. 热度按半衰期衰减，新的意向可以让商品反超更老的热门商品
+    def test_decayed_score_and_trending(self, index):
+        assert index.score(1, now=1000.0) == pytest.approx(2.0)
+        assert index.score(1, now=1100.0) == pytest.approx(1.0)
+        assert index.trending(2) == [1, 2]
+        index.add(InterestInteraction(4, 3, 5, interaction_time=1200.0))
+        assert index.trending(1) == [3]
+        assert index.trending(1, by='count') == [1]
+
+    # 3. 远超半衰期的新记录触发换基准，不会溢出
+    def test_rebase(self, index):
+        index.add(InterestInteraction(4, 3, 5, interaction_time=1000.0 + 100.0 * 5000))
+        assert index.trending(1) == [3]
+        assert index.score(3, now=1000.0 + 100.0 * 5000) == pytest.approx(1.0)
+        index.discard(4)
+        assert index.count(3) == 0 and sorted(index.trending(5)) == [1, 2]
+
+    # 4. 去重后的记录按次数计：更新次数时计数与热度随之变化
+    def test_weighted_by_count(self, index):
+        # 与 DataManager 提交 update 时相同：先按 id 移除旧记录，再加入新值
+        index.discard(3)
+        index.add(InterestInteraction(3, 2, 5, interaction_time=1000.0, count=3))
+        assert index.count(2) == 3 and index.seller_count(10) == 5
+        assert index.score(2, now=1000.0) == pytest.approx(3.0)
+        assert index.trending(1, by='count') == [2]
+        index.discard(3)
+        assert index.count(2) == 0 and index.seller_count(10) == 2
+
+
+# --- Test Suite 11: 共同意向推荐 (Co-Interest Recommendations) ---
+
+class TestCoInterestMatrix:
+
+    @pytest.fixture
+    def matrix(self):
+        pytest.importorskip("numpy")
+        from src.recommendations import CoInterestMatrix
+        matrix = CoInterestMatrix()
+        # 买家 1: 商品 10, 20, 30；买家 2: 10, 20；买家 3: 10, 40（对 40 有两条记录）
+        matrix.rebuild([
+            InterestInteraction(1, 10, 1), InterestInteraction(2, 20, 1), InterestInteraction(3, 30, 1),
+            InterestInteraction(4, 10, 2), InterestInteraction(5, 20, 2),
+            InterestInteraction(6, 10, 3), InterestInteraction(7, 40, 3), InterestInteraction(8, 40, 3),
+        ])
+        return matrix
+
+    # 1. 余弦相似度：共同买家数 / sqrt(两件商品各自的买家数之积)，重复记录只算一次
+    def test_similarity(self, matrix):
+        similar = matrix.similar(10, k=5)
+        assert [item_id for item_id, _ in similar] == [20, 30, 40]
+        assert similar[0][1] == pytest.approx(2 / (3 * 2) ** 0.5)
+        assert similar[2][1] == pytest.approx(1 / 3 ** 0.5)
+        assert matrix.similar(10, k=1) == similar[:1]
+        assert matrix.similar(99) == []
+
+    # 2. 增量维护：新增与删除记录后的结果与整体重建一致
+    def test_incremental_updates(self, matrix):
+        from src.recommendations import CoInterestMatrix
+        matrix.add(InterestInteraction(9, 30, 2))
+        matrix.discard(7)
+        assert matrix.similar(40) == [(10, pytest.approx(1 / 3 ** 0.5))]
+        matrix.discard(8)
+        assert matrix.similar(40) == []
+
+        rebuilt = CoInterestMatrix()
+        rebuilt.rebuild([InterestInteraction(1, 10, 1), InterestInteraction(2, 20, 1), InterestInteraction(3, 30, 1),
+                         InterestInteraction(4, 10, 2), InterestInteraction(5, 20, 2), InterestInteraction(6, 10, 3),
+                         InterestInteraction(9, 30, 2)])
+        for item_id in (10, 20, 30):
+            assert matrix.similar(item_id) == rebuilt.similar(item_id)
+
+
+# --- Test Suite 12: 游标分页 (Cursor Pagination) ---
+
+class TestCursorPagination:
+
+    # 1. 游标编码往返，损坏的游标抛出 ValueError
+    def test_cursor_round_trip(self):
+        from src.pagination import encode_cursor, decode_cursor
+        assert decode_cursor(encode_cursor(19.5, 7)) == (19.5, 7)
+        assert decode_cursor(encode_cursor("ADMIN", 3)) == ("ADMIN", 3)
+        for bad in ("not-a-cursor", encode_cursor(1, 2)[:-4], "WzEsICJ4Il0="):
+            with pytest.raises(ValueError):
+                decode_cursor(bad)
+
+    # 2. 有序索引从游标之后继续遍历，键相同时按 id 区分
+    def test_sorted_index_iter_after(self):
+        from src.indexes import SortedIndex
+        index = SortedIndex('price')
+        index.rebuild([Item(i, 1, "t", "d", price) for i, price in [(1, 5.0), (2, 1.0), (3, 5.0), (4, 9.0)]])
+        assert list(index.iter_after(5.0, 1)) == [3, 4]
+        assert list(index.iter_after(5.0, 3, descending=True)) == [1, 2]
+        assert list(index.iter_after(9.0, 4)) == []
+
+    # 3. 管理员用户列表：排序、过滤、翻页与总数
+    def test_admin_list_users(self, mock_data_manager, auth_service):
+        from src.services.admin_service import AdminService
+        mock_data_manager.users.extend(
+            [User(1, "admin@test.com", "hashed_p", "Admin", "C", role="ADMIN", created_at=0.0)]
+            + [User(i, f"u{i}@test.com", "hashed_p", f"Nick{i}", "C", created_at=float(i)) for i in range(2, 8)]
+        )
+        admin_service = AdminService(mock_data_manager, auth_service)
+        session, _ = auth_service.login("admin@test.com", "p")
+
+        first = admin_service.list_users(session, sort_by='created_at', descending=True, limit=4, include_total=True)
+        assert [u.id for u in first.items] == [7, 6, 5, 4] and first.total == 7 and first.has_more
+        second = admin_service.list_users(session, sort_by='created_at', descending=True, limit=4, cursor=first.next_cursor)
+        assert [u.id for u in second.items] == [3, 2, 1] and not second.has_more
+
+        by_role = admin_service.list_users(session, sort_by='role', limit=1)
+        assert [u.id for u in by_role.items] == [1]
+        filtered = admin_service.list_users(session, text="NICK3", include_total=True)
+        assert [u.id for u in filtered.items] == [3] and filtered.total == 1
+        with pytest.raises(ValueError):
+            admin_service.list_users(session, sort_by='password_hash')
+        with pytest.raises(ValueError):
+            admin_service.list_users(session, sort_by='role', cursor=second.next_cursor or first.next_cursor)
+
+    # 4. 带文本过滤时游标类型不符同样报 ValueError，而不是 TypeError
+    def test_admin_list_items_bad_cursor_with_text(self, mock_data_manager, auth_service, item_service):
+        from src.services.admin_service import AdminService
+        from src.pagination import encode_cursor
+        mock_data_manager.users.append(User(1, "admin@test.com", "hashed_p", "Admin", "C", role="ADMIN"))
+        mock_data_manager.items.extend([Item(1, 1, "Desk lamp", "d", 10.0), Item(2, 1, "Lamp shade", "d", 5.0)])
+        admin_service = AdminService(mock_data_manager, auth_service)
+        session, _ = auth_service.login("admin@test.com", "p")
+
+        assert [i.id for i in admin_service.list_items(session, sort_by='price', text="lamp").items] == [2, 1]
+        for descending in (False, True):
+            with pytest.raises(ValueError, match="Invalid cursor"):
+                admin_service.list_items(session, sort_by='price', descending=descending, text="lamp",
+                                         cursor=encode_cursor("cheap", 1))